@@ -1,20 +1,35 @@
 """
 Package for specialized agents used in the travel planning workflow.
+
+Agents are imported on first access, so importing one agent module (or the
+package) does not load the LLM client and tool libraries of every agent.
 """
-from .base_agent import BaseAgent
-from .weather_agent import WeatherAgent
-from .hotel_agent import HotelAgent
-from .city_info_agent import CityInfoAgent
-from .exchange_rate_agent import ExchangeRateAgent
-from .date_agent import DateAgent
-from .travel_planner_agent import TravelPlannerAgent
+import importlib
+from typing import Any
+
+# Public name -> module defining it
+_EXPORTS = {
+    'AgentRegistry': '.registry',
+    'agent_registry': '.registry',
+    'BaseAgent': '.base_agent',
+    'WeatherAgent': '.weather_agent',
+    'HotelAgent': '.hotel_agent',
+    'CityInfoAgent': '.city_info_agent',
+    'ExchangeRateAgent': '.exchange_rate_agent',
+    'DateAgent': '.date_agent',
+    'TravelPlannerAgent': '.travel_planner_agent',
+    'SummaryAgent': '.summary_agent',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str) -> Any:
+    """Import an exported agent the first time it is accessed."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
 
-__all__ = [
-    'BaseAgent',
-    'WeatherAgent',
-    'HotelAgent',
-    'CityInfoAgent',
-    'ExchangeRateAgent',
-    'DateAgent',
-    'TravelPlannerAgent'
-]
\ No newline at end of file
+def __dir__():
+    return sorted(list(globals()) + __all__)
\ No newline at end of file
@@ -4,38 +4,53 @@ Provides common agent creation and configuration.
 """
 from typing import List, Any
 
-from langchain_groq import ChatGroq
-from langgraph.prebuilt import create_react_agent
+from langchain_core.language_models import BaseChatModel
 from langchain_core.tools import BaseTool
 
 from ..config.settings import DEFAULT_MODEL, DEFAULT_TEMPERATURE
+from .registry import agent_registry
 
 class BaseAgent:
     """
     Base class for creating specialized agents.
+    
+    LLMs and agents are served from the process-wide agent registry, so
+    repeated calls are cheap and reuse the same clients and compiled graphs.
     """
     
     @staticmethod
-    def create_llm(model_name: str = DEFAULT_MODEL, temperature: float = DEFAULT_TEMPERATURE) -> ChatGroq:
+    def create_llm(model_name: str = DEFAULT_MODEL, temperature: float = DEFAULT_TEMPERATURE) -> BaseChatModel:
+        """
+        Get a language model instance.
+        
+        Args:
+            model_name: Name of the Groq model to use
+            temperature: Temperature setting for the LLM
+            
+        Returns:
+            Shared chat model instance
+        """
+        return agent_registry.get_llm(model_name, temperature)
+    
+    @staticmethod
+    def create_structured_llm(schema: Any, model_name: str = DEFAULT_MODEL, temperature: float = DEFAULT_TEMPERATURE):
         """
-        Create a language model instance.
+        Get a language model that returns validated structured output.
         
         Args:
+            schema: Pydantic model describing the expected output
             model_name: Name of the Groq model to use
             temperature: Temperature setting for the LLM
             
         Returns:
-            Configured ChatGroq instance
+            Shared runnable returning instances of the schema
         """
-        return ChatGroq(
-            temperature=temperature,
-            model_name=model_name
-        )
+        return agent_registry.get_structured_llm(schema, model_name, temperature)
     
     @staticmethod
     def create_agent(tools: List[BaseTool], model_name: str = DEFAULT_MODEL, temperature: float = DEFAULT_TEMPERATURE):
         """
-        Create a ReAct agent with specified tools and model.
+        Get a ReAct agent with specified tools and model.
         
         Args:
             tools: List of tools available to the agent
@@ -43,7 +58,6 @@ class BaseAgent:
             temperature: Temperature setting for the LLM
             
         Returns:
-            Configured ReAct agent
+            Shared compiled ReAct agent
         """
-        llm = BaseAgent.create_llm(model_name, temperature)
-        return create_react_agent(llm, tools)
\ No newline at end of file
+        return agent_registry.get_agent(tools, model_name, temperature)
\ No newline at end of file
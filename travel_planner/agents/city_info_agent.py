@@ -3,6 +3,7 @@ City information agent.
 Specialized agent for retrieving historical places and attractions.
 """
 from .base_agent import BaseAgent
+from ..config.settings import DEFAULT_MODEL
 from ..tools.historical_places import get_historical_places
 
 class CityInfoAgent(BaseAgent):
@@ -11,11 +12,14 @@ class CityInfoAgent(BaseAgent):
     """
     
     @staticmethod
-    def create():
+    def create(model_name: str = DEFAULT_MODEL):
         """
         Create a city information agent with appropriate tools.
         
+        Args:
+            model_name: Name of the model to use
+            
         Returns:
             Configured city information agent
         """
-        return BaseAgent.create_agent([get_historical_places])
\ No newline at end of file
+        return BaseAgent.create_agent([get_historical_places], model_name)
\ No newline at end of file
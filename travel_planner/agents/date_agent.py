@@ -3,6 +3,7 @@ Date extraction agent.
 Specialized agent for extracting and formatting dates from user input.
 """
 from .base_agent import BaseAgent
+from ..config.settings import DEFAULT_MODEL
 
 class DateAgent(BaseAgent):
     """
@@ -10,12 +11,15 @@ class DateAgent(BaseAgent):
     """
     
     @staticmethod
-    def create():
+    def create(model_name: str = DEFAULT_MODEL):
         """
         Create a date extraction agent.
         
+        Args:
+            model_name: Name of the model to use
+            
         Returns:
             Configured date agent
         """
         # This agent doesn't need external tools
-        return BaseAgent.create_agent([])
\ No newline at end of file
+        return BaseAgent.create_agent([], model_name)
\ No newline at end of file
@@ -3,6 +3,7 @@ Exchange rate agent.
 Specialized agent for providing currency exchange rates and budget information.
 """
 from .base_agent import BaseAgent
+from ..config.settings import DEFAULT_MODEL
 from ..tools.currency_tool import get_currency_rates
 
 class ExchangeRateAgent(BaseAgent):
@@ -11,11 +12,14 @@ class ExchangeRateAgent(BaseAgent):
     """
     
     @staticmethod
-    def create():
+    def create(model_name: str = DEFAULT_MODEL):
         """
         Create an exchange rate agent with appropriate tools.
         
+        Args:
+            model_name: Name of the model to use
+            
         Returns:
             Configured exchange rate agent
         """
-        return BaseAgent.create_agent([get_currency_rates])
\ No newline at end of file
+        return BaseAgent.create_agent([get_currency_rates], model_name)
\ No newline at end of file
@@ -3,7 +3,7 @@ Hotel search agent.
 Specialized agent for finding hotel options and information.
 """
 from .base_agent import BaseAgent
-from ..tools.search_tool import create_tavily_search_tool
+from ..config.settings import DEFAULT_MODEL
 
 class HotelAgent(BaseAgent):
     """
@@ -11,12 +11,18 @@ class HotelAgent(BaseAgent):
     """
     
     @staticmethod
-    def create():
+    def create(model_name: str = DEFAULT_MODEL):
         """
         Create a hotel search agent with appropriate tools.
         
+        Args:
+            model_name: Name of the model to use
+            
         Returns:
             Configured hotel search agent
         """
+        # Imported here: the Tavily client library is slow to import and only this agent needs it
+        from ..tools.search_tool import create_tavily_search_tool
+        
         tavily_tool = create_tavily_search_tool(max_results=3)
-        return BaseAgent.create_agent([tavily_tool])
\ No newline at end of file
+        return BaseAgent.create_agent([tavily_tool], model_name)
\ No newline at end of file
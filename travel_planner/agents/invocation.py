@@ -0,0 +1,124 @@
+"""
+Agent invocation helpers.
+Concurrent identical agent calls share one invocation, and runs that share a
+scope (such as one batch) also reuse identical agent results.
+"""
+import json
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from langchain_core.messages import ToolMessage
+
+from ..utils.singleflight import SingleFlight, AsyncSingleFlight
+
+class _SharedResults:
+    """Agent results shared by the runs of one scope."""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.results: Dict[Hashable, Any] = {}
+
+# Concurrent identical agent calls wait on a single invocation
+_agent_flight = SingleFlight("agent_calls")
+_async_agent_flight = AsyncSingleFlight("agent_calls_async")
+
+# Shared results of the scope active in the current context, if any
+_shared_results: ContextVar[Optional[_SharedResults]] = ContextVar("shared_agent_results", default=None)
+
+@contextmanager
+def shared_results_scope() -> Iterator[None]:
+    """
+    Share agent results between all runs started in this context.
+    
+    Within the scope, an agent invoked with exactly the same input as an
+    earlier (or concurrent) call returns that call's result instead of
+    repeating the LLM and tool calls. Runs started inside the scope inherit
+    it, because LangGraph copies the context into its node tasks.
+    """
+    token = _shared_results.set(_SharedResults())
+    try:
+        yield
+    finally:
+        _shared_results.reset(token)
+
+def invoke_agent(agent: Any, request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Invoke an agent, reusing an identical earlier result within a shared scope.
+    
+    Concurrent identical calls, from any thread, wait on a single invocation.
+    
+    Args:
+        agent: Compiled agent
+        request: Agent input
+        
+    Returns:
+        Agent output
+    """
+    key = _request_key(agent, request)
+    shared = _shared_results.get()
+    if shared is None:
+        return _agent_flight.do(key, lambda: agent.invoke(request))
+    
+    with shared.lock:
+        if key in shared.results:
+            return shared.results[key]
+    response = _agent_flight.do(key, lambda: agent.invoke(request))
+    with shared.lock:
+        shared.results[key] = response
+    return response
+
+async def ainvoke_agent(agent: Any, request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Asynchronously invoke an agent, reusing identical results within a shared scope.
+    
+    Concurrent identical calls on the event loop wait on a single invocation.
+    
+    Args:
+        agent: Compiled agent
+        request: Agent input
+        
+    Returns:
+        Agent output
+    """
+    key = _request_key(agent, request)
+    shared = _shared_results.get()
+    if shared is None:
+        return await _async_agent_flight.do(key, lambda: agent.ainvoke(request))
+    
+    with shared.lock:
+        if key in shared.results:
+            return shared.results[key]
+    # Concurrent identical calls wait on one invocation; failed calls are not
+    # stored, so a later identical call retries
+    response = await _async_agent_flight.do(key, lambda: agent.ainvoke(request))
+    with shared.lock:
+        shared.results[key] = response
+    return response
+
+def tool_results(response: Dict[str, Any], tool_name: str) -> List[Any]:
+    """
+    Get the outputs of every call an agent made to a tool.
+    
+    Args:
+        response: Agent output
+        tool_name: Name of the tool
+        
+    Returns:
+        Tool outputs in call order, parsed from JSON where possible
+    """
+    results = []
+    for message in response["messages"]:
+        if isinstance(message, ToolMessage) and message.name == tool_name:
+            try:
+                results.append(json.loads(message.content))
+            except (TypeError, ValueError):
+                results.append(message.content)
+    return results
+
+def _request_key(agent: Any, request: Dict[str, Any]) -> Tuple[int, Tuple[str, ...]]:
+    """
+    Identify an agent call by the agent and the content of its input messages.
+    """
+    return id(agent), tuple(str(message.content) for message in request["messages"])
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+Agent registry.
+Builds each LLM client and ReAct agent once per process and shares them.
+"""
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.tools import BaseTool
+
+from ..config.settings import DEFAULT_MODEL, DEFAULT_TEMPERATURE, LLM_REQUEST_TIMEOUT_SECONDS, UPSTREAM_MAX_RETRIES
+from ..utils.http import get_shared_async_http_client, get_shared_http_client
+from ..utils.rate_limit import ProviderRateLimiter, get_provider
+
+if TYPE_CHECKING:
+    from langchain_groq import ChatGroq
+
+LLMFactory = Callable[[str, float], BaseChatModel]
+
+def create_groq_llm(model_name: str, temperature: float) -> "ChatGroq":
+    """
+    Create a Groq chat model that uses the shared HTTP connection pools.
+    
+    Calls draw from the Groq request quota, and the Groq client retries
+    rate limited calls with jittered backoff, honoring Retry-After. Each call
+    times out after LLM_REQUEST_TIMEOUT_SECONDS, or earlier at the request deadline.
+    
+    Args:
+        model_name: Name of the Groq model to use
+        temperature: Temperature setting for the LLM
+        
+    Returns:
+        Configured ChatGroq instance
+    """
+    # Imported on first use to keep the package quick to import
+    from langchain_groq import ChatGroq
+    
+    return ChatGroq(
+        temperature=temperature,
+        model_name=model_name,
+        http_client=get_shared_http_client(),
+        http_async_client=get_shared_async_http_client(),
+        rate_limiter=ProviderRateLimiter(get_provider("groq")),
+        max_retries=UPSTREAM_MAX_RETRIES,
+        request_timeout=LLM_REQUEST_TIMEOUT_SECONDS
+    )
+
+class AgentRegistry:
+    """
+    Process-wide cache of LLM clients, structured-output runnables and
+    compiled ReAct agents.
+    
+    Compiled agents hold no per-request state, so a single instance per
+    (model, temperature, toolset) can safely serve concurrent requests.
+    """
+    
+    def __init__(self, llm_factory: Optional[LLMFactory] = None):
+        self._lock = threading.RLock()
+        self._llm_factory = llm_factory or create_groq_llm
+        self._llms: Dict[Tuple[str, float], BaseChatModel] = {}
+        self._structured: Dict[Tuple[Any, str, float], Any] = {}
+        self._agents: Dict[Tuple[Tuple[Tuple[str, int], ...], str, float], Any] = {}
+    
+    def get_llm(self, model_name: str = DEFAULT_MODEL, temperature: float = DEFAULT_TEMPERATURE) -> BaseChatModel:
+        """
+        Get the shared chat model for a model and temperature.
+        
+        Args:
+            model_name: Name of the model to use
+            temperature: Temperature setting for the LLM
+            
+        Returns:
+            Cached chat model instance
+        """
+        key = (model_name, temperature)
+        llm = self._llms.get(key)
+        if llm is None:
+            with self._lock:
+                llm = self._llms.get(key)
+                if llm is None:
+                    llm = self._llm_factory(model_name, temperature)
+                    self._llms[key] = llm
+        return llm
+    
+    def get_structured_llm(self, schema: Any, model_name: str = DEFAULT_MODEL, temperature: float = DEFAULT_TEMPERATURE):
+        """
+        Get the shared chat model bound to a structured output schema.
+        
+        Args:
+            schema: Pydantic model describing the expected output
+            model_name: Name of the model to use
+            temperature: Temperature setting for the LLM
+            
+        Returns:
+            Cached runnable returning instances of the schema
+        """
+        key = (schema, model_name, temperature)
+        runnable = self._structured.get(key)
+        if runnable is None:
+            with self._lock:
+                runnable = self._structured.get(key)
+                if runnable is None:
+                    runnable = self.get_llm(model_name, temperature).with_structured_output(schema)
+                    self._structured[key] = runnable
+        return runnable
+    
+    def get_agent(self, tools: Sequence[BaseTool], model_name: str = DEFAULT_MODEL, temperature: float = DEFAULT_TEMPERATURE):
+        """
+        Get the shared ReAct agent for a toolset, model and temperature.
+        
+        Args:
+            tools: Tools available to the agent
+            model_name: Name of the model to use
+            temperature: Temperature setting for the LLM
+            
+        Returns:
+            Cached compiled ReAct agent
+        """
+        key = (_toolset_key(tools), model_name, temperature)
+        agent = self._agents.get(key)
+        if agent is None:
+            with self._lock:
+                agent = self._agents.get(key)
+                if agent is None:
+                    from langgraph.prebuilt import create_react_agent
+                    
+                    # Agents are shared by all runs and never checkpoint their inner
+                    # steps; a checkpointed workflow resumes at node granularity
+                    agent = create_react_agent(self.get_llm(model_name, temperature), list(tools), checkpointer=False)
+                    self._agents[key] = agent
+        return agent
+    
+    def set_llm_factory(self, llm_factory: Optional[LLMFactory]) -> None:
+        """
+        Replace the LLM factory and drop everything built with the old one.
+        
+        Args:
+            llm_factory: Callable taking (model_name, temperature), or None
+                to restore the default Groq factory
+        """
+        with self._lock:
+            self._llm_factory = llm_factory or create_groq_llm
+            self.clear()
+    
+    def clear(self) -> None:
+        """
+        Drop all cached LLMs and agents.
+        """
+        with self._lock:
+            self._llms.clear()
+            self._structured.clear()
+            self._agents.clear()
+
+def _toolset_key(tools: List[BaseTool]) -> Tuple[Tuple[str, int], ...]:
+    """
+    Build a hashable key identifying a toolset.
+    
+    Tool instances are included by identity because two tools with the same
+    name can be configured differently (for example the Tavily result count).
+    """
+    return tuple((tool.name, id(tool)) for tool in tools)
+
+# Process-wide registry used by all agents
+agent_registry = AgentRegistry()
\ No newline at end of file
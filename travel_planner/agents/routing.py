@@ -0,0 +1,151 @@
+"""
+Model routing.
+Runs each workflow node on the model configured for it (see NODE_MODELS) and
+retries on the fallback model when the routed model's output fails validation.
+"""
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+from langchain_core.exceptions import OutputParserException
+from pydantic import ValidationError
+
+from ..config.settings import get_fallback_model, get_node_model
+from ..utils.metrics import record_model_fallback
+from .invocation import ainvoke_agent, invoke_agent, tool_results
+
+T = TypeVar("T")
+
+@lru_cache(maxsize=None)
+def output_errors() -> Tuple[type, ...]:
+    """
+    Errors raised when a model's output does not have the expected form.
+    
+    Groq rejects malformed tool calls with a 400 "tool_use_failed" error. The
+    Groq SDK is imported only when a failed call's error has to be matched.
+    """
+    import groq
+    
+    return (OutputParserException, ValidationError, groq.BadRequestError)
+
+def is_present(result: Any) -> bool:
+    """
+    Default validation: the call returned something.
+    
+    Structured output runnables return None when the model skips the schema.
+    """
+    return result is not None
+
+def has_answer(response: Dict[str, Any]) -> bool:
+    """
+    Check that an agent ended with a non-empty answer.
+    
+    Args:
+        response: Agent output
+        
+    Returns:
+        True if the last message has content
+    """
+    return bool(str(response["messages"][-1].content).strip())
+
+def called_tool(tool_name: str) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Build a validator checking that an agent used its tool and answered.
+    
+    Args:
+        tool_name: Name of the tool the agent must call
+        
+    Returns:
+        Validator for agent outputs
+    """
+    def validate(response: Dict[str, Any]) -> bool:
+        return has_answer(response) and bool(tool_results(response, tool_name))
+    return validate
+
+def run_routed(node: str, call: Callable[[str], T], is_valid: Callable[[T], bool] = is_present) -> T:
+    """
+    Run a model call on the node's model, falling back to the larger model.
+    
+    The fallback is used when the routed model raises one of output_errors() or
+    its result fails validation. Without a fallback model the routed model's
+    result (or error) is returned as it is.
+    
+    Args:
+        node: Workflow node name
+        call: Function making the call with a given model ID
+        is_valid: Validation of the result
+        
+    Returns:
+        Result of the routed model, or of the fallback model
+    """
+    model = get_node_model(node)
+    fallback = get_fallback_model(node)
+    if fallback is None:
+        return call(model)
+        
+    try:
+        result = call(model)
+        if is_valid(result):
+            return result
+    except output_errors():
+        pass
+    record_model_fallback(node, model)
+    return call(fallback)
+
+async def arun_routed(node: str, acall: Callable[[str], Awaitable[T]],
+                      is_valid: Callable[[T], bool] = is_present) -> T:
+    """
+    Asynchronously run a model call on the node's model, falling back to the larger model.
+    
+    Args:
+        node: Workflow node name
+        acall: Coroutine function making the call with a given model ID
+        is_valid: Validation of the result
+        
+    Returns:
+        Result of the routed model, or of the fallback model
+    """
+    model = get_node_model(node)
+    fallback = get_fallback_model(node)
+    if fallback is None:
+        return await acall(model)
+        
+    try:
+        result = await acall(model)
+        if is_valid(result):
+            return result
+    except output_errors():
+        pass
+    record_model_fallback(node, model)
+    return await acall(fallback)
+
+def invoke_routed_agent(node: str, create: Callable[[str], Any], request: Dict[str, Any],
+                        is_valid: Callable[[Dict[str, Any]], bool] = has_answer) -> Dict[str, Any]:
+    """
+    Invoke the agent built by ``create`` on the node's model.
+    
+    Args:
+        node: Workflow node name
+        create: Agent factory taking a model ID (such as WeatherAgent.create)
+        request: Agent input with messages
+        is_valid: Validation of the agent output
+        
+    Returns:
+        Agent output
+    """
+    return run_routed(node, lambda model: invoke_agent(create(model), request), is_valid)
+
+async def ainvoke_routed_agent(node: str, create: Callable[[str], Any], request: Dict[str, Any],
+                               is_valid: Callable[[Dict[str, Any]], bool] = has_answer) -> Dict[str, Any]:
+    """
+    Asynchronously invoke the agent built by ``create`` on the node's model.
+    
+    Args:
+        node: Workflow node name
+        create: Agent factory taking a model ID (such as WeatherAgent.create)
+        request: Agent input with messages
+        is_valid: Validation of the agent output
+        
+    Returns:
+        Agent output
+    """
+    return await arun_routed(node, lambda model: ainvoke_agent(create(model), request), is_valid)
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+Summary agent.
+Writes an answer from tool results a node has already retrieved.
+"""
+from .base_agent import BaseAgent
+from ..config.settings import DEFAULT_MODEL
+
+class SummaryAgent(BaseAgent):
+    """
+    Agent that answers in a single LLM call from data given in the request.
+    """
+    
+    @staticmethod
+    def create(model_name: str = DEFAULT_MODEL):
+        """
+        Create a summary agent.
+        
+        Args:
+            model_name: Name of the model to use
+            
+        Returns:
+            Configured summary agent
+        """
+        # The node calls the tools itself, so the agent only writes the answer
+        return BaseAgent.create_agent([], model_name)
\ No newline at end of file
@@ -3,6 +3,7 @@ Travel planner agent.
 Specialized agent for creating comprehensive travel plans.
 """
 from .base_agent import BaseAgent
+from ..config.settings import DEFAULT_MODEL
 
 class TravelPlannerAgent(BaseAgent):
     """
@@ -10,12 +11,15 @@ class TravelPlannerAgent(BaseAgent):
     """
     
     @staticmethod
-    def create():
+    def create(model_name: str = DEFAULT_MODEL):
         """
         Create a travel planner agent.
         
+        Args:
+            model_name: Name of the model to use
+            
         Returns:
             Configured travel planner agent
         """
         # This agent doesn't need external tools, it processes existing information
-        return BaseAgent.create_agent([])
\ No newline at end of file
+        return BaseAgent.create_agent([], model_name)
\ No newline at end of file
@@ -3,6 +3,7 @@ Weather information agent.
 Specialized agent for retrieving weather forecasts and clothing recommendations.
 """
 from .base_agent import BaseAgent
+from ..config.settings import DEFAULT_MODEL
 from ..tools.weather_tool import get_weather
 
 class WeatherAgent(BaseAgent):
@@ -11,11 +12,14 @@ class WeatherAgent(BaseAgent):
     """
     
     @staticmethod
-    def create():
+    def create(model_name: str = DEFAULT_MODEL):
         """
         Create a weather agent with appropriate tools.
         
+        Args:
+            model_name: Name of the model to use
+            
         Returns:
             Configured weather agent
         """
-        return BaseAgent.create_agent([get_weather])
\ No newline at end of file
+        return BaseAgent.create_agent([get_weather], model_name)
\ No newline at end of file
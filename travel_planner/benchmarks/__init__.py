@@ -0,0 +1,4 @@
+"""
+Benchmarks for the travel planning workflow.
+Run with stubbed agents so they need no API keys or network access.
+"""
@@ -0,0 +1,92 @@
+"""
+Deterministic chat model for offline benchmarks.
+Follows a fixed script with configurable latency and token generation rate.
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Chat model that drives ReAct agents through one scripted tool round.
+    
+    When tools are bound and the conversation has no tool result yet, the
+    model calls every bound tool that has scripted arguments; otherwise it
+    answers with a fixed number of tokens. Bound structured output schemas
+    are answered with their scripted arguments, so extraction works too.
+    
+    Each call waits ``latency`` seconds plus the time needed to produce its
+    tokens at ``tokens_per_second`` (0 means instantly).
+    
+    Attributes:
+        tool_args: Arguments returned for each tool or schema name
+        answer_tokens: Tokens in a final answer
+        latency: Seconds before the first token
+        tokens_per_second: Token generation rate
+        bound_tools: Names of the tools bound to this instance
+    """
+    tool_args: Dict[str, Dict[str, Any]]
+    answer_tokens: int = 120
+    latency: float = 0.0
+    tokens_per_second: float = 0.0
+    bound_tools: List[str] = []
+    
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+        
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "ScriptedChatModel":
+        names = [
+            tool.name if isinstance(tool, BaseTool) else convert_to_openai_tool(tool)["function"]["name"]
+            for tool in tools
+        ]
+        return self.model_copy(update={"bound_tools": names})
+        
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[Any] = None, **kwargs: Any) -> ChatResult:
+        message = self._next_message(messages)
+        time.sleep(self._duration(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+        
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[Any] = None, **kwargs: Any) -> ChatResult:
+        message = self._next_message(messages)
+        await asyncio.sleep(self._duration(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+        
+    def _next_message(self, messages: List[BaseMessage]) -> AIMessage:
+        """Build the scripted reply to a conversation."""
+        prompt_tokens = sum(len(str(message.content)) for message in messages) // 4
+        
+        if not isinstance(messages[-1], ToolMessage):
+            tool_calls = [
+                {"name": name, "args": self.tool_args[name], "id": f"call_{index}_{name}"}
+                for index, name in enumerate(self.bound_tools)
+                if name in self.tool_args
+            ]
+            if tool_calls:
+                completion_tokens = 20 * len(tool_calls)
+                return AIMessage(content="", tool_calls=tool_calls, usage_metadata=_usage(prompt_tokens, completion_tokens))
+                
+        content = " ".join(f"token{index}" for index in range(self.answer_tokens))
+        return AIMessage(content=content, usage_metadata=_usage(prompt_tokens, self.answer_tokens))
+        
+    def _duration(self, message: AIMessage) -> float:
+        """Simulated time to produce a message."""
+        if not self.tokens_per_second:
+            return self.latency
+        return self.latency + message.usage_metadata["output_tokens"] / self.tokens_per_second
+
+def _usage(prompt_tokens: int, completion_tokens: int) -> Dict[str, int]:
+    """Build usage metadata for a scripted message."""
+    return {
+        "input_tokens": prompt_tokens,
+        "output_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens
+    }
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""
+Import time check.
+Measures how long a fresh interpreter takes to import the CLI entry point
+(what every CLI run and short-lived worker pays before doing any work) and
+fails when it is over budget or loads libraries that are meant to load lazily.
+
+Run with:
+    python -m travel_planner.benchmarks.import_time --budget-ms 1500
+"""
+import argparse
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Module imported by a CLI run or worker before it starts working
+DEFAULT_MODULE = "travel_planner.main"
+
+# Import time allowed for the module (milliseconds); about 1.5x the usual
+# time, so machine noise passes and loading a heavy library early does not
+DEFAULT_BUDGET_MS = 1500
+
+# Modules imported only when first used (graph visualization, Groq client,
+# ReAct agents, Tavily search, and the CLI's server, batch, cache warmup and
+# checkpointing modes)
+LAZY_MODULES = (
+    "IPython",
+    "groq",
+    "langchain_groq",
+    "langgraph.prebuilt",
+    "langchain_community.tools.tavily_search",
+    "travel_planner.workflow.server",
+    "travel_planner.workflow.batch",
+    "travel_planner.workflow.cache_warmup",
+    "travel_planner.workflow.checkpoint",
+)
+
+# One line of ``python -X importtime`` output: self and cumulative microseconds, module
+_IMPORTTIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+def measure_imports(module: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Import a module in a fresh interpreter and record every import it makes.
+    
+    Args:
+        module: Module to import
+        
+    Returns:
+        Self and cumulative import time in microseconds, keyed by module name
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    imports = {}
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_PATTERN.match(line)
+        if match:
+            imports[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return imports
+
+def check_import_time(module: str, budget_ms: float, runs: int = 3) -> Tuple[float, List[str], Dict[str, Tuple[int, int]]]:
+    """
+    Check a module's import time and lazily loaded libraries.
+    
+    The fastest of several runs is compared with the budget, so a busy
+    machine does not fail the check by chance.
+    
+    Args:
+        module: Module to import
+        budget_ms: Import time allowed in milliseconds
+        runs: Number of fresh interpreters to measure
+        
+    Returns:
+        Fastest import time in milliseconds, problems found (empty if the
+        check passed), and the imports of the fastest run
+    """
+    measurements = [measure_imports(module) for _ in range(runs)]
+    fastest = min(measurements, key=lambda imports: imports.get(module, (0, 0))[1])
+    import_ms = fastest.get(module, (0, 0))[1] / 1000
+    
+    problems = []
+    if import_ms > budget_ms:
+        problems.append(f"importing {module} took {import_ms:.0f} ms, over the {budget_ms:.0f} ms budget")
+    for lazy_module in LAZY_MODULES:
+        if lazy_module in fastest:
+            problems.append(f"importing {module} also imports {lazy_module}, which should load on first use")
+    return import_ms, problems, fastest
+
+def format_slowest(imports: Dict[str, Tuple[int, int]], count: int = 15) -> str:
+    """
+    List the modules that took longest to import themselves.
+    
+    Args:
+        imports: Self and cumulative import times keyed by module name
+        count: Number of modules to list
+        
+    Returns:
+        Multi-line table text
+    """
+    lines = [f"{'module':<60}{'self ms':>10}{'total ms':>10}"]
+    slowest = sorted(imports.items(), key=lambda item: item[1][0], reverse=True)[:count]
+    for name, (self_us, cumulative_us) in slowest:
+        lines.append(f"{name:<60}{self_us / 1000:>10.1f}{cumulative_us / 1000:>10.1f}")
+    return "\n".join(lines)
+
+def main():
+    """
+    Import time check entry point.
+    """
+    parser = argparse.ArgumentParser(description="Check the import time of the travel planner entry point")
+    parser.add_argument("--module", type=str, default=DEFAULT_MODULE, help="Module to import")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Import time allowed in milliseconds")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to measure; the fastest counts")
+    parser.add_argument("--verbose", action="store_true", help="Also list the slowest imports")
+    args = parser.parse_args()
+    
+    import_ms, problems, imports = check_import_time(args.module, args.budget_ms, args.runs)
+    print(f"{args.module}: {import_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    if args.verbose:
+        print(format_slowest(imports))
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Parallel workflow benchmark.
+Compares the sequential and fan-out graph topologies using stubbed agents.
+
+Run with:
+    python -m travel_planner.benchmarks.parallel_workflow --latency 0.5
+"""
+import argparse
+import asyncio
+import time
+from contextlib import ExitStack
+from typing import Dict, Any, List
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage
+
+from ..agents.base_agent import BaseAgent
+from ..agents.weather_agent import WeatherAgent
+from ..agents.city_info_agent import CityInfoAgent
+from ..agents.hotel_agent import HotelAgent
+from ..agents.exchange_rate_agent import ExchangeRateAgent
+from ..agents.travel_planner_agent import TravelPlannerAgent
+from ..nodes import city_info_node
+from ..state.travel_state import create_initial_state
+from ..state.trip_details import TripDetails
+from ..workflow.graph_builder import build_travel_planning_workflow
+
+class StubAgent:
+    """
+    Agent stand-in that sleeps for a fixed latency and returns canned text.
+    """
+    
+    def __init__(self, name: str, latency: float):
+        self.name = name
+        self.latency = latency
+    
+    def invoke(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        time.sleep(self.latency)
+        return {"messages": inputs["messages"] + [AIMessage(content=f"{self.name} result")]}
+    
+    async def ainvoke(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        await asyncio.sleep(self.latency)
+        return {"messages": inputs["messages"] + [AIMessage(content=f"{self.name} result")]}
+
+class StubLLM:
+    """
+    Extraction LLM stand-in returning fixed trip details.
+    """
+    
+    def invoke(self, messages: List[Any]) -> TripDetails:
+        return TripDetails(city="Paris", travel_date="2025-06-07")
+    
+    async def ainvoke(self, messages: List[Any]) -> TripDetails:
+        return self.invoke(messages)
+
+def run_benchmark(latency: float, runs: int) -> Dict[str, float]:
+    """
+    Run both topologies, and the parallel one through the async path, with
+    stubbed agents and measure wall-clock time.
+    
+    Args:
+        latency: Simulated latency of every agent call in seconds
+        runs: Number of runs per topology
+        
+    Returns:
+        Mean wall-clock seconds per run keyed by topology
+    """
+    agents = {
+        WeatherAgent: "weather",
+        CityInfoAgent: "city_info",
+        HotelAgent: "hotels",
+        ExchangeRateAgent: "budget",
+        TravelPlannerAgent: "travel_plan",
+    }
+    
+    results = {}
+    with ExitStack() as stack:
+        for agent_cls, name in agents.items():
+            stub = StubAgent(name, latency)
+            stack.enter_context(patch.object(agent_cls, "create", lambda model_name=None, stub=stub: stub))
+        stack.enter_context(patch.object(BaseAgent, "create_structured_llm", lambda *args, **kwargs: StubLLM()))
+        # Keep the persistent city cache out of the measurement
+        stack.enter_context(patch.object(city_info_node, "city_cache", None))
+        
+        for topology, parallel in (("sequential", False), ("parallel", True)):
+            app = build_travel_planning_workflow(parallel=parallel)
+            started = time.perf_counter()
+            for _ in range(runs):
+                result = app.invoke(create_initial_state("Trip to Paris on 2025-06-07"))
+                assert result["travel_plan"] == "travel_plan result"
+            results[topology] = (time.perf_counter() - started) / runs
+        
+        # Same parallel graph driven through the async nodes
+        app = build_travel_planning_workflow()
+        started = time.perf_counter()
+        for _ in range(runs):
+            result = asyncio.run(app.ainvoke(create_initial_state("Trip to Paris on 2025-06-07")))
+            assert result["travel_plan"] == "travel_plan result"
+        results["async"] = (time.perf_counter() - started) / runs
+    
+    return results
+
+def main():
+    """
+    Benchmark entry point.
+    """
+    parser = argparse.ArgumentParser(description="Sequential vs parallel workflow benchmark")
+    parser.add_argument("--latency", type=float, default=0.5, help="Simulated seconds per agent call")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per topology")
+    args = parser.parse_args()
+    
+    results = run_benchmark(args.latency, args.runs)
+    for topology, seconds in results.items():
+        print(f"{topology:<12} {seconds:.3f}s per plan")
+    print(f"speedup      {results['sequential'] / results['parallel']:.2f}x")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,170 @@
+"""
+Offline pipeline benchmark.
+Runs the full travel planning graph against recorded tool responses and a
+scripted chat model, under several load and cache scenarios.
+
+Run with:
+    python -m travel_planner.benchmarks.pipeline --llm-latency 0.3 --tool-latency 0.1 --concurrency 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from ..state.travel_state import create_initial_state
+from ..utils.latency import summarize_latencies
+from ..workflow.graph_builder import build_travel_planning_workflow
+from .replay import OfflineEnvironment, offline_environment
+
+# Query matching the recorded fixtures
+BENCHMARK_QUERY = "Trip to Paris on 2025-06-07 for 2 people, 3 nights, flying from Istanbul"
+
+def _timed_plan(app: Any) -> float:
+    """Plan the benchmark query synchronously and return its latency."""
+    started = time.perf_counter()
+    result = app.invoke(create_initial_state(BENCHMARK_QUERY))
+    assert result["travel_plan"], "workflow produced no travel plan"
+    return time.perf_counter() - started
+
+async def _atimed_plan(app: Any) -> float:
+    """Plan the benchmark query asynchronously and return its latency."""
+    started = time.perf_counter()
+    result = await app.ainvoke(create_initial_state(BENCHMARK_QUERY))
+    assert result["travel_plan"], "workflow produced no travel plan"
+    return time.perf_counter() - started
+
+def _scenario_result(latencies: List[float], wall_seconds: float, requests: int) -> Dict[str, Any]:
+    """Summarize one scenario."""
+    return {
+        "plans": len(latencies),
+        "wall_seconds": wall_seconds,
+        "plans_per_second": len(latencies) / wall_seconds if wall_seconds else 0.0,
+        "latency": summarize_latencies(latencies),
+        "upstream_requests": requests
+    }
+
+def _upstream_requests(environment: OfflineEnvironment) -> int:
+    """Total recorded HTTP requests served so far."""
+    return sum(environment.transport.requests.values())
+
+def run_scenarios(environment: OfflineEnvironment, runs: int, concurrency: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Run every benchmark scenario in an offline environment.
+    
+    Scenarios:
+        cold: single sync plans, caches emptied before each one
+        warm: single sync plans with the caches filled by the previous plan (plan cache hits)
+        concurrent: ``concurrency`` async plans at once, starting cold
+        
+    Args:
+        environment: Active offline environment
+        runs: Plans per single-request scenario, and rounds of the concurrent one
+        concurrency: Plans started at once in the concurrent scenario
+        
+    Returns:
+        Results keyed by scenario name
+    """
+    app = build_travel_planning_workflow()
+    results = {}
+    
+    latencies = []
+    requests_before = _upstream_requests(environment)
+    started = time.perf_counter()
+    for _ in range(runs):
+        environment.clear_caches()
+        latencies.append(_timed_plan(app))
+    results["cold"] = _scenario_result(
+        latencies, time.perf_counter() - started, _upstream_requests(environment) - requests_before
+    )
+    
+    _timed_plan(app)
+    latencies = []
+    requests_before = _upstream_requests(environment)
+    started = time.perf_counter()
+    for _ in range(runs):
+        latencies.append(_timed_plan(app))
+    results["warm"] = _scenario_result(
+        latencies, time.perf_counter() - started, _upstream_requests(environment) - requests_before
+    )
+    
+    async def concurrent_rounds() -> List[float]:
+        round_latencies = []
+        for _ in range(runs):
+            environment.clear_caches()
+            round_latencies += await asyncio.gather(*(_atimed_plan(app) for _ in range(concurrency)))
+        return round_latencies
+        
+    requests_before = _upstream_requests(environment)
+    started = time.perf_counter()
+    latencies = asyncio.run(concurrent_rounds())
+    results[f"concurrent_{concurrency}"] = _scenario_result(
+        latencies, time.perf_counter() - started, _upstream_requests(environment) - requests_before
+    )
+    
+    return results
+
+def run_benchmark(
+    runs: int = 3,
+    concurrency: int = 8,
+    llm_latency: float = 0.0,
+    tokens_per_second: float = 0.0,
+    tool_latency: float = 0.0
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run all scenarios with a scratch city cache.
+    
+    Args:
+        runs: Plans per single-request scenario, and rounds of the concurrent one
+        concurrency: Plans started at once in the concurrent scenario
+        llm_latency: Seconds before the first token of every LLM call
+        tokens_per_second: LLM token generation rate (0 for instant)
+        tool_latency: Simulated seconds per tool request
+        
+    Returns:
+        Results keyed by scenario name
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        cache_path = os.path.join(scratch, "city_cache.sqlite3")
+        with offline_environment(cache_path, llm_latency, tokens_per_second, tool_latency) as environment:
+            return run_scenarios(environment, runs, concurrency)
+
+def format_results(results: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Format scenario results as a table.
+    
+    Args:
+        results: Results returned by run_benchmark
+        
+    Returns:
+        Multi-line table text
+    """
+    lines = [f"{'scenario':<16}{'plans':>7}{'plans/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'http':>7}"]
+    for scenario, result in results.items():
+        latency = result["latency"]
+        lines.append(
+            f"{scenario:<16}{result['plans']:>7}{result['plans_per_second']:>10.2f}"
+            f"{latency['p50']:>8.3f}s{latency['p95']:>8.3f}s{latency['p99']:>8.3f}s{result['upstream_requests']:>7}"
+        )
+    return "\n".join(lines)
+
+def main():
+    """
+    Benchmark entry point.
+    """
+    parser = argparse.ArgumentParser(description="Offline benchmark of the full travel planning workflow")
+    parser.add_argument("--runs", type=int, default=3, help="Plans per single-request scenario and rounds of the concurrent one")
+    parser.add_argument("--concurrency", type=int, default=8, help="Plans started at once in the concurrent scenario")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Simulated seconds before the first token of every LLM call")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Simulated LLM generation rate (0 for instant)")
+    parser.add_argument("--tool-latency", type=float, default=0.1, help="Simulated seconds per tool request")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON for comparison between runs")
+    args = parser.parse_args()
+    
+    results = run_benchmark(args.runs, args.concurrency, args.llm_latency, args.tokens_per_second, args.tool_latency)
+    print(json.dumps(results, indent=2) if args.json else format_results(results))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
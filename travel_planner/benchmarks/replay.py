@@ -0,0 +1,167 @@
+"""
+Offline replay environment.
+Serves recorded tool responses and a scripted chat model so the full workflow
+runs without API keys or network access.
+"""
+import asyncio
+import json
+import os
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator
+from unittest.mock import patch
+
+import httpx
+
+from ..agents.registry import agent_registry
+from ..nodes import city_info_node
+from ..nodes.extract_trip_details import trip_details_cache
+from ..state.trip_details import TripDetails
+from ..tools import historical_places
+from ..tools.currency_tool import rate_table_cache
+from ..tools.weather_tool import forecast_cache
+from ..utils.http import set_http_transport
+from ..utils.persistent_cache import PersistentCache
+from ..utils.plan_cache import plan_cache
+from .fake_chat_model import ScriptedChatModel
+
+# Directory holding the recorded responses
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# Recorded response served for each upstream host
+HOST_FIXTURES = {
+    "api.tavily.com": "tavily_search.json",
+    "api.openweathermap.org": "openweather_forecast.json",
+    "v6.exchangerate-api.com": "exchange_rates.json",
+    "en.wikipedia.org": "wikipedia_search.json",
+}
+
+def load_fixture(name: str) -> Any:
+    """
+    Load a recorded response.
+    
+    Args:
+        name: File name inside the fixtures directory
+        
+    Returns:
+        Parsed JSON content
+    """
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as fixture_file:
+        return json.load(fixture_file)
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    HTTP transport answering every request with the recorded response for its host.
+    
+    Attributes:
+        latency: Simulated seconds per request
+        requests: Number of requests served, per host
+    """
+    
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests: Dict[str, int] = {}
+        self._responses = {host: json.dumps(load_fixture(name)).encode() for host, name in HOST_FIXTURES.items()}
+        
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        time.sleep(self.latency)
+        return self._response(request)
+        
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latency)
+        return self._response(request)
+        
+    def _response(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.requests[host] = self.requests.get(host, 0) + 1
+        body = self._responses.get(host)
+        if body is None:
+            return httpx.Response(404, json={"error": f"No recorded response for {host}"})
+        return httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+
+def scripted_chat_model(latency: float = 0.0, tokens_per_second: float = 0.0) -> ScriptedChatModel:
+    """
+    Create the scripted chat model from the recorded LLM script.
+    
+    Args:
+        latency: Seconds before the first token of every call
+        tokens_per_second: Token generation rate (0 for instant)
+        
+    Returns:
+        Chat model answering extraction and agent calls from the script
+    """
+    script = load_fixture("llm_script.json")
+    return ScriptedChatModel(
+        tool_args={**script["tool_calls"], TripDetails.__name__: script["trip_details"]},
+        answer_tokens=script["answer_tokens"],
+        latency=latency,
+        tokens_per_second=tokens_per_second
+    )
+
+@dataclass
+class OfflineEnvironment:
+    """
+    Handles of an active offline environment.
+    
+    Attributes:
+        transport: Transport serving the recorded HTTP responses
+        city_cache: Scratch city cache used by the workflow
+    """
+    transport: ReplayTransport
+    city_cache: PersistentCache
+    
+    def clear_caches(self) -> None:
+        """
+        Empty the tool, city, trip details and plan caches so the next run starts cold.
+        """
+        forecast_cache.clear()
+        rate_table_cache.clear()
+        trip_details_cache.clear()
+        plan_cache.clear()
+        self.city_cache.clear()
+
+@contextmanager
+def offline_environment(
+    cache_path: str,
+    llm_latency: float = 0.0,
+    tokens_per_second: float = 0.0,
+    tool_latency: float = 0.0
+) -> Iterator[OfflineEnvironment]:
+    """
+    Run the workflow against recorded responses instead of live services.
+    
+    Installs the scripted chat model in the agent registry, replays the
+    Tavily, OpenWeather, exchange rate and Wikipedia responses through the
+    shared HTTP clients, and points the city cache at a scratch SQLite file.
+    Everything is restored on exit.
+    
+    Args:
+        cache_path: SQLite file used as the city cache
+        llm_latency: Seconds before the first token of every LLM call
+        tokens_per_second: LLM token generation rate (0 for instant)
+        tool_latency: Simulated seconds per tool request
+        
+    Yields:
+        The active offline environment, starting with empty caches
+    """
+    transport = ReplayTransport(tool_latency)
+    city_cache = PersistentCache("benchmark_city_cache", cache_path, max_age_seconds=float("inf"))
+    with ExitStack() as stack:
+        stack.enter_context(patch.dict(os.environ, {
+            key: os.environ.get(key) or "offline"
+            for key in ("TAVILY_API_KEY", "OPENWEATHER_API_KEY", "EXCHANGE_RATE_API_KEY")
+        }))
+        stack.enter_context(patch.object(city_info_node, "city_cache", city_cache))
+        stack.enter_context(patch.object(historical_places, "city_cache", city_cache))
+        stack.callback(city_cache.close)
+        
+        agent_registry.set_llm_factory(lambda model_name, temperature: scripted_chat_model(llm_latency, tokens_per_second))
+        stack.callback(agent_registry.set_llm_factory, None)
+        set_http_transport(transport)
+        stack.callback(set_http_transport, None)
+        
+        environment = OfflineEnvironment(transport, city_cache)
+        environment.clear_caches()
+        stack.callback(environment.clear_caches)
+        yield environment
\ No newline at end of file
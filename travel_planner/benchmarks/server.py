@@ -0,0 +1,176 @@
+"""
+Offline server check.
+Runs the HTTP server against recorded tool responses and the scripted chat
+model, checks every endpoint, backpressure and draining, and measures plan
+latency and throughput under concurrent clients.
+
+Run with:
+    python -m travel_planner.benchmarks.server --clients 16 --workers 4 --queue-size 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+from ..utils.latency import summarize_latencies
+from ..workflow.graph_builder import build_travel_planning_workflow
+from ..workflow.server import PlannerServer
+from .pipeline import BENCHMARK_QUERY
+from .replay import OfflineEnvironment, offline_environment
+
+def _client(server: PlannerServer) -> httpx.AsyncClient:
+    """Create an HTTP client calling the server in-process."""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=server), base_url="http://travel-planner", timeout=None)
+
+def _sse_events(text: str) -> List[Tuple[str, Any]]:
+    """Parse a server-sent event stream into (event, data) pairs."""
+    events = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields.get("data", "null"))))
+    return events
+
+async def check_endpoints(environment: OfflineEnvironment) -> List[str]:
+    """
+    Check the responses of every endpoint, backpressure and draining.
+    
+    Args:
+        environment: Offline environment the workflow runs in
+        
+    Returns:
+        Problems found (empty if the check passed)
+    """
+    problems = []
+    
+    def expect(condition: bool, problem: str) -> None:
+        if not condition:
+            problems.append(problem)
+            
+    server = PlannerServer(build_travel_planning_workflow(), workers=1, queue_size=1)
+    async with _client(server) as client:
+        health = await client.get("/healthz")
+        expect(health.status_code == 200 and health.json()["status"] == "ok", f"GET /healthz answered {health.status_code}")
+        
+        plan = await client.post("/plan", json={"query": BENCHMARK_QUERY})
+        expect(plan.status_code == 200 and plan.json().get("travel_plan"), f"POST /plan answered {plan.status_code}")
+        expect(plan.status_code != 200 or plan.json().get("city") == "Paris", "POST /plan did not report the extracted city")
+        
+        environment.clear_caches()
+        stream = await client.post("/plan/stream", json={"query": BENCHMARK_QUERY})
+        events = _sse_events(stream.text)
+        expect(stream.headers.get("content-type") == "text/event-stream", "POST /plan/stream is not an event stream")
+        expect(any(name == "node" for name, _ in events), "POST /plan/stream sent no node progress")
+        expect(bool(events) and events[-1][0] == "result" and events[-1][1].get("travel_plan"),
+               "POST /plan/stream did not end with the result")
+               
+        submitted = await client.post("/jobs", json={"query": BENCHMARK_QUERY})
+        expect(submitted.status_code == 202, f"POST /jobs answered {submitted.status_code}")
+        job_url = submitted.headers.get("location", "/jobs/missing")
+        job_events = _sse_events((await client.get(f"{job_url}/events")).text)
+        expect(bool(job_events) and job_events[-1][0] == "result", "GET /jobs/<id>/events did not end with the result")
+        job = (await client.get(job_url)).json()
+        expect(job.get("status") == "done" and job.get("result", {}).get("travel_plan"), "GET /jobs/<id> has no result")
+        
+        invalid = await client.post("/plan", json={"query": ""})
+        expect(invalid.status_code == 400, f"An empty query was answered {invalid.status_code}")
+        missing = await client.get("/jobs/missing")
+        expect(missing.status_code == 404, f"An unknown job was answered {missing.status_code}")
+        
+        # One running and one queued plan fill the server; the others are turned away
+        environment.clear_caches()
+        burst = await asyncio.gather(*(
+            client.post("/plan", json={"query": f"{BENCHMARK_QUERY} ({index})"}) for index in range(4)
+        ))
+        statuses = sorted(response.status_code for response in burst)
+        expect(statuses == [200, 200, 429, 429], f"A burst of 4 plans was answered {statuses}, expected 2x200 and 2x429")
+        expect(all(response.headers.get("retry-after") for response in burst if response.status_code == 429),
+               "429 responses have no Retry-After header")
+               
+        metrics = await client.get("/metrics")
+        expect("travel_planner_server_queued_plans" in metrics.text, "GET /metrics has no server gauges")
+        
+        # A job queued before shutdown still finishes while the server drains
+        environment.clear_caches()
+        queued = await client.post("/jobs", json={"query": f"{BENCHMARK_QUERY} (drained)"})
+        await server.shutdown()
+        drained = (await client.get(queued.headers.get("location", "/jobs/missing"))).json()
+        expect(drained.get("status") == "done", f"A job queued before shutdown ended {drained.get('status')}")
+        expect((await client.get("/healthz")).status_code == 503, "GET /healthz did not report draining")
+        expect((await client.post("/plan", json={"query": BENCHMARK_QUERY})).status_code == 503,
+               "A plan submitted while draining was not refused")
+    return problems
+
+async def measure_load(environment: OfflineEnvironment, clients: int, workers: int, queue_size: int) -> Dict[str, Any]:
+    """
+    Send one plan per client at once and measure the server's answers.
+    
+    Every client asks for a different trip, so no plan is answered from the plan cache.
+    
+    Args:
+        environment: Offline environment the workflow runs in
+        clients: Plans sent at once
+        workers: Server workers
+        queue_size: Server queue size
+        
+    Returns:
+        Accepted and rejected plans, plans per second and latency of the accepted ones
+    """
+    environment.clear_caches()
+    server = PlannerServer(build_travel_planning_workflow(), workers=workers, queue_size=queue_size)
+    
+    async def timed_plan(client: httpx.AsyncClient, index: int) -> Tuple[int, float]:
+        started = time.perf_counter()
+        response = await client.post("/plan", json={"query": f"{BENCHMARK_QUERY} (client {index})"})
+        return response.status_code, time.perf_counter() - started
+        
+    async with _client(server) as client:
+        started = time.perf_counter()
+        answers = await asyncio.gather(*(timed_plan(client, index) for index in range(clients)))
+        wall_seconds = time.perf_counter() - started
+        await server.shutdown()
+        
+    latencies = [seconds for status, seconds in answers if status == 200]
+    return {
+        "accepted": len(latencies),
+        "rejected": sum(1 for status, _ in answers if status == 429),
+        "plans_per_second": len(latencies) / wall_seconds if wall_seconds else 0.0,
+        "latency": summarize_latencies(latencies)
+    }
+
+def main():
+    """
+    Server check entry point.
+    """
+    parser = argparse.ArgumentParser(description="Offline check and load test of the travel planner HTTP server")
+    parser.add_argument("--clients", type=int, default=16, help="Plans sent at once in the load test")
+    parser.add_argument("--workers", type=int, default=4, help="Server workers in the load test")
+    parser.add_argument("--queue-size", type=int, default=4, help="Server queue size in the load test")
+    parser.add_argument("--llm-latency", type=float, default=0.1, help="Simulated seconds before the first token of every LLM call")
+    parser.add_argument("--tool-latency", type=float, default=0.05, help="Simulated seconds per tool request")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as scratch:
+        cache_path = os.path.join(scratch, "city_cache.sqlite3")
+        with offline_environment(cache_path, args.llm_latency, tool_latency=args.tool_latency) as environment:
+            problems = asyncio.run(check_endpoints(environment))
+            load = asyncio.run(measure_load(environment, args.clients, args.workers, args.queue_size))
+            
+    latency = load["latency"]
+    print(
+        f"{args.clients} clients, {args.workers} workers, queue {args.queue_size}: "
+        f"{load['accepted']} accepted, {load['rejected']} rejected (429), {load['plans_per_second']:.2f} plans/s, "
+        f"p50 {latency['p50']:.3f}s, p95 {latency['p95']:.3f}s"
+    )
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
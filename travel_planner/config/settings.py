@@ -3,22 +3,192 @@ Configuration settings for the Travel Planner application.
 Manages API keys and application settings.
 """
 import os
-import getpass
-from typing import List, Dict, Any
+import sys
+from typing import List, Dict, Any, Optional
 
-# Available LLM models
+# Available LLM models: configuration name -> Groq model ID
 AVAILABLE_MODELS = {
     "llama-3.3-70b-versatile": "llama-3.3-70b-versatile",
-    "llama-3.1-8b": "llama-3.1-8b",
+    "llama-3.1-8b": "llama-3.1-8b-instant",
     # Add other models as needed
 }
 
 # Default model to use
 DEFAULT_MODEL = "llama-3.3-70b-versatile"
 
+# Model each workflow node runs on (names from AVAILABLE_MODELS); nodes not
+# listed use DEFAULT_MODEL. Simple structured steps run on the small model,
+# the research agents and the travel plan synthesis on the large one.
+NODE_MODELS = {
+    "extract_trip_details": "llama-3.1-8b",
+}
+
+# Model a node is retried on when the output of its routed model fails
+# validation (None disables the fallback)
+FALLBACK_MODEL = DEFAULT_MODEL
+
 # Default temperature setting
 DEFAULT_TEMPERATURE = 0
 
+# Shared HTTP connection pool limits
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+
+# Timeouts of requests made through the shared HTTP clients (seconds)
+HTTP_TIMEOUT_SECONDS = 15.0
+HTTP_CONNECT_TIMEOUT_SECONDS = 5.0
+
+# Timeout of one chat completion request (seconds)
+LLM_REQUEST_TIMEOUT_SECONDS = 60.0
+
+# Time one travel plan request may take end to end (seconds, 0 disables the deadline)
+REQUEST_DEADLINE_SECONDS = 120.0
+
+# Longest time each research node may take (seconds). A node cut off at its
+# budget, or failing, marks its section degraded and the plan is written without it
+SECTION_TIMEOUT_SECONDS = {
+    "get_weather": 30.0,
+    "get_city_info": 45.0,
+    "search_hotels": 45.0,
+    "get_budget_info": 30.0,
+    "get_trip_budget": 30.0,
+}
+
+# Part of the request deadline kept back for writing the travel plan (seconds)
+PLAN_RESERVE_SECONDS = 30.0
+
+# Threads running sync nodes that have a time budget
+BOUNDED_NODE_MAX_WORKERS = 32
+
+# Request quotas per upstream provider: sustained requests per second and burst size
+UPSTREAM_RATE_LIMITS = {
+    "groq": {"requests_per_second": 0.5, "burst": 10},
+    "tavily": {"requests_per_second": 2.0, "burst": 10},
+    "openweather": {"requests_per_second": 1.0, "burst": 20},
+    "exchangerate": {"requests_per_second": 1.0, "burst": 5},
+    "wikipedia": {"requests_per_second": 20.0, "burst": 40},
+}
+
+# Providers of the hosts called through the shared HTTP clients
+UPSTREAM_HOSTS = {
+    "api.tavily.com": "tavily",
+    "api.openweathermap.org": "openweather",
+    "v6.exchangerate-api.com": "exchangerate",
+    "wikipedia.org": "wikipedia",  # Any language subdomain
+}
+
+# Retries of rate limited (429), unavailable (5xx) or failed upstream requests
+UPSTREAM_MAX_RETRIES = 3
+UPSTREAM_BACKOFF_BASE_SECONDS = 0.5
+# Longest wait before a retry; a longer Retry-After fails the request instead
+UPSTREAM_BACKOFF_MAX_SECONDS = 20.0
+
+# Adaptive concurrency per provider: the limit grows while requests succeed and
+# shrinks on errors, 429s and latency spikes (latency above factor x average)
+UPSTREAM_CONCURRENCY = {"initial": 8, "min": 1, "max": 64, "latency_spike_factor": 3.0}
+
+# How long a fetched 5-day weather forecast is reused for a city (seconds)
+WEATHER_CACHE_TTL_SECONDS = 30 * 60
+
+# Currency every exchange rate is fetched against; other pairs are cross rates
+EXCHANGE_RATE_TABLE_BASE = "USD"
+
+# Lower bound on how often the exchange rate table is refreshed (seconds)
+EXCHANGE_RATE_MIN_REFRESH_SECONDS = 60
+
+# How long the trip details extracted from an identical request are reused (seconds)
+TRIP_DETAILS_CACHE_TTL_SECONDS = 60 * 60
+
+# Finished travel plans kept in memory; each expires with the forecast it was built from
+PLAN_CACHE_MAX_ENTRIES = 512
+
+# Minimum cosine similarity between two requests for a cached plan to be reused
+# when the cities differ in spelling (only used when embeddings are configured)
+PLAN_CACHE_SIMILARITY_THRESHOLD = 0.9
+
+# Threads used to run Wikipedia search queries concurrently
+WIKI_SEARCH_MAX_WORKERS = 16
+
+# SQLite file caching city attractions between runs (empty string disables it)
+CITY_CACHE_PATH = os.environ.get(
+    "TRAVEL_PLANNER_CITY_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "travel_planner", "city_cache.sqlite3")
+)
+
+# How long cached city attractions stay fresh (seconds)
+CITY_CACHE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+# Where workflow checkpoints are kept, so a failed or interrupted run resumes
+# from its last completed node: "" (off), "memory" (this process only) or
+# "sqlite" (CHECKPOINT_PATH)
+CHECKPOINTER = os.environ.get("TRAVEL_PLANNER_CHECKPOINTER", "")
+CHECKPOINTER_CHOICES = ("", "memory", "sqlite")
+
+# SQLite file holding workflow checkpoints
+CHECKPOINT_PATH = os.environ.get(
+    "TRAVEL_PLANNER_CHECKPOINT_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "travel_planner", "checkpoints.sqlite3")
+)
+
+# Checkpoints kept per run in SQLite (at least 2: resuming needs the latest one and its parent)
+CHECKPOINT_KEEP_PER_RUN = 2
+
+# Runs not updated for this long are deleted from SQLite (seconds)
+CHECKPOINT_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+# Checkpoint values of at least this size are compressed (bytes), and the compression level
+CHECKPOINT_COMPRESS_MIN_BYTES = 256
+CHECKPOINT_COMPRESSION_LEVEL = 3
+
+# How the tool-backed nodes gather their data, per workflow node:
+#   "agent"          - a ReAct agent decides which tools to call (at least two LLM calls)
+#   "direct_summary" - the node calls the tool itself and one LLM call writes the answer
+#   "direct"         - the node calls the tool itself and passes the structured result on (no LLM call)
+NODE_EXECUTION_MODES = {
+    "get_weather": "agent",
+    "get_budget_info": "agent",
+}
+EXECUTION_MODE_CHOICES = ("agent", "direct_summary", "direct")
+
+# Longest trip planned in one run (days); longer date ranges are shortened to it
+MAX_TRIP_DAYS = 14
+
+# Most cities planned in one run; later stops of a longer trip are left out
+MAX_TRIP_CITIES = 5
+
+# Currency of travellers whose origin is not mentioned (plans assume trips from Turkey)
+DEFAULT_HOME_CURRENCY = "TRY"
+
+# Estimated prompt tokens allowed for the research sections of the travel plan prompt
+PLAN_CONTEXT_TOKEN_BUDGET = 2000
+
+# Estimated prompt tokens allowed for the hotel options passed to the budget agent
+HOTEL_CONTEXT_TOKEN_BUDGET = 400
+
+# Workflow instrumentation: "" (off), "prometheus" (metrics) or "otel" (metrics and OpenTelemetry spans)
+METRICS_MODE = os.environ.get("TRAVEL_PLANNER_METRICS", "")
+
+# Never prompt for missing API keys (for workers, containers and CI); missing
+# keys are reported as an error instead. Prompts are also skipped when no
+# terminal or notebook is attached.
+NON_INTERACTIVE = os.environ.get("TRAVEL_PLANNER_NON_INTERACTIVE", "") not in ("", "0")
+
+# HTTP server mode (see workflow/server.py): plans run at once, plans that may
+# wait for a free worker (more are rejected with 429 Too Many Requests) and the
+# Retry-After sent with a rejection (seconds)
+SERVER_WORKERS = 8
+SERVER_QUEUE_SIZE = 32
+SERVER_RETRY_AFTER_SECONDS = 5
+
+# Time given to queued and running plans to finish when the server shuts down (seconds)
+SERVER_DRAIN_TIMEOUT_SECONDS = 60.0
+
+# Time finished jobs stay available to GET /jobs/<id> (seconds)
+SERVER_JOB_RETENTION_SECONDS = 3600.0
+
+# Largest request body accepted by the server (bytes)
+SERVER_MAX_BODY_BYTES = 16 * 1024
+
 # Required API keys
 REQUIRED_API_KEYS = [
     "GROQ_API_KEY",
@@ -27,14 +197,32 @@ REQUIRED_API_KEYS = [
     "EXCHANGE_RATE_API_KEY"
 ]
 
-def initialize_environment() -> None:
+def initialize_environment(interactive: Optional[bool] = None) -> None:
     """
     Initialize environment variables for API keys.
     Prompts for missing keys if they are not set.
+    
+    Args:
+        interactive: Whether to prompt for missing keys; by default prompts
+            only on a terminal or in a notebook, and unless NON_INTERACTIVE is set
+            
+    Raises:
+        RuntimeError: If keys are missing and prompting is disabled
     """
+    if interactive is None:
+        interactive = not NON_INTERACTIVE and _can_prompt()
+    if not interactive:
+        missing = [key for key in REQUIRED_API_KEYS if not os.environ.get(key)]
+        if missing:
+            raise RuntimeError(f"Missing API keys: {', '.join(missing)}. Set them in the environment.")
+        return
     for key in REQUIRED_API_KEYS:
         _set_env(key)
 
+def _can_prompt() -> bool:
+    """Check whether a terminal or a notebook can answer a key prompt."""
+    return sys.stdin is not None and (sys.stdin.isatty() or "ipykernel" in sys.modules)
+
 def _set_env(var: str) -> None:
     """
     Set environment variable if not already set.
@@ -43,8 +231,64 @@ def _set_env(var: str) -> None:
         var: Name of the environment variable
     """
     if not os.environ.get(var):
+        import getpass
+        
         os.environ[var] = getpass.getpass(f"{var}: ")
 
+def get_node_execution_mode(node: str) -> str:
+    """
+    Get how a tool-backed node gathers its data.
+    
+    Args:
+        node: Workflow node name
+        
+    Returns:
+        One of EXECUTION_MODE_CHOICES, "agent" if the node is not configured
+        
+    Raises:
+        ValueError: If the configured mode is unknown
+    """
+    mode = NODE_EXECUTION_MODES.get(node, "agent")
+    if mode not in EXECUTION_MODE_CHOICES:
+        raise ValueError(f"Unknown execution mode {mode!r} for node {node!r}, expected one of {EXECUTION_MODE_CHOICES}")
+    return mode
+
+def get_node_model(node: str) -> str:
+    """
+    Get the model a workflow node runs on.
+    
+    Args:
+        node: Workflow node name
+        
+    Returns:
+        Groq model ID, that of DEFAULT_MODEL if the node is not configured
+        
+    Raises:
+        ValueError: If the configured model is not in AVAILABLE_MODELS
+    """
+    return _model_id(NODE_MODELS.get(node, DEFAULT_MODEL), node)
+
+def get_fallback_model(node: str) -> Optional[str]:
+    """
+    Get the model a workflow node is retried on when its output fails validation.
+    
+    Args:
+        node: Workflow node name
+        
+    Returns:
+        Groq model ID, or None if there is no fallback or the node already runs on it
+    """
+    if FALLBACK_MODEL is None:
+        return None
+    fallback = _model_id(FALLBACK_MODEL, node)
+    return None if fallback == get_node_model(node) else fallback
+
+def _model_id(name: str, node: str) -> str:
+    """Resolve a model name from AVAILABLE_MODELS to its Groq model ID."""
+    if name not in AVAILABLE_MODELS:
+        raise ValueError(f"Unknown model {name!r} for node {node!r}, expected one of {tuple(AVAILABLE_MODELS)}")
+    return AVAILABLE_MODELS[name]
+
 def get_openweather_api_key() -> str:
     """Get OpenWeather API key from environment."""
     return os.environ.get("OPENWEATHER_API_KEY", "")
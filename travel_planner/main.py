@@ -3,11 +3,15 @@ Travel Planner Assistant Application.
 Helps users plan trips by automatically gathering information.
 """
 import argparse
-from IPython.display import Image, display
+import atexit
+import asyncio
+import sys
 
-from travel_planner.config.settings import initialize_environment
-from travel_planner.state.travel_state import create_initial_state
+from travel_planner.config.settings import CHECKPOINTER, REQUEST_DEADLINE_SECONDS, initialize_environment
 from travel_planner.workflow.graph_builder import build_travel_planning_workflow, visualize_workflow
+from travel_planner.workflow.runner import PLAN_NODE, get_travel_app, plan_trip, stream_plan_events
+from travel_planner.utils.http import aclose_http_clients
+from travel_planner.utils.metrics import configure_metrics, metrics_enabled, render_prometheus
 
 def parse_arguments():
     """
@@ -28,8 +32,160 @@ def parse_arguments():
         action="store_true", 
         help="Visualize the workflow graph"
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print progress as each step finishes and stream the travel plan as it is generated"
+    )
+    parser.add_argument(
+        "--batch",
+        type=str,
+        metavar="JSONL_FILE",
+        help="Plan every query of a JSONL file ('-' for stdin) instead of a single --query"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="-",
+        help="JSONL file receiving batch results as they complete (default: stdout)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of plans processed at once in batch and server mode"
+    )
+    parser.add_argument(
+        "--warm-cache",
+        type=str,
+        metavar="CITY_FILE",
+        help="Pre-fill the city attractions cache from a file with one city per line, then exit"
+    )
+    parser.add_argument(
+        "--metrics",
+        type=str,
+        metavar="FILE",
+        help="Record node, tool, token and cache metrics and write them in the Prometheus text format to FILE on exit"
+    )
+    parser.add_argument(
+        "--non-interactive",
+        action="store_true",
+        help="Fail on missing API keys instead of prompting for them (also TRAVEL_PLANNER_NON_INTERACTIVE=1)"
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=REQUEST_DEADLINE_SECONDS,
+        metavar="SECONDS",
+        help="Time each travel plan may take; research that is too slow is left out of the plan (0 disables)"
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Serve the workflow over HTTP (requires uvicorn) instead of running a single --query"
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="Interface the server listens on"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="Port the server listens on"
+    )
+    parser.add_argument(
+        "--run-id",
+        type=str,
+        help="Checkpoint the run under this ID; rerunning with the same ID and query resumes it "
+             "(uses TRAVEL_PLANNER_CHECKPOINTER, or SQLite if unset). With --batch, the ID of the "
+             "batch run (default: today's date)"
+    )
     return parser.parse_args()
 
+def print_streamed_plan(user_query, travel_app, deadline_seconds=None, thread_id=None):
+    """
+    Print node progress and the travel plan tokens as they are produced.
+    
+    Args:
+        user_query: Travel planning query
+        travel_app: Compiled workflow
+        deadline_seconds: Time the plan may take
+        thread_id: Checkpoint run ID, if any
+    """
+    streaming_plan = False
+    for event in stream_plan_events(user_query, travel_app, deadline_seconds, thread_id):
+        if event.type == "token":
+            if not streaming_plan:
+                print("\n===== FINAL TRAVEL PLAN =====\n")
+                streaming_plan = True
+            print(event.data, end="", flush=True)
+        elif event.type == "node" and event.node != PLAN_NODE:
+            print(f"[{event.elapsed:6.2f}s] {event.node} done", flush=True)
+        elif event.type == "plan" and not streaming_plan:
+            # The model did not stream, print the plan in one piece
+            print("\n===== FINAL TRAVEL PLAN =====\n")
+            print(event.data)
+    print()
+
+def run_batch_mode(batch_path, output_path, concurrency, deadline_seconds=None, batch_run_id=None):
+    """
+    Plan all queries of a JSONL file and print a latency summary.
+    
+    Results are written to the output as each plan completes; the summary goes
+    to stderr so it never mixes with JSONL on stdout.
+    
+    Args:
+        batch_path: JSONL input file, or "-" for stdin
+        output_path: JSONL output file, or "-" for stdout
+        concurrency: Maximum number of plans processed at once
+        deadline_seconds: Time each plan may take
+        batch_run_id: ID of the batch run whose checkpointed plans are
+            resumed, checkpointing the batch even without CHECKPOINTER
+    """
+    # Imported here so the other CLI modes do not load the batch runner
+    from travel_planner.workflow.batch import arun_batch, format_batch_summary, read_batch_queries
+    
+    travel_app = None
+    if batch_run_id:
+        from travel_planner.workflow.checkpoint import create_checkpointer
+        
+        travel_app = build_travel_planning_workflow(checkpointer=create_checkpointer(CHECKPOINTER or "sqlite"))
+    
+    async def run_batch(queries, output):
+        try:
+            return await arun_batch(queries, output, concurrency, travel_app, deadline_seconds, batch_run_id)
+        finally:
+            # Release the batch loop's connections before the loop closes
+            await aclose_http_clients()
+    
+    if batch_path == "-":
+        queries = read_batch_queries(sys.stdin)
+    else:
+        with open(batch_path, encoding="utf-8") as batch_file:
+            queries = read_batch_queries(batch_file)
+    
+    output = sys.stdout if output_path == "-" else open(output_path, "w", encoding="utf-8")
+    try:
+        summary = asyncio.run(run_batch(queries, output))
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    print(format_batch_summary(summary), file=sys.stderr)
+
+def write_metrics_file(path):
+    """
+    Write the recorded workflow metrics in the Prometheus text format.
+    
+    Args:
+        path: Output file, suitable for the node exporter's textfile collector
+    """
+    with open(path, "w", encoding="utf-8") as metrics_file:
+        metrics_file.write(render_prometheus())
+
 def main():
     """
     Main application entry point.
@@ -37,16 +193,55 @@ def main():
     # Parse command line arguments
     args = parse_arguments()
     
+    # Record workflow metrics if requested (before any workflow is built);
+    # the server always records them for its /metrics endpoint
+    if args.serve and not metrics_enabled():
+        configure_metrics("prometheus")
+    if args.metrics:
+        if not metrics_enabled():
+            configure_metrics("prometheus")
+        atexit.register(write_metrics_file, args.metrics)
+    
     # Initialize environment (API keys)
-    initialize_environment()
+    initialize_environment(interactive=False if args.non_interactive else None)
+    
+    # Warm the city cache and exit if requested
+    if args.warm_cache:
+        from travel_planner.workflow.cache_warmup import load_city_list, warm_city_cache
+        
+        print("\n===== WARMING CITY CACHE =====\n")
+        for city, outcome in warm_city_cache(load_city_list(args.warm_cache)).items():
+            print(f"{city}: {outcome}")
+        return
+    
+    # Run a batch and exit if requested
+    if args.batch:
+        run_batch_mode(args.batch, args.output, args.concurrency, args.deadline, args.run_id)
+        return
+    
+    # Serve plans over HTTP until interrupted if requested
+    if args.serve:
+        from travel_planner.workflow.server import PlannerServer, serve
+        
+        print(f"\n===== SERVING ON http://{args.host}:{args.port} =====\n")
+        serve(PlannerServer(get_travel_app(), workers=args.concurrency, deadline_seconds=args.deadline), args.host, args.port)
+        return
     
-    # Build the travel planning workflow
-    travel_app = build_travel_planning_workflow()
+    # Build the travel planning workflow, checkpointed when a run ID is given
+    if args.run_id:
+        from travel_planner.workflow.checkpoint import create_checkpointer
+        
+        travel_app = build_travel_planning_workflow(checkpointer=create_checkpointer(CHECKPOINTER or "sqlite"))
+    else:
+        travel_app = get_travel_app()
     
     # Visualize the workflow if requested
     if args.visualize:
         workflow_image = visualize_workflow(travel_app)
         if workflow_image:
+            # IPython is slow to import and only needed to show the graph
+            from IPython.display import Image, display
+            
             print("\n===== WORKFLOW VISUALIZATION =====\n")
             display(Image(workflow_image))
         else:
@@ -56,12 +251,15 @@ def main():
     user_query = args.query
     print(f"\n===== PROCESSING QUERY =====\n{user_query}\n")
     
-    # Set up the initial state
-    initial_state = create_initial_state(user_query)
+    # Stream progress and the plan itself if requested
+    if args.stream:
+        print("\n===== GENERATING TRAVEL PLAN =====\n")
+        print_streamed_plan(user_query, travel_app, args.deadline, args.run_id)
+        return
     
     # Execute the workflow
     print("\n===== GENERATING TRAVEL PLAN =====\n")
-    result = travel_app.invoke(initial_state)
+    result = plan_trip(user_query, travel_app, args.deadline, args.run_id)
     
     # Print the final travel plan
     print("\n===== FINAL TRAVEL PLAN =====\n")
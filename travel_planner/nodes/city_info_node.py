@@ -2,11 +2,24 @@
 City information node.
 Retrieves historical places and attractions.
 """
-from typing import Dict, Any
+import asyncio
+from dataclasses import asdict
+from typing import Dict, Any, List, Optional
 from langchain_core.messages import HumanMessage
 
+from ..agents.invocation import tool_results
+from ..agents.routing import ainvoke_routed_agent, called_tool, invoke_routed_agent
 from ..agents.city_info_agent import CityInfoAgent
+from ..state.records import Attraction
 from ..state.travel_state import TravelState
+from ..utils.cache import normalize_city
+from ..utils.persistent_cache import city_cache
+
+# Persistent cache namespace for the agent's attraction summaries
+SUMMARY_CACHE_NAMESPACE = "city_info_summary"
+
+# Language the city information agent answers in
+CITY_INFO_LANGUAGE = "en"
 
 def city_info_node(state: TravelState) -> Dict[str, Any]:
     """
@@ -18,10 +31,61 @@ def city_info_node(state: TravelState) -> Dict[str, Any]:
     Returns:
         Updated state with city attractions information
     """
-    # Create city information agent
-    city_agent = CityInfoAgent.create()
+    # Validate required information
+    missing = _missing_info_update(state)
+    if missing:
+        return missing
+    
+    # Serve the summary from the persistent city cache when fresh
+    cached = _cached_city_info_update(state)
+    if cached:
+        return cached
+    
+    # Invoke the city information agent
+    response = invoke_routed_agent(
+        "get_city_info", CityInfoAgent.create, _city_info_request(state), called_tool("get_historical_places")
+    )
+    
+    return _city_info_update(state, response)
+
+async def acity_info_node(state: TravelState) -> Dict[str, Any]:
+    """
+    Asynchronously get information about historical places and attractions.
     
+    Args:
+        state: Current workflow state with city information
+        
+    Returns:
+        Updated state with city attractions information
+    """
     # Validate required information
+    missing = _missing_info_update(state)
+    if missing:
+        return missing
+    
+    # Serve the summary from the persistent city cache when fresh, off the event loop
+    cached = await asyncio.to_thread(_cached_city_info_update, state)
+    if cached:
+        return cached
+    
+    # Invoke the city information agent
+    response = await ainvoke_routed_agent(
+        "get_city_info", CityInfoAgent.create, _city_info_request(state), called_tool("get_historical_places")
+    )
+    
+    # The update stores the summary in the persistent city cache
+    return await asyncio.to_thread(_city_info_update, state, response)
+
+def _missing_info_update(state: TravelState) -> Optional[Dict[str, Any]]:
+    """
+    Build the update returned when the city is missing.
+    
+    Args:
+        state: Current workflow state
+        
+    Returns:
+        State update explaining the problem, or None if nothing is missing
+    """
     if not state.get("city"):
         return {
             "city_info": {
@@ -29,23 +93,104 @@ def city_info_node(state: TravelState) -> Dict[str, Any]:
                 "query_city": "Unknown"
             }
         }
+    return None
+
+def _summary_cache_key(city: str) -> str:
+    """
+    Build the persistent cache key for a city's attraction summary.
+    
+    Args:
+        city: Name of the city
+        
+    Returns:
+        Cache key combining the normalized city and language
+    """
+    return f"{normalize_city(city)}|{CITY_INFO_LANGUAGE}"
+
+def _cached_city_info_update(state: TravelState) -> Optional[Dict[str, Any]]:
+    """
+    Build the update from a cached attraction summary and place list.
+    
+    Args:
+        state: Current workflow state with city information
+        
+    Returns:
+        State update with the cached summary, or None on a cache miss
+    """
+    if city_cache is None:
+        return None
+    cached = city_cache.get(SUMMARY_CACHE_NAMESPACE, _summary_cache_key(state["city"]))
+    if cached is None:
+        return None
+    # Entries written before place lists were cached hold only the summary
+    if isinstance(cached, str):
+        cached = {"attractions": cached, "places": []}
+    return {
+        "city_info": {
+            "attractions": cached["attractions"],
+            "places": [Attraction(**place) for place in cached["places"]],
+            "query_city": state["city"]
+        }
+    }
+
+def _city_info_request(state: TravelState) -> Dict[str, Any]:
+    """
+    Create the agent input asking for city attractions.
     
-    # Create query for city attractions
+    Args:
+        state: Current workflow state with city information
+        
+    Returns:
+        Agent input with the city attractions query
+    """
     city_query = (
         f"What are the most important cultural places and must-visit attractions in {state['city']}? "
         f"Please provide comprehensive information about places to visit, their historical "
         f"significance, and practical visitor information."
     )
+    return {"messages": [HumanMessage(content=city_query)]}
+
+def _city_info_update(state: TravelState, response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract the city information from the agent response.
     
-    # Invoke the city information agent
-    response = city_agent.invoke(
-        {"messages": [HumanMessage(content=city_query)]}
-    )
-    
-    # Extract the response
+    Args:
+        state: Current workflow state
+        response: City information agent output
+        
+    Returns:
+        Updated state with city attractions information
+    """
     city_info = {
         "attractions": response["messages"][-1].content,
+        "places": _places(response),
         "query_city": state["city"]
     }
     
-    return {"city_info": city_info}
\ No newline at end of file
+    # Keep the summary and places for later plans to the same city
+    if city_cache is not None and city_info["attractions"]:
+        city_cache.set(SUMMARY_CACHE_NAMESPACE, _summary_cache_key(state["city"]), {
+            "attractions": city_info["attractions"],
+            "places": [asdict(place) for place in city_info["places"]]
+        })
+    
+    return {"city_info": city_info}
+
+def _places(response: Dict[str, Any]) -> List[Attraction]:
+    """
+    Get the places the agent's searches returned as compact records.
+    
+    Args:
+        response: City information agent output
+        
+    Returns:
+        Attractions in search order, without duplicate titles
+    """
+    places: Dict[str, Attraction] = {}
+    for results in tool_results(response, "get_historical_places"):
+        if not isinstance(results, list):
+            continue
+        for place in results:
+            if isinstance(place, dict) and place.get("title"):
+                places.setdefault(place["title"], Attraction.from_place(place))
+    return list(places.values())
\ No newline at end of file
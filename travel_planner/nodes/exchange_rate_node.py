@@ -2,26 +2,105 @@
 Exchange rate node.
 Provides currency exchange rates and budget information.
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from langchain_core.messages import HumanMessage
 
+from ..agents.invocation import tool_results
+from ..agents.routing import ainvoke_routed_agent, called_tool, invoke_routed_agent
 from ..agents.exchange_rate_agent import ExchangeRateAgent
+from ..agents.summary_agent import SummaryAgent
+from ..config.settings import HOTEL_CONTEXT_TOKEN_BUDGET, DEFAULT_HOME_CURRENCY, get_node_execution_mode
+from ..state.records import RateTable, describe_hotels
 from ..state.travel_state import TravelState
+from ..tools.currency_tool import get_currency_rates
+from ..utils.context_budget import BudgetReport, fit_sections
+from ..utils.date_utils import describe_trip_period
+from ..utils.metrics import record_tokens_saved
+from .multi_city import trip_currencies, trip_view
 
 def exchange_rate_node(state: TravelState) -> Dict[str, Any]:
     """
     Get currency exchange rates and budget information for the trip.
     
+    A trip visiting several cities gets one budget covering the hotels and
+    currencies of all its stops.
+    
     Args:
         state: Current workflow state with city and hotel information
         
     Returns:
         Updated state with budget and exchange rate information
     """
-    # Create exchange rate agent
-    exchange_rate_agent = ExchangeRateAgent.create()
+    state = trip_view(state)
     
     # Validate required information
+    missing = _missing_info_update(state)
+    if missing:
+        return missing
+    
+    mode = _execution_mode(state)
+    if mode == "agent":
+        # Invoke the exchange rate agent
+        request, report = _exchange_request(state)
+        response = invoke_routed_agent(
+            "get_budget_info", ExchangeRateAgent.create, request, called_tool("get_currency_rates")
+        )
+        return _budget_update(state, response["messages"][-1].content, _rate_table(response), report)
+    
+    # Call the currency tool directly
+    rate_table = _result_rate_table(get_currency_rates.invoke(_rates_tool_args(state)))
+    if mode == "direct":
+        return _budget_update(state, _describe_budget(state, rate_table), rate_table, BudgetReport(0))
+    
+    request, report = _exchange_request(state, rate_table)
+    response = invoke_routed_agent("get_budget_info", SummaryAgent.create, request)
+    return _budget_update(state, response["messages"][-1].content, rate_table, report)
+
+async def aexchange_rate_node(state: TravelState) -> Dict[str, Any]:
+    """
+    Asynchronously get currency exchange rates and budget information.
+    
+    Args:
+        state: Current workflow state with city and hotel information
+        
+    Returns:
+        Updated state with budget and exchange rate information
+    """
+    state = trip_view(state)
+    
+    # Validate required information
+    missing = _missing_info_update(state)
+    if missing:
+        return missing
+    
+    mode = _execution_mode(state)
+    if mode == "agent":
+        # Invoke the exchange rate agent
+        request, report = _exchange_request(state)
+        response = await ainvoke_routed_agent(
+            "get_budget_info", ExchangeRateAgent.create, request, called_tool("get_currency_rates")
+        )
+        return _budget_update(state, response["messages"][-1].content, _rate_table(response), report)
+    
+    # Call the currency tool directly
+    rate_table = _result_rate_table(await get_currency_rates.ainvoke(_rates_tool_args(state)))
+    if mode == "direct":
+        return _budget_update(state, _describe_budget(state, rate_table), rate_table, BudgetReport(0))
+    
+    request, report = _exchange_request(state, rate_table)
+    response = await ainvoke_routed_agent("get_budget_info", SummaryAgent.create, request)
+    return _budget_update(state, response["messages"][-1].content, rate_table, report)
+
+def _missing_info_update(state: TravelState) -> Optional[Dict[str, Any]]:
+    """
+    Build the update returned when the city is missing.
+    
+    Args:
+        state: Current workflow state
+        
+    Returns:
+        State update explaining the problem, or None if nothing is missing
+    """
     if not state.get("city"):
         return {
             "budget_info": {
@@ -29,19 +108,84 @@ def exchange_rate_node(state: TravelState) -> Dict[str, Any]:
                 "query_city": "Unknown"
             }
         }
+    return None
+
+def _execution_mode(state: TravelState) -> str:
+    """
+    Choose how the node gets the exchange rates.
+    
+    The direct modes need the currency of every destination from the trip
+    details; without it the agent has to work the currencies out itself.
+    
+    Args:
+        state: Current workflow state
+        
+    Returns:
+        Execution mode for this run
+    """
+    mode = get_node_execution_mode("get_budget_info")
+    if mode != "agent" and not trip_currencies(state):
+        return "agent"
+    return mode
+
+def _rates_tool_args(state: TravelState) -> Dict[str, Any]:
+    """
+    Build the currency tool input for a direct call.
     
-    # Extract hotel information if available
+    Args:
+        state: Current workflow state with the trip currencies
+        
+    Returns:
+        get_currency_rates arguments
+    """
+    return {
+        "base_currency": state.get("home_currency") or DEFAULT_HOME_CURRENCY,
+        "target_currencies": trip_currencies(state)
+    }
+
+def _exchange_request(state: TravelState, rate_table: Optional[RateTable] = None) -> Tuple[Dict[str, Any], BudgetReport]:
+    """
+    Create the agent input asking for exchange rates and a budget breakdown.
+    
+    The hotel options are fitted into HOTEL_CONTEXT_TOKEN_BUDGET so long
+    hotel search results do not inflate the prompt.
+    
+    Args:
+        state: Current workflow state with city, origin and hotel information
+        rate_table: Exchange rates already retrieved for the summary agent, if any
+        
+    Returns:
+        Agent input with the exchange rate and budget query, and the report
+        of the hotel context budget
+    """
+    # Extract hotel information if available, within the context budget
     hotel_context = ""
+    report = BudgetReport(HOTEL_CONTEXT_TOKEN_BUDGET)
     if state.get("hotel_info") and state["hotel_info"].get("results"):
-        hotel_context = f"based on these hotel options: {state['hotel_info']['results']}"
+        hotel_info = state["hotel_info"]
+        fitted, report = fit_sections(
+            {"hotels": hotel_info["results"]},
+            HOTEL_CONTEXT_TOKEN_BUDGET,
+            key_facts={"hotels": describe_hotels(hotel_info.get("hotels", []))}
+        )
+        hotel_context = f"based on these hotel options: {fitted['hotels']}"
+    
+    # The budget covers every day of the trip
+    trip_context = f" {describe_trip_period(state['travel_date'], state.get('end_date'))}" if state.get("travel_date") else ""
+    
+    # Budget in the traveller's currency, comparing with their origin when known
+    home_currency = state.get("home_currency") or DEFAULT_HOME_CURRENCY
+    origin = state.get("origin")
+    trip = f"from {origin} to {state['city']}" if origin else f"to {state['city']}"
+    home = origin or "home"
     
     # Create query for exchange rate and budget information
     exchange_query = f"""
-    I'm planning a trip from Turkey to {state['city']}.
+    I'm planning a trip {trip}.
 
     1. First, determine the local currency used in {state['city']}.
-    2. Get the current exchange rate between Turkish Lira (TRY) and the local currency of {state['city']}.
-    3. Based on this exchange rate, provide me with a budget breakdown for my trip to {state['city']} {hotel_context}.
+    2. Get the current exchange rate between my home currency ({home_currency}) and the local currency of {state['city']}.
+    3. Based on this exchange rate, provide me with a budget breakdown for my trip to {state['city']}{trip_context} {hotel_context}.
 
     Consider these typical expenses categories:
     - Accommodation (based on the hotels you found)
@@ -51,18 +195,94 @@ def exchange_rate_node(state: TravelState) -> Dict[str, Any]:
     - Shopping
 
     Also suggest how much money I should exchange or if I should use credit cards.
-    Compare costs between Turkey and {state['city']} to help me understand the relative expenses.
+    Compare costs between {home} and {state['city']} to help me understand the relative expenses.
     """
+    if rate_table is not None:
+        exchange_query += f"\nExchange rates retrieved for you: {rate_table.summary()}\n"
+    return {"messages": [HumanMessage(content=exchange_query)]}, report
+
+def _budget_update(
+    state: TravelState,
+    budget_plan: str,
+    rate_table: Optional[RateTable],
+    report: BudgetReport
+) -> Dict[str, Any]:
+    """
+    Build the budget information update.
     
-    # Invoke the exchange rate agent
-    response = exchange_rate_agent.invoke(
-        {"messages": [HumanMessage(content=exchange_query)]}
-    )
-    
-    # Extract the response
+    Args:
+        state: Current workflow state
+        budget_plan: Budget description for the travel plan
+        rate_table: Exchange rates retrieved for the trip, if any
+        report: Context budget report of the request
+        
+    Returns:
+        Updated state with budget and exchange rate information
+    """
     budget_info = {
-        "budget_plan": response["messages"][-1].content,
+        "budget_plan": budget_plan,
+        "rate_table": rate_table,
         "query_city": state["city"]
     }
     
-    return {"budget_info": budget_info}
\ No newline at end of file
+    record_tokens_saved("get_budget_info", report.tokens_saved)
+    return {"budget_info": budget_info, "context_budget": {"get_budget_info": report.as_dict()}}
+
+def _rate_table(response: Dict[str, Any]) -> Optional[RateTable]:
+    """
+    Get the exchange rates the agent retrieved as a compact record.
+    
+    Args:
+        response: Exchange rate agent output
+        
+    Returns:
+        Rate table, or None if the agent got no rates
+    """
+    for result in reversed(tool_results(response, "get_currency_rates")):
+        if isinstance(result, dict) and result.get("rates"):
+            return RateTable.from_tool_result(result)
+    return None
+
+def _result_rate_table(result: Dict[str, Any]) -> Optional[RateTable]:
+    """
+    Get directly retrieved exchange rates as a compact record.
+    
+    Args:
+        result: get_currency_rates output
+        
+    Returns:
+        Rate table, or None if the tool returned an error
+    """
+    if isinstance(result, dict) and result.get("rates"):
+        return RateTable.from_tool_result(result)
+    return None
+
+def _describe_budget(state: TravelState, rate_table: Optional[RateTable]) -> str:
+    """
+    Describe the exchange rates and hotel prices without an LLM call.
+    
+    Hotel prices quoted in a currency of the rate table are also given in
+    the traveller's currency, so the travel planner can budget from them.
+    
+    Args:
+        state: Current workflow state with hotel information
+        rate_table: Exchange rates retrieved for the trip, if any
+        
+    Returns:
+        Budget facts for the travel plan
+    """
+    if rate_table is None:
+        return "Unable to retrieve exchange rates for the trip."
+    
+    lines = [rate_table.summary()]
+    hotels = (state.get("hotel_info") or {}).get("hotels", [])
+    priced = [hotel for hotel in hotels if hotel.price_per_night is not None]
+    if priced:
+        lines.append("Hotel prices per night:")
+    for hotel in priced:
+        price = f"{hotel.price_per_night:g} {hotel.currency}".rstrip()
+        converted = rate_table.to_base(hotel.price_per_night, hotel.currency)
+        if converted is not None and hotel.currency != rate_table.base:
+            price += f" (about {converted:,.0f} {rate_table.base})"
+        lines.append(f"- {hotel.name}: {price}")
+    return "\n".join(lines)
\ No newline at end of file
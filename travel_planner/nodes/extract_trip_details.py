@@ -0,0 +1,244 @@
+"""
+Trip details extraction node.
+Extracts the city, travel dates and other trip slots from user input in one step.
+"""
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta
+from langchain_core.messages import HumanMessage
+from langchain_core.prompts import PromptTemplate
+
+from ..agents.base_agent import BaseAgent
+from ..agents.routing import arun_routed, run_routed
+from ..config.settings import MAX_TRIP_CITIES, MAX_TRIP_DAYS, TRIP_DETAILS_CACHE_TTL_SECONDS
+from ..state.travel_state import TravelState
+from ..state.trip_details import TripDetails, TripStop
+from ..utils.cache import TTLCache, normalize_city
+from ..utils.date_utils import parse_date, resolve_date_phrase, resolve_date_range, trip_dates
+
+# Trip details extracted from identical requests made on the same day
+trip_details_cache = TTLCache("trip_details", TRIP_DETAILS_CACHE_TTL_SECONDS)
+
+EXTRACTION_PROMPT = PromptTemplate(
+    input_variables=["text", "todays_date"],
+    template="""Extract the trip details mentioned in the following travel request.
+    Convert natural language date expressions to YYYY-MM-DD format.
+    For a trip over several days, give the first day as the travel date and the last day as the end date.
+    For a trip visiting several cities, also list every city in visiting order as the stops, with the days spent in each if mentioned.
+    If the user mentions a day of the week, assume it's for the upcoming week.
+    Infer the currency codes from the destination and origin.
+    Leave any other detail that is not mentioned empty.
+    Today's date is: {todays_date}
+    
+    Request: {text}"""
+)
+
+def extract_trip_details_node(state: TravelState) -> Dict[str, Any]:
+    """
+    Extract the city, travel dates and other trip slots from the user's message.
+    
+    A trip visiting several cities ("Rome then Florence") also gets its
+    stops, each with its own days of the trip; the city is then the first
+    stop and the travel dates span the whole trip.
+    
+    Common date phrases ("tomorrow", "this saturday", ISO dates) and date
+    ranges ("from 2025-06-07 to 2025-06-10", "this saturday for 3 nights")
+    are resolved deterministically and take precedence over the model's
+    answer. All other
+    slots come from a single structured LLM call on the small model routed to
+    this node, retried on the fallback model if the output fails validation.
+    
+    Args:
+        state: Current workflow state
+        
+    Returns:
+        Updated state with extracted trip details
+    """
+    # Extract the latest user message
+    user_message = state["messages"][-1].content
+    
+    # Invoke the LLM once to extract all trip slots, unless the same request was just seen
+    key = _details_key(user_message)
+    details = trip_details_cache.get(key)
+    if details is None:
+        messages = _extraction_messages(user_message)
+        details = run_routed(
+            "extract_trip_details",
+            lambda model: BaseAgent.create_structured_llm(TripDetails, model).invoke(messages)
+        )
+        trip_details_cache.set(key, details)
+    
+    return _trip_details_update(user_message, details)
+
+async def aextract_trip_details_node(state: TravelState) -> Dict[str, Any]:
+    """
+    Asynchronously extract the trip details from the user's message.
+    
+    Args:
+        state: Current workflow state
+        
+    Returns:
+        Updated state with extracted trip details
+    """
+    # Extract the latest user message
+    user_message = state["messages"][-1].content
+    
+    # Invoke the LLM once to extract all trip slots, unless the same request was just seen
+    key = _details_key(user_message)
+    details = trip_details_cache.get(key)
+    if details is None:
+        messages = _extraction_messages(user_message)
+        details = await arun_routed(
+            "extract_trip_details",
+            lambda model: BaseAgent.create_structured_llm(TripDetails, model).ainvoke(messages)
+        )
+        trip_details_cache.set(key, details)
+    
+    return _trip_details_update(user_message, details)
+
+def _details_key(user_message: str) -> Tuple[str, str]:
+    """
+    Identify a request for the trip details cache.
+    
+    Relative dates depend on the day, so today's date is part of the key.
+    
+    Args:
+        user_message: Latest user message
+        
+    Returns:
+        Case-folded request with collapsed whitespace, and today's date
+    """
+    return " ".join(user_message.split()).casefold(), datetime.today().strftime("%Y-%m-%d")
+
+def _extraction_messages(user_message: str) -> List[HumanMessage]:
+    """
+    Format the extraction prompt with the user message and today's date.
+    
+    Args:
+        user_message: Latest user message
+        
+    Returns:
+        Messages for the structured extraction call
+    """
+    todays_date = datetime.today().strftime("%Y-%m-%d")
+    return [HumanMessage(content=EXTRACTION_PROMPT.format(
+        text=user_message,
+        todays_date=todays_date
+    ))]
+
+def _trip_details_update(user_message: str, details: TripDetails) -> Dict[str, Any]:
+    """
+    Build the state update from the extracted trip details.
+    
+    Args:
+        user_message: Latest user message, checked by the date fast path
+        details: Trip details returned by the LLM
+        
+    Returns:
+        Updated state with extracted trip details
+    """
+    # The deterministic date fast path wins over the model's answer
+    date_range = resolve_date_range(user_message)
+    if date_range:
+        travel_date, end_date = date_range
+    else:
+        travel_date = resolve_date_phrase(user_message) or details.travel_date or ""
+        end_date = _end_date(travel_date, details) if travel_date else ""
+    
+    # Longer trips are planned for their first MAX_TRIP_DAYS days
+    shortened = bool(end_date) and len(trip_dates(travel_date, end_date)) > MAX_TRIP_DAYS
+    if shortened:
+        end_date = trip_dates(travel_date, end_date)[MAX_TRIP_DAYS - 1]
+    nights = details.nights or 0
+    if end_date and (shortened or not nights):
+        # A shortened trip has no more nights than its planned days
+        range_nights = (parse_date(end_date) - parse_date(travel_date)).days
+        nights = min(nights, range_nights) if nights else range_nights
+    stops = _trip_stops(details, travel_date, end_date)
+    
+    return {
+        "city": stops[0]["city"] if stops else details.city,
+        "travel_date": travel_date,
+        "end_date": end_date,
+        "origin": details.origin or "",
+        "party_size": details.party_size or 0,
+        "nights": nights,
+        "local_currency": (stops[0]["local_currency"] if stops else "") or details.local_currency or "",
+        "home_currency": details.home_currency or "",
+        "stops": stops
+    }
+
+def _trip_stops(details: TripDetails, travel_date: str, end_date: str) -> List[Dict[str, Any]]:
+    """
+    Split a trip visiting several cities into its stops.
+    
+    The model's days per city are kept when they fit the trip's dates in
+    visiting order; otherwise the trip's days are shared evenly between the
+    cities. A stop ends on the day the next one starts (the travel day), and
+    the last stop ends with the trip. Every stop of a one-day trip is on the
+    trip's day, and the stops of an undated trip keep their order without
+    dates. Repeated cities are visited once and only the first
+    MAX_TRIP_CITIES cities are planned.
+    
+    Args:
+        details: Trip details returned by the LLM
+        travel_date: First day of the trip (YYYY-MM-DD), empty if unknown
+        end_date: Last day of the trip (YYYY-MM-DD), empty for a one-day trip
+        
+    Returns:
+        Stops with their city, dates, nights and currency, or an empty list
+        for a single-city trip
+    """
+    unique_stops: Dict[str, TripStop] = {}
+    for stop in details.stops or []:
+        unique_stops.setdefault(normalize_city(stop.city), stop)
+    stops = list(unique_stops.values())[:MAX_TRIP_CITIES]
+    if len(stops) < 2:
+        return []
+        
+    if not travel_date:
+        # Undated trip: the cities are kept so the plan still covers all of them
+        starts = ends = [""] * len(stops)
+    elif not end_date:
+        # One-day trip: every city is visited on the trip's day
+        starts = ends = [travel_date] * len(stops)
+    else:
+        days = trip_dates(travel_date, end_date)
+        starts = [stop.travel_date for stop in stops]
+        if not (starts[0] == travel_date and all(start in days for start in starts) and starts == sorted(starts)):
+            starts = [days[len(days) * index // len(stops)] for index in range(len(stops))]
+        ends = starts[1:] + [end_date]
+    
+    return [
+        {
+            "city": stop.city,
+            "travel_date": start,
+            "end_date": end if end != start else "",
+            "nights": (parse_date(end) - parse_date(start)).days if start else 0,
+            "local_currency": stop.local_currency or ""
+        }
+        for stop, start, end in zip(stops, starts, ends)
+    ]
+
+def _end_date(travel_date: str, details: TripDetails) -> str:
+    """
+    Get the last day of the trip from the model's answer.
+    
+    The length of the range the model extracted is kept when the fast path
+    moved its first day; without a range, the trip ends after the number of
+    nights mentioned.
+    
+    Args:
+        travel_date: First day of the trip (YYYY-MM-DD)
+        details: Trip details returned by the LLM
+        
+    Returns:
+        Last day of the trip (YYYY-MM-DD), or an empty string for a one-day trip
+    """
+    days: Optional[int] = None
+    if details.travel_date and details.end_date:
+        days = (parse_date(details.end_date) - parse_date(details.travel_date)).days
+    elif details.nights:
+        days = details.nights
+    if not days or days < 1:
+        return ""
+    return (parse_date(travel_date) + timedelta(days=days)).strftime("%Y-%m-%d")
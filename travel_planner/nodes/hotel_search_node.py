@@ -2,10 +2,13 @@
 Hotel search node.
 Searches for hotel options and information.
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from langchain_core.messages import HumanMessage
 
+from ..agents.invocation import tool_results
+from ..agents.routing import ainvoke_routed_agent, called_tool, invoke_routed_agent
 from ..agents.hotel_agent import HotelAgent
+from ..state.records import HotelEntry
 from ..state.travel_state import TravelState
 
 def hotel_search_node(state: TravelState) -> Dict[str, Any]:
@@ -18,10 +21,50 @@ def hotel_search_node(state: TravelState) -> Dict[str, Any]:
     Returns:
         Updated state with hotel information
     """
-    # Create hotel search agent
-    hotel_agent = HotelAgent.create()
+    # Validate required information
+    missing = _missing_info_update(state)
+    if missing:
+        return missing
+    
+    # Invoke the hotel search agent
+    response = invoke_routed_agent(
+        "search_hotels", HotelAgent.create, _hotel_request(state), called_tool("tavily_search_results_json")
+    )
+    
+    return _hotel_update(state, response)
+
+async def ahotel_search_node(state: TravelState) -> Dict[str, Any]:
+    """
+    Asynchronously search for hotel options in the target city.
     
+    Args:
+        state: Current workflow state with city information
+        
+    Returns:
+        Updated state with hotel information
+    """
     # Validate required information
+    missing = _missing_info_update(state)
+    if missing:
+        return missing
+    
+    # Invoke the hotel search agent
+    response = await ainvoke_routed_agent(
+        "search_hotels", HotelAgent.create, _hotel_request(state), called_tool("tavily_search_results_json")
+    )
+    
+    return _hotel_update(state, response)
+
+def _missing_info_update(state: TravelState) -> Optional[Dict[str, Any]]:
+    """
+    Build the update returned when the city is missing.
+    
+    Args:
+        state: Current workflow state
+        
+    Returns:
+        State update explaining the problem, or None if nothing is missing
+    """
     if not state.get("city"):
         return {
             "hotel_info": {
@@ -29,11 +72,28 @@ def hotel_search_node(state: TravelState) -> Dict[str, Any]:
                 "query_city": "Unknown"
             }
         }
+    return None
+
+def _hotel_request(state: TravelState) -> Dict[str, Any]:
+    """
+    Create the agent input asking for hotel options.
     
+    Args:
+        state: Current workflow state with city information
+        
+    Returns:
+        Agent input with the hotel search query
+    """
     # Determine hotel search parameters based on travel date if available
     date_context = ""
-    if state.get("travel_date"):
+    if state.get("end_date"):
+        date_context = f" from {state['travel_date']} to {state['end_date']}"
+    elif state.get("travel_date"):
         date_context = f" for {state['travel_date']}"
+    if state.get("nights"):
+        date_context += f", staying {state['nights']} nights"
+    if state.get("party_size"):
+        date_context += f", for {state['party_size']} guests"
     
     # Create query for hotel search
     hotel_query = (
@@ -42,17 +102,43 @@ def hotel_search_node(state: TravelState) -> Dict[str, Any]:
         f"For each hotel, provide the name, star rating, approximate price per night, "
         f"location/neighborhood, and at least 3 notable amenities or features."
     )
+    return {"messages": [HumanMessage(content=hotel_query)]}
+
+def _hotel_update(state: TravelState, response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract the hotel information from the agent response.
     
-    # Invoke the hotel search agent
-    response = hotel_agent.invoke(
-        {"messages": [HumanMessage(content=hotel_query)]}
-    )
-    
-    # Extract the response
+    Args:
+        state: Current workflow state
+        response: Hotel search agent output
+        
+    Returns:
+        Updated state with hotel information
+    """
     hotel_info = {
         "results": response["messages"][-1].content,
+        "hotels": _hotel_entries(response),
         "query_city": state["city"],
         "query_date": state.get("travel_date", "Unspecified")
     }
     
-    return {"hotel_info": hotel_info}
\ No newline at end of file
+    return {"hotel_info": hotel_info}
+
+def _hotel_entries(response: Dict[str, Any]) -> List[HotelEntry]:
+    """
+    Get the hotels the agent's searches returned as compact records.
+    
+    Args:
+        response: Hotel search agent output
+        
+    Returns:
+        Hotel entries in search order, without duplicate URLs
+    """
+    hotels: Dict[str, HotelEntry] = {}
+    for results in tool_results(response, "tavily_search_results_json"):
+        if not isinstance(results, list):
+            continue
+        for result in results:
+            hotel = HotelEntry.from_search_result(result)
+            hotels.setdefault(hotel.url, hotel)
+    return list(hotels.values())
\ No newline at end of file
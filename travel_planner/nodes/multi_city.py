@@ -0,0 +1,223 @@
+"""
+Multi-city trip nodes.
+Research every stop of a trip visiting several cities in its own sub-graph and
+combine the results for the joint budget and travel plan.
+"""
+from typing import Any, Callable, Coroutine, Dict, List, Tuple
+
+from langchain_core.runnables import Runnable
+
+from ..state.travel_state import TravelState
+
+# Research sections of a stop: node, state field, text key and records key
+_CITY_SECTIONS = {
+    "get_weather": ("weather_info", "forecast", "day_forecasts"),
+    "get_city_info": ("city_info", "attractions", "places"),
+    "search_hotels": ("hotel_info", "results", "hotels"),
+}
+
+def is_multi_city(state: TravelState) -> bool:
+    """
+    Check whether the trip visits several cities.
+    
+    Args:
+        state: Current workflow state with the extracted trip details
+        
+    Returns:
+        True if the trip has more than one stop
+    """
+    return len(state.get("stops") or []) > 1
+
+def stop_states(state: TravelState) -> List[Dict[str, Any]]:
+    """
+    Build the input of each stop's research sub-graph.
+    
+    A stop is researched like a single-city trip to its city on its days,
+    with the traveller details and deadline of the whole trip.
+    
+    Args:
+        state: Current workflow state with the trip's stops
+        
+    Returns:
+        Sub-graph input per stop, in visiting order
+    """
+    return [
+        {
+            "messages": [],
+            "city": stop["city"],
+            "travel_date": stop["travel_date"],
+            "end_date": stop["end_date"],
+            "nights": stop["nights"],
+            "local_currency": stop["local_currency"],
+            "origin": state.get("origin", ""),
+            "party_size": state.get("party_size", 0),
+            "home_currency": state.get("home_currency", ""),
+            "weather_info": {},
+            "city_info": {},
+            "hotel_info": {},
+            "context_budget": {},
+            "deadline": state.get("deadline", 0.0),
+            "degraded_sections": []
+        }
+        for stop in state["stops"]
+    ]
+
+def city_research_nodes(research_graph: Runnable) -> Tuple[
+    Callable[[TravelState], Dict[str, Any]],
+    Callable[[TravelState], Coroutine[Any, Any, Dict[str, Any]]]
+]:
+    """
+    Build the node running a stop's research sub-graph.
+    
+    Args:
+        research_graph: Compiled research sub-graph (see
+            workflow.graph_builder.build_city_research_graph)
+            
+    Returns:
+        Sync and async node functions taking a stop's sub-graph input
+    """
+    def research_city(state: TravelState) -> Dict[str, Any]:
+        return _city_results_update(state, research_graph.invoke(state))
+        
+    async def aresearch_city(state: TravelState) -> Dict[str, Any]:
+        return _city_results_update(state, await research_graph.ainvoke(state))
+        
+    return research_city, aresearch_city
+
+def _city_results_update(stop_state: TravelState, result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Store a stop's research under its city.
+    
+    Degraded sections and prompt budgets are reported with the city they
+    belong to, e.g. "get_weather (Florence)".
+    
+    Args:
+        stop_state: Sub-graph input of the stop
+        result: Final sub-graph state
+        
+    Returns:
+        State update for the multi-city workflow
+    """
+    city = stop_state["city"]
+    return {
+        "city_results": {city: {key: result.get(key) or {} for key, _, _ in _CITY_SECTIONS.values()}},
+        "context_budget": {f"{node} ({city})": report for node, report in (result.get("context_budget") or {}).items()},
+        "degraded_sections": [f"{node} ({city})" for node in result.get("degraded_sections") or []]
+    }
+
+def trip_view(state: TravelState) -> TravelState:
+    """
+    Present a multi-city trip in the shape of a single-city one.
+    
+    The city names every stop, and each research section joins the stops'
+    texts under their city with the records of all stops, so the budget and
+    travel plan nodes can handle the trip as one. A stop whose section is
+    missing is noted in the text; a section missing for every stop is
+    degraded. Single-city states are returned unchanged.
+    
+    Args:
+        state: Current workflow state
+        
+    Returns:
+        State with the joint research sections
+    """
+    if not is_multi_city(state):
+        return state
+        
+    city_results = state.get("city_results") or {}
+    results = [(stop["city"], city_results.get(stop["city"]) or {}) for stop in state["stops"]]
+    view = {**state, "city": describe_cities(state)}
+    for key, text_key, records_key in _CITY_SECTIONS.values():
+        view[key] = _joint_section(results, key, text_key, records_key)
+    return view
+
+def _joint_section(results: List[Tuple[str, Dict[str, Any]]], key: str, text_key: str, records_key: str) -> Dict[str, Any]:
+    """
+    Join one research section of every stop.
+    
+    Args:
+        results: City and research sections of each stop, in visiting order
+        key: State field of the section
+        text_key: Key of the section text
+        records_key: Key of the section records
+        
+    Returns:
+        Joint section, or a degraded section if no stop has it
+    """
+    parts, records, reasons = [], [], []
+    for city, sections in results:
+        section = sections.get(key) or {}
+        text = section.get(text_key)
+        if not text:
+            reason = section.get("degraded") or "it could not be retrieved"
+            reasons.append(reason)
+            text = f"Not available because {reason}."
+        parts.append(f"{city.upper()}:\n{text}")
+        records.extend(section.get(records_key) or [])
+        
+    if len(reasons) == len(results):
+        return {"degraded": reasons[0]}
+    return {
+        text_key: "\n\n".join(parts),
+        records_key: records,
+        "query_city": ", ".join(city for city, _ in results)
+    }
+
+def trip_currencies(state: TravelState) -> List[str]:
+    """
+    Get the currencies used at the trip's destinations.
+    
+    Args:
+        state: Current workflow state with the trip details
+        
+    Returns:
+        Distinct currency codes in visiting order, or an empty list if the
+        currency of any destination is unknown
+    """
+    stops = state.get("stops") if is_multi_city(state) else [state]
+    currencies = [stop.get("local_currency") or "" for stop in stops]
+    if not all(currencies):
+        return []
+    return list(dict.fromkeys(currencies))
+
+def describe_cities(state: TravelState) -> str:
+    """
+    Name the trip's destinations.
+    
+    Args:
+        state: Current workflow state with the trip details
+        
+    Returns:
+        "Rome", "Rome and Florence" or "Rome, Florence and Venice"
+    """
+    if not is_multi_city(state):
+        return state["city"]
+    cities = [stop["city"] for stop in state["stops"]]
+    return f"{', '.join(cities[:-1])} and {cities[-1]}"
+
+def describe_stops(state: TravelState) -> str:
+    """
+    Describe the order and days of the trip's stops.
+    
+    Args:
+        state: Current workflow state with the trip's stops
+        
+    Returns:
+        e.g. "Rome from 2025-06-07 to 2025-06-09, then Florence from 2025-06-09 to 2025-06-10",
+        "Pisa, then Lucca on 2025-06-07" for a one-day trip, or "Rome, then Florence"
+        for an undated one
+    """
+    days = {stop["travel_date"] for stop in state.get("stops") or []}
+    if len(days) == 1:
+        # One-day or undated trip: the stops only differ in their order
+        route = ", then ".join(stop["city"] for stop in state["stops"])
+        day = days.pop()
+        return f"{route} on {day}" if day else route
+        
+    stops = []
+    for stop in state.get("stops") or []:
+        if stop["end_date"]:
+            stops.append(f"{stop['city']} from {stop['travel_date']} to {stop['end_date']}")
+        else:
+            stops.append(f"{stop['city']} on {stop['travel_date']}")
+    return ", then ".join(stops)
\ No newline at end of file
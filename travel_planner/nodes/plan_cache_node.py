@@ -0,0 +1,199 @@
+"""
+Travel plan cache nodes.
+Answer repeated requests from the plan cache and store finished plans in it.
+"""
+from typing import Dict, Any, List, Optional
+from langchain_core.messages import HumanMessage
+
+from ..config.settings import WEATHER_CACHE_TTL_SECONDS
+from ..state.travel_state import TravelState
+from ..tools.weather_tool import forecast_cache
+from ..utils.cache import normalize_city
+from ..utils.plan_cache import PlanKey, plan_cache
+from .multi_city import is_multi_city
+
+def lookup_plan_cache_node(state: TravelState) -> Dict[str, Any]:
+    """
+    Look up a cached travel plan for the extracted trip details.
+    
+    Args:
+        state: Current workflow state with the extracted trip details
+        
+    Returns:
+        State update with the cached travel plan, or an empty update on a miss
+    """
+    key = PlanKey.from_state(state)
+    if key is None:
+        return {}
+        
+    travel_plan = plan_cache.get(key)
+    if travel_plan is None and plan_cache.has_similar_candidates(key):
+        travel_plan = plan_cache.get_similar(key, plan_cache.embeddings.embed_query(_user_request(state)))
+        
+    return _lookup_update(travel_plan)
+
+async def alookup_plan_cache_node(state: TravelState) -> Dict[str, Any]:
+    """
+    Asynchronously look up a cached travel plan for the extracted trip details.
+    
+    Args:
+        state: Current workflow state with the extracted trip details
+        
+    Returns:
+        State update with the cached travel plan, or an empty update on a miss
+    """
+    key = PlanKey.from_state(state)
+    if key is None:
+        return {}
+        
+    travel_plan = plan_cache.get(key)
+    if travel_plan is None and plan_cache.has_similar_candidates(key):
+        travel_plan = plan_cache.get_similar(key, await plan_cache.embeddings.aembed_query(_user_request(state)))
+        
+    return _lookup_update(travel_plan)
+
+def store_travel_plan_node(state: TravelState) -> Dict[str, Any]:
+    """
+    Cache the finished travel plan.
+    
+    Args:
+        state: Final workflow state
+        
+    Returns:
+        Empty state update
+    """
+    key = _cacheable_key(state)
+    if key is not None:
+        embedding = plan_cache.embeddings.embed_query(_user_request(state)) if plan_cache.embeddings else None
+        plan_cache.set(key, state["travel_plan"], _plan_ttl(state), embedding)
+    return {}
+
+async def astore_travel_plan_node(state: TravelState) -> Dict[str, Any]:
+    """
+    Asynchronously cache the finished travel plan.
+    
+    Args:
+        state: Final workflow state
+        
+    Returns:
+        Empty state update
+    """
+    key = _cacheable_key(state)
+    if key is not None:
+        embedding = await plan_cache.embeddings.aembed_query(_user_request(state)) if plan_cache.embeddings else None
+        plan_cache.set(key, state["travel_plan"], _plan_ttl(state), embedding)
+    return {}
+
+def is_plan_cache_hit(state: TravelState) -> bool:
+    """
+    Check whether the plan cache answered the request.
+    
+    Args:
+        state: Current workflow state
+        
+    Returns:
+        True if the travel plan came from the cache
+    """
+    return bool(state.get("plan_cache_hit"))
+
+def _lookup_update(travel_plan: Optional[str]) -> Dict[str, Any]:
+    """
+    Build the update for a plan cache lookup.
+    
+    Args:
+        travel_plan: Cached travel plan, or None on a miss
+        
+    Returns:
+        State update with the cached plan, or an empty update
+    """
+    if travel_plan is None:
+        return {}
+    return {
+        "travel_plan": travel_plan,
+        "plan_cache_hit": True,
+        "messages": [HumanMessage(content=travel_plan)]
+    }
+
+def _user_request(state: TravelState) -> str:
+    """
+    Get the user's request that started the workflow.
+    
+    Args:
+        state: Current workflow state
+        
+    Returns:
+        Text of the first message
+    """
+    return str(state["messages"][0].content)
+
+def _cacheable_key(state: TravelState) -> Optional[PlanKey]:
+    """
+    Get the plan key if the travel plan was built from complete research.
+    
+    Plans written without a forecast, attractions, hotels or budget, or with
+    a degraded section, are not cached, so a temporary failure or slowdown
+    is not repeated to later requests. A multi-city plan needs the research
+    of every stop.
+    
+    Args:
+        state: Final workflow state
+        
+    Returns:
+        Plan key, or None if the plan should not be cached
+    """
+    if state.get("plan_cache_hit") or not state.get("travel_plan") or state.get("degraded_sections"):
+        return None
+    if not state.get("budget_info", {}).get("budget_plan"):
+        return None
+    for research in _research(state):
+        if not (
+            research.get("weather_info", {}).get("day_forecast")
+            and research.get("city_info", {}).get("attractions")
+            and research.get("hotel_info", {}).get("results")
+        ):
+            return None
+    return PlanKey.from_state(state)
+
+def _research(state: TravelState) -> List[Dict[str, Any]]:
+    """
+    Get the research sections of each city of the trip.
+    
+    Args:
+        state: Final workflow state
+        
+    Returns:
+        The state itself for a single-city trip, or each stop's research
+    """
+    if not is_multi_city(state):
+        return [state]
+    city_results = state.get("city_results") or {}
+    return [{"city": stop["city"], **city_results.get(stop["city"], {})} for stop in state["stops"]]
+
+def _plan_ttl(state: TravelState) -> float:
+    """
+    Get how long a plan stays valid: as long as the forecasts it was built from.
+    
+    Args:
+        state: Final workflow state
+        
+    Returns:
+        Seconds until the first of the cities' cached forecasts expires
+    """
+    return min(_forecast_ttl(research) for research in _research(state))
+
+def _forecast_ttl(research: Dict[str, Any]) -> float:
+    """
+    Get how long a city's cached forecast stays valid.
+    
+    Args:
+        research: Research sections of the city, with its name
+        
+    Returns:
+        Seconds until the forecast expires
+    """
+    # The forecast is cached under the city the tool was asked for
+    for city in (research["city"], research["weather_info"]["day_forecast"].city):
+        remaining = forecast_cache.expires_in(normalize_city(city))
+        if remaining is not None:
+            return remaining
+    return WEATHER_CACHE_TTL_SECONDS
\ No newline at end of file
@@ -2,89 +2,322 @@
 Travel plan node.
 Creates a comprehensive travel plan based on all collected information.
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from langchain_core.messages import HumanMessage
 
+from ..agents.routing import ainvoke_routed_agent, invoke_routed_agent
 from ..agents.travel_planner_agent import TravelPlannerAgent
+from ..config.settings import PLAN_CONTEXT_TOKEN_BUDGET
+from ..state.records import describe_hotels
 from ..state.travel_state import TravelState
+from ..utils.context_budget import BudgetReport, fit_sections
+from ..utils.date_utils import describe_trip_period, trip_dates
+from ..utils.metrics import record_tokens_saved
+from .multi_city import describe_stops, is_multi_city, trip_view
+
+# Research sections of the planning prompt: state field, text key and description
+_SECTIONS = {
+    "weather": ("weather_info", "forecast", "weather"),
+    "attractions": ("city_info", "attractions", "city attractions"),
+    "hotels": ("hotel_info", "results", "hotel"),
+    "budget": ("budget_info", "budget_plan", "budget"),
+}
 
 def travel_plan_node(state: TravelState) -> Dict[str, Any]:
     """
     Create a comprehensive travel plan based on all collected information.
     
+    A trip over several days gets a day-by-day itinerary for all of its days
+    from a single planner call, and a trip visiting several cities one plan
+    built from the research of all its stops.
+    
+    Args:
+        state: Current workflow state with all travel information
+        
+    Returns:
+        Updated state with final travel plan
+    """
+    state = trip_view(state)
+    
+    # Check if we have enough information to create a plan
+    missing = _missing_info_update(state)
+    if missing:
+        return missing
+    
+    # Invoke the travel planner agent
+    request, report = _planning_request(state)
+    response = invoke_routed_agent("create_travel_plan", TravelPlannerAgent.create, request)
+    
+    return _travel_plan_update(response, report)
+
+async def atravel_plan_node(state: TravelState) -> Dict[str, Any]:
+    """
+    Asynchronously create a comprehensive travel plan.
+    
     Args:
         state: Current workflow state with all travel information
         
     Returns:
         Updated state with final travel plan
     """
-    # Create travel planner agent
-    travel_planner_agent = TravelPlannerAgent.create()
+    state = trip_view(state)
     
     # Check if we have enough information to create a plan
+    missing = _missing_info_update(state)
+    if missing:
+        return missing
+    
+    # Invoke the travel planner agent
+    request, report = _planning_request(state)
+    response = await ainvoke_routed_agent("create_travel_plan", TravelPlannerAgent.create, request)
+    
+    return _travel_plan_update(response, report)
+
+def fallback_travel_plan_node(state: TravelState, reason: str) -> Dict[str, Any]:
+    """
+    Assemble a travel plan from the research sections without the planner agent.
+    
+    Used when the planner cannot finish before the request deadline, so the
+    traveller still gets the research that arrived in time.
+    
+    Args:
+        state: Current workflow state with the collected travel information
+        reason: Why the planner agent did not write the plan
+        
+    Returns:
+        Updated state with the assembled travel plan
+    """
+    state = trip_view(state)
+    missing = _missing_info_update(state)
+    if missing:
+        return missing
+        
+    texts = _section_texts(state)
+    parts = [
+        f"Travel plan for {state['city']} {_trip_period(state)}",
+        f"(The detailed plan could not be written because {reason}; below is the research gathered for your trip.)"
+    ]
+    for name, (_, _, label) in _SECTIONS.items():
+        parts.append(f"{label.upper()} INFORMATION:\n{texts[name] or _unavailable_note(state, name)}")
+    travel_plan = "\n\n".join(parts)
+    
+    return {
+        "travel_plan": travel_plan,
+        "messages": [HumanMessage(content=travel_plan)],
+        "degraded_sections": ["create_travel_plan"]
+    }
+
+def _missing_info_update(state: TravelState) -> Optional[Dict[str, Any]]:
+    """
+    Build the update returned when critical information is missing.
+    
+    Only the city and date are critical; research sections that are missing
+    or degraded are left out of the plan instead (see _section_texts).
+    
+    Args:
+        state: Current workflow state
+        
+    Returns:
+        State update with an error message, or None if nothing is missing
+    """
     missing_info = []
     if not state.get("city"):
         missing_info.append("city")
     if not state.get("travel_date"):
         missing_info.append("travel date")
-    if not state.get("weather_info") or not state["weather_info"].get("forecast"):
-        missing_info.append("weather information")
-    if not state.get("city_info") or not state["city_info"].get("attractions"):
-        missing_info.append("city attractions")
-    if not state.get("hotel_info") or not state["hotel_info"].get("results"):
-        missing_info.append("hotel options")
-    if not state.get("budget_info") or not state["budget_info"].get("budget_plan"):
-        missing_info.append("budget information")
     
     # If missing critical information, return error
     if missing_info:
         error_message = (
-            f"Unable to create a complete travel plan due to missing information: "
+            f"Unable to create a travel plan due to missing information: "
             f"{', '.join(missing_info)}."
         )
         return {
             "travel_plan": error_message,
-            "messages": state["messages"] + [HumanMessage(content=error_message)]
+            "messages": [HumanMessage(content=error_message)]
         }
+    return None
+
+def _section_texts(state: TravelState) -> Dict[str, str]:
+    """
+    Get the text of each research section, or an empty string if it did not arrive.
+    
+    Args:
+        state: Current workflow state
+        
+    Returns:
+        Section texts keyed by prompt section name
+    """
+    return {
+        name: str((state.get(key) or {}).get(field) or "")
+        for name, (key, field, _) in _SECTIONS.items()
+    }
+
+def _unavailable_note(state: TravelState, name: str) -> str:
+    """
+    Describe why a research section is missing from the plan.
+    
+    Args:
+        state: Current workflow state
+        name: Prompt section name
+        
+    Returns:
+        Note telling the planner (and the traveller) the section is unavailable
+    """
+    key, _, label = _SECTIONS[name]
+    reason = (state.get(key) or {}).get("degraded") or "it could not be retrieved"
+    return f"Not available: the {label} lookup was skipped because {reason}."
+
+def _planning_request(state: TravelState) -> Tuple[Dict[str, Any], BudgetReport]:
+    """
+    Create the agent input with all collected travel information.
+    
+    The research sections are fitted into PLAN_CONTEXT_TOKEN_BUDGET; sections
+    that do not fit keep their key facts (forecast summary, hotel list,
+    exchange rates) and their most informative lines. Sections that did not
+    arrive in time are replaced by a note, and the plan is written without them.
+    
+    Args:
+        state: Current workflow state with all travel information
+        
+    Returns:
+        Agent input with the planning prompt, and the context budget report
+    """
+    texts = _section_texts(state)
+    sections, report = fit_sections(
+        {name: text for name, text in texts.items() if text},
+        PLAN_CONTEXT_TOKEN_BUDGET,
+        key_facts=_key_facts(state)
+    )
+    unavailable = [name for name, text in texts.items() if not text]
+    for name in unavailable:
+        sections[name] = _unavailable_note(state, name)
+    partial_note = (
+        "\n    Some information is not available. Plan around it and tell the traveller what to check before the trip.\n"
+        if unavailable else ""
+    )
     
-    # Create comprehensive prompt for travel planner
     planning_prompt = f"""
-    Create a comprehensive travel plan for {state['city']} on {state['travel_date']} based on the following information:
+    Create a comprehensive travel plan for {state['city']} {_trip_period(state)} based on the following information:
 
     WEATHER INFORMATION:
-    {state['weather_info']['forecast']}
+    {sections['weather']}
 
     CITY ATTRACTIONS AND CULTURAL PLACES:
-    {state['city_info']['attractions']}
+    {sections['attractions']}
 
     HOTEL OPTIONS:
-    {state['hotel_info']['results']}
+    {sections['hotels']}
 
     BUDGET AND EXCHANGE RATE INFORMATION:
-    {state['budget_info']['budget_plan']}
+    {sections['budget']}
 
     Please include:
-    1. Daily itinerary with activities considering the weather and must-visit places
+    1. {_itinerary_item(state)}
     2. Recommended hotel from the options with justification
     3. Detailed packing list based on the weather forecast
     4. Write curreny differance then Budget considerations and money management tips
     5. Cultural insights and special recommendations for this destination
     6. Transportation tips including from the airport to the city and getting around
     7. Local cuisine recommendations
+    {partial_note}"""
+    return {"messages": [HumanMessage(content=planning_prompt)]}, report
+
+def _trip_period(state: TravelState) -> str:
     """
+    Describe when the trip takes place.
     
-    # Invoke the travel planner agent
-    response = travel_planner_agent.invoke(
-        {"messages": [HumanMessage(content=planning_prompt)]}
-    )
+    Args:
+        state: Current workflow state with the travel dates
+        
+    Returns:
+        "on <date>" or "from <first day> to <last day> (<n> days)"
+    """
+    return describe_trip_period(state['travel_date'], state.get('end_date'))
+
+def _itinerary_item(state: TravelState) -> str:
+    """
+    Ask for a one-day itinerary, or a day-by-day one for a longer trip.
     
-    # Extract the travel plan
-    travel_plan = response["messages"][-1].content
+    A trip visiting several cities also gives the order and days of its stops.
+    
+    Args:
+        state: Current workflow state with the travel dates
+        
+    Returns:
+        Itinerary item of the planning prompt
+    """
+    dates = trip_dates(state['travel_date'], state.get('end_date'))
+    if len(dates) == 1:
+        item = "Daily itinerary with activities considering the weather and must-visit places"
+    else:
+        item = (
+            f"Day-by-day itinerary for each of the {len(dates)} days ({', '.join(dates)}), matching the activities "
+            f"to each day's weather and spreading the must-visit places over the trip without repeating them"
+        )
+    if is_multi_city(state):
+        item += f", visiting {describe_stops(state)} and including the travel between the cities"
+    return item
+
+def _weather_facts(state: TravelState) -> str:
+    """
+    Summarize the forecast of every trip day, noting days without one.
+    
+    Args:
+        state: Current workflow state with the weather information
+        
+    Returns:
+        One line per forecast day, or an empty string without a forecast
+    """
+    weather_info = state.get('weather_info') or {}
+    day_forecasts = weather_info.get('day_forecasts') or [
+        day_forecast for day_forecast in [weather_info.get('day_forecast')] if day_forecast
+    ]
+    if not day_forecasts:
+        return ""
+    lines = [day_forecast.summary() for day_forecast in day_forecasts]
+    forecast_dates = {day_forecast.date for day_forecast in day_forecasts}
+    missing = [date for date in trip_dates(state['travel_date'], state.get('end_date')) if date not in forecast_dates]
+    if missing:
+        lines.append(f"No forecast yet for {', '.join(missing)}")
+    return "\n".join(lines)
+
+def _key_facts(state: TravelState) -> Dict[str, str]:
+    """
+    Describe the structured research records that must survive prompt compression.
+    
+    Args:
+        state: Current workflow state with all travel information
+        
+    Returns:
+        Compact facts per prompt section
+    """
+    rate_table = (state.get('budget_info') or {}).get('rate_table')
+    places = (state.get('city_info') or {}).get('places', [])
+    return {
+        "weather": _weather_facts(state),
+        "attractions": f"Places: {', '.join(place.title for place in places)}" if places else "",
+        "hotels": describe_hotels((state.get('hotel_info') or {}).get('hotels', [])),
+        "budget": rate_table.summary() if rate_table else "",
+    }
+
+def _travel_plan_update(response: Dict[str, Any], report: BudgetReport) -> Dict[str, Any]:
+    """
+    Extract the travel plan from the agent response.
     
-    # Add the plan to messages for response to user
-    updated_messages = state["messages"] + [HumanMessage(content=travel_plan)]
+    Args:
+        response: Travel planner agent output
+        report: Context budget report of the planning prompt
+        
+    Returns:
+        Updated state with final travel plan
+    """
+    travel_plan = response["messages"][-1].content
     
+    # Add the plan to messages for response to user (appended by the state reducer)
+    record_tokens_saved("create_travel_plan", report.tokens_saved)
     return {
         "travel_plan": travel_plan, 
-        "messages": updated_messages
+        "messages": [HumanMessage(content=travel_plan)],
+        "context_budget": {"create_travel_plan": report.as_dict()}
     }
\ No newline at end of file
@@ -2,26 +2,97 @@
 Weather information node.
 Retrieves weather forecast and clothing recommendations.
 """
-from typing import Dict, Any
+import json
+from typing import Dict, Any, List, Optional, Union
 from langchain_core.messages import HumanMessage
 
+from ..agents.invocation import tool_results
+from ..agents.routing import ainvoke_routed_agent, called_tool, invoke_routed_agent
+from ..agents.summary_agent import SummaryAgent
 from ..agents.weather_agent import WeatherAgent
+from ..config.settings import get_node_execution_mode
+from ..state.records import DayForecast
 from ..state.travel_state import TravelState
+from ..tools.weather_tool import get_weather
+from ..utils.date_utils import describe_trip_period
 
 def weather_node(state: TravelState) -> Dict[str, Any]:
     """
     Get weather forecast and clothing recommendations for the travel destination.
     
+    A trip over several days gets the forecast of every day from one
+    get_weather call, sliced per day out of the same downloaded forecast.
+    
     Args:
         state: Current workflow state with city and date information
         
     Returns:
         Updated state with weather information
     """
-    # Create weather agent
-    weather_agent = WeatherAgent.create()
+    # Validate required information
+    missing = _missing_info_update(state)
+    if missing:
+        return missing
+    
+    mode = get_node_execution_mode("get_weather")
+    if mode == "agent":
+        # Invoke the weather agent
+        response = invoke_routed_agent(
+            "get_weather", WeatherAgent.create, _weather_request(state), called_tool("get_weather")
+        )
+        return _weather_update(state, response["messages"][-1].content, _day_forecasts(response))
     
+    # Call the weather tool directly
+    result = get_weather.invoke(_weather_tool_args(state))
+    day_forecasts = _result_forecasts(result)
+    if mode == "direct":
+        return _weather_update(state, _describe_result(result, day_forecasts), day_forecasts)
+    
+    response = invoke_routed_agent("get_weather", SummaryAgent.create, _summary_request(state, result))
+    return _weather_update(state, response["messages"][-1].content, day_forecasts)
+
+async def aweather_node(state: TravelState) -> Dict[str, Any]:
+    """
+    Asynchronously get weather forecast and clothing recommendations.
+    
+    Args:
+        state: Current workflow state with city and date information
+        
+    Returns:
+        Updated state with weather information
+    """
     # Validate required information
+    missing = _missing_info_update(state)
+    if missing:
+        return missing
+    
+    mode = get_node_execution_mode("get_weather")
+    if mode == "agent":
+        # Invoke the weather agent
+        response = await ainvoke_routed_agent(
+            "get_weather", WeatherAgent.create, _weather_request(state), called_tool("get_weather")
+        )
+        return _weather_update(state, response["messages"][-1].content, _day_forecasts(response))
+    
+    # Call the weather tool directly
+    result = await get_weather.ainvoke(_weather_tool_args(state))
+    day_forecasts = _result_forecasts(result)
+    if mode == "direct":
+        return _weather_update(state, _describe_result(result, day_forecasts), day_forecasts)
+    
+    response = await ainvoke_routed_agent("get_weather", SummaryAgent.create, _summary_request(state, result))
+    return _weather_update(state, response["messages"][-1].content, day_forecasts)
+
+def _missing_info_update(state: TravelState) -> Optional[Dict[str, Any]]:
+    """
+    Build the update returned when the city or date is missing.
+    
+    Args:
+        state: Current workflow state
+        
+    Returns:
+        State update explaining the problem, or None if nothing is missing
+    """
     if not state.get("city") or not state.get("travel_date"):
         return {
             "weather_info": {
@@ -29,23 +100,135 @@ def weather_node(state: TravelState) -> Dict[str, Any]:
                 "query_city": state.get("city", "Unknown")
             }
         }
+    return None
+
+def _weather_query(state: TravelState) -> str:
+    """
+    Ask for the weather and clothing recommendations.
     
-    # Create query for weather and clothing recommendations
-    weather_query = (
-        f"What's the weather in {state['city']} on {state['travel_date']}? "
+    Args:
+        state: Current workflow state with city and date information
+        
+    Returns:
+        Weather query
+    """
+    return (
+        f"What's the weather in {state['city']} {describe_trip_period(state['travel_date'], state.get('end_date'))}? "
         f"Also, what clothes should I pack for this weather?"
     )
+
+def _weather_request(state: TravelState) -> Dict[str, Any]:
+    """
+    Create the agent input asking for weather and clothing recommendations.
     
-    # Invoke the weather agent
-    response = weather_agent.invoke(
-        {"messages": [HumanMessage(content=weather_query)]}
-    )
+    Args:
+        state: Current workflow state with city and date information
+        
+    Returns:
+        Agent input with the weather query
+    """
+    return {"messages": [HumanMessage(content=_weather_query(state))]}
+
+def _weather_tool_args(state: TravelState) -> Dict[str, str]:
+    """
+    Build the weather tool input for a direct call.
+    
+    Args:
+        state: Current workflow state with city and date information
+        
+    Returns:
+        get_weather arguments, with the last day for a multi-day trip
+    """
+    args = {"city": state["city"], "date": state["travel_date"]}
+    if state.get("end_date"):
+        args["end_date"] = state["end_date"]
+    return args
+
+def _summary_request(state: TravelState, result: Union[Dict[str, Any], str]) -> Dict[str, Any]:
+    """
+    Create the summary agent input answering the weather query from a retrieved forecast.
     
-    # Extract the response
+    Args:
+        state: Current workflow state with city and date information
+        result: get_weather output
+        
+    Returns:
+        Agent input with the weather query and the forecast
+    """
+    forecast = json.dumps(result, ensure_ascii=False) if isinstance(result, dict) else result
+    return {"messages": [HumanMessage(content=f"{_weather_query(state)}\n\nForecast retrieved for you:\n{forecast}")]}
+
+def _weather_update(state: TravelState, forecast: str, day_forecasts: List[DayForecast]) -> Dict[str, Any]:
+    """
+    Build the weather information update.
+    
+    Args:
+        state: Current workflow state
+        forecast: Weather description for the travel plan
+        day_forecasts: Forecast slots of each trip day a forecast was retrieved for
+        
+    Returns:
+        Updated state with weather information; day_forecast holds the first
+        day's forecast and day_forecasts every day's
+    """
     weather_info = {
-        "forecast": response["messages"][-1].content,
+        "forecast": forecast,
+        "day_forecast": day_forecasts[0] if day_forecasts else None,
+        "day_forecasts": day_forecasts,
         "query_city": state["city"],
-        "query_date": state["travel_date"]
+        "query_date": state["travel_date"],
+        "query_end_date": state.get("end_date", "")
     }
     
-    return {"weather_info": weather_info}
\ No newline at end of file
+    return {"weather_info": weather_info}
+
+def _day_forecasts(response: Dict[str, Any]) -> List[DayForecast]:
+    """
+    Get the forecasts the agent retrieved as compact records.
+    
+    The agent may fetch the whole trip at once or one day per call; the
+    days of all its get_weather calls are merged.
+    
+    Args:
+        response: Weather agent output
+        
+    Returns:
+        Forecast slots per day in date order, empty if the agent got no forecast
+    """
+    days = {}
+    for result in tool_results(response, "get_weather"):
+        for day_forecast in _result_forecasts(result):
+            days[day_forecast.date] = day_forecast
+    return [days[date] for date in sorted(days)]
+
+def _result_forecasts(result: Union[Dict[str, Any], str]) -> List[DayForecast]:
+    """
+    Get a directly retrieved forecast as compact records.
+    
+    Args:
+        result: get_weather output
+        
+    Returns:
+        Forecast slots per day, empty if the tool returned an error
+    """
+    if isinstance(result, dict):
+        return DayForecast.days_from_tool_result(result)
+    return []
+
+def _describe_result(result: Union[Dict[str, Any], str], day_forecasts: List[DayForecast]) -> str:
+    """
+    Describe a directly retrieved forecast without an LLM call.
+    
+    Args:
+        result: get_weather output
+        day_forecasts: Forecast records built from the output
+        
+    Returns:
+        Forecast lines, or the tool's explanation when it found no forecast
+    """
+    if day_forecasts:
+        lines = [day_forecast.describe() for day_forecast in day_forecasts]
+        if isinstance(result, dict) and result.get("Missing"):
+            lines.append(f"No forecast is available yet for {', '.join(result['Missing'])}.")
+        return "\n\n".join(lines)
+    return result if isinstance(result, str) else json.dumps(result, ensure_ascii=False)
\ No newline at end of file
@@ -0,0 +1,253 @@
+"""
+Compact records carried in the workflow state.
+Typed forms of the tool results gathered by the research agents, stored next
+to the agents' prose so later nodes and caches can use them directly.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Price per night with a currency, e.g. "289 EUR", "€289", "$120"
+_PRICE_PATTERN = re.compile(
+    r"(?:(?P<symbol>[$€£₺])\s?(?P<symbol_amount>\d[\d,]*(?:\.\d+)?))"
+    r"|(?:(?P<amount>\d[\d,]*(?:\.\d+)?)\s?(?P<code>[A-Z]{3})\b)"
+)
+_CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "₺": "TRY"}
+
+# Rating such as "4.5/5", "8.9/10" or "4-star"
+_RATING_PATTERN = re.compile(r"(?P<score>\d(?:\.\d)?)\s?/\s?(?P<scale>5|10)\b|(?P<stars>[1-5])[- ]star")
+
+@dataclass(frozen=True, slots=True)
+class ForecastSlot:
+    """
+    One 3-hour forecast slot.
+    """
+    time: str
+    temperature: float
+    wind_speed: float
+    rain_probability: int
+    weather_main: str
+    weather_description: str
+
+@dataclass(frozen=True, slots=True)
+class DayForecast:
+    """
+    Forecast slots of one city and day.
+    """
+    city: str
+    date: str
+    slots: Tuple[ForecastSlot, ...]
+    
+    def __post_init__(self):
+        # Checkpoint serialization restores tuples as lists
+        object.__setattr__(self, "slots", tuple(self.slots))
+        
+    @classmethod
+    def from_tool_result(cls, result: Dict[str, Any]) -> "DayForecast":
+        """
+        Build a day forecast from a get_weather result.
+        
+        Args:
+            result: Weather tool output with City, Date and Forecasts
+            
+        Returns:
+            Day forecast record
+        """
+        return cls(
+            city=result["City"],
+            date=result["Date"],
+            slots=tuple(ForecastSlot(**slot) for slot in result["Forecasts"])
+        )
+        
+    @classmethod
+    def days_from_tool_result(cls, result: Dict[str, Any]) -> List["DayForecast"]:
+        """
+        Build the day forecasts of a one-day or multi-day get_weather result.
+        
+        Args:
+            result: Weather tool output with Forecasts for one date, or Days
+                mapping each date of a range to its forecasts
+                
+        Returns:
+            Day forecast records in date order
+        """
+        if result.get("Forecasts"):
+            return [cls.from_tool_result(result)]
+        return [
+            cls(city=result["City"], date=date, slots=tuple(ForecastSlot(**slot) for slot in slots))
+            for date, slots in result.get("Days", {}).items()
+            if slots
+        ]
+        
+    def summary(self) -> str:
+        """
+        Describe the day in one line.
+        
+        Returns:
+            Temperature range, conditions and maximum wind
+        """
+        temperatures = [slot.temperature for slot in self.slots]
+        conditions = dict.fromkeys(slot.weather_description for slot in self.slots if slot.weather_description)
+        return (
+            f"{self.city} on {self.date}: {min(temperatures):.0f} to {max(temperatures):.0f} °C, "
+            f"{', '.join(conditions)}, wind up to {max(slot.wind_speed for slot in self.slots):.1f} m/s"
+        )
+        
+    def describe(self) -> str:
+        """
+        Describe the day with one line per forecast slot.
+        
+        Returns:
+            Day summary followed by the slot forecasts
+        """
+        lines = [self.summary()]
+        for slot in self.slots:
+            lines.append(
+                f"- {slot.time}: {slot.temperature:.0f} °C, {slot.weather_description or slot.weather_main}, "
+                f"{slot.rain_probability}% chance of rain, wind {slot.wind_speed:.1f} m/s"
+            )
+        return "\n".join(lines)
+
+@dataclass(frozen=True, slots=True)
+class HotelEntry:
+    """
+    Hotel option found by the hotel search, with the price and rating
+    mentioned in its search result when there is one.
+    """
+    name: str
+    url: str
+    price_per_night: Optional[float] = None
+    currency: str = ""
+    rating: Optional[float] = None
+    snippet: str = ""
+    
+    @classmethod
+    def from_search_result(cls, result: Dict[str, Any], max_snippet_chars: int = 160) -> "HotelEntry":
+        """
+        Build a hotel entry from a Tavily search result.
+        
+        Args:
+            result: Search result with title, url and content
+            max_snippet_chars: Maximum characters kept from the content
+            
+        Returns:
+            Hotel entry record
+        """
+        content = " ".join(str(result.get("content", "")).split())
+        price, currency = _parse_price(content)
+        return cls(
+            name=result.get("title", ""),
+            url=result.get("url", ""),
+            price_per_night=price,
+            currency=currency,
+            rating=_parse_rating(content),
+            snippet=content[:max_snippet_chars]
+        )
+        
+    def describe(self) -> str:
+        """
+        Describe the hotel in one line.
+        """
+        details = []
+        if self.price_per_night is not None:
+            details.append(f"from {self.price_per_night:g} {self.currency}".rstrip())
+        if self.rating is not None:
+            details.append(f"rated {self.rating:g}")
+        suffix = f" ({', '.join(details)})" if details else ""
+        return f"- {self.name}{suffix}: {self.snippet}"
+
+@dataclass(frozen=True, slots=True)
+class Attraction:
+    """
+    Historical or cultural place found in the city.
+    """
+    title: str
+    description: str
+    
+    @classmethod
+    def from_place(cls, place: Dict[str, Any]) -> "Attraction":
+        """
+        Build an attraction from a get_historical_places result entry.
+        
+        Args:
+            place: Place with title and snippet
+            
+        Returns:
+            Attraction record
+        """
+        return cls(title=place["title"], description=place.get("snippet", ""))
+
+@dataclass(frozen=True, slots=True)
+class RateTable:
+    """
+    Exchange rates from one base currency.
+    """
+    base: str
+    date: str
+    rates: Dict[str, float] = field(default_factory=dict)
+    
+    @classmethod
+    def from_tool_result(cls, result: Dict[str, Any]) -> "RateTable":
+        """
+        Build a rate table from a get_currency_rates result.
+        
+        Args:
+            result: Currency tool output with base, date and rates
+            
+        Returns:
+            Rate table record
+        """
+        return cls(base=result["base"], date=result["date"], rates=dict(result["rates"]))
+        
+    def summary(self) -> str:
+        """
+        Describe the rates in one line.
+        """
+        rates = ", ".join(f"{rate:g} {currency}" for currency, rate in self.rates.items())
+        return f"Exchange rates on {self.date}: 1 {self.base} = {rates}"
+        
+    def to_base(self, amount: float, currency: str) -> Optional[float]:
+        """
+        Convert an amount into the base currency.
+        
+        Args:
+            amount: Amount of money
+            currency: Currency code of the amount
+            
+        Returns:
+            Amount in the base currency, or None if the table has no rate for the currency
+        """
+        if currency == self.base:
+            return amount
+        rate = self.rates.get(currency)
+        return amount / rate if rate else None
+
+def describe_hotels(hotels: List[HotelEntry]) -> str:
+    """
+    List hotel entries, one line each.
+    
+    Args:
+        hotels: Hotel entries
+        
+    Returns:
+        Compact hotel list
+    """
+    return "\n".join(hotel.describe() for hotel in hotels)
+
+def _parse_price(text: str) -> Tuple[Optional[float], str]:
+    """Find the first price with a currency in a text."""
+    match = _PRICE_PATTERN.search(text)
+    if match is None:
+        return None, ""
+    if match.group("symbol"):
+        return float(match.group("symbol_amount").replace(",", "")), _CURRENCY_SYMBOLS[match.group("symbol")]
+    return float(match.group("amount").replace(",", "")), match.group("code")
+
+def _parse_rating(text: str) -> Optional[float]:
+    """Find the first rating or star class in a text."""
+    match = _RATING_PATTERN.search(text)
+    if match is None:
+        return None
+    if match.group("stars"):
+        return float(match.group("stars"))
+    return float(match.group("score"))
\ No newline at end of file
@@ -2,37 +2,120 @@
 State management for the Travel Planner application.
 Defines the structure of the state that flows through the workflow.
 """
-from typing import TypedDict, List, Dict, Any
+import operator
+from typing import Annotated, TypedDict, List, Dict, Any, Optional
+
+from ..utils.deadline import request_deadline
+
+def merge_dicts(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge a partial dictionary update into the current value.
+    
+    Used as a state reducer so nodes running in the same parallel step can
+    update dictionary fields without overwriting each other. An update of
+    None clears the field.
+    
+    Args:
+        left: Current value of the field
+        right: Partial update returned by a node, or None
+        
+    Returns:
+        New dictionary with the update applied
+    """
+    if right is None:
+        return {}
+    if not right:
+        return left or {}
+    return {**(left or {}), **right}
+
+def add_sections(left: List[str], right: Optional[List[str]]) -> List[str]:
+    """
+    Append degraded sections to the current list.
+    
+    An update of None clears the list, so a resumed run can retry the
+    sections it was written without.
+    
+    Args:
+        left: Current value of the field
+        right: Sections returned by a node, or None
+        
+    Returns:
+        New list with the update applied
+    """
+    if right is None:
+        return []
+    return (left or []) + right
 
 class TravelState(TypedDict):
     """
     State structure to maintain data flow between agents.
     
+    Fields written by the parallel research nodes carry reducers so that
+    concurrent updates are merged instead of raising a conflict. Next to the
+    agents' prose, they hold compact records of the tool results (see
+    state.records): weather_info["day_forecasts"], hotel_info["hotels"],
+    city_info["places"] and budget_info["rate_table"].
+    
+    A research section that ran out of time or failed holds a "degraded"
+    reason instead, and its node is listed in degraded_sections.
+    
+    A trip visiting several cities lists them in stops; the research of each
+    stop is kept in city_results under the stop's city, with the same
+    weather_info, city_info and hotel_info fields as a single-city trip.
+    
     Attributes:
         messages: Store conversation messages
         city: Target city for travel
-        travel_date: Travel date in YYYY-MM-DD format
+        travel_date: Travel date (first day of the trip) in YYYY-MM-DD format
+        end_date: Last day of the trip in YYYY-MM-DD format, empty for a one-day trip
+        origin: Departure city or country, empty if not mentioned
+        party_size: Number of travellers, 0 if not mentioned
+        nights: Number of nights to stay, 0 if not mentioned
+        local_currency: Currency code used at the destination, empty if unknown
+        home_currency: Currency code used at the origin, empty if unknown
+        stops: Cities of a multi-city trip in visiting order, each with its
+            city, travel_date, end_date, nights and local_currency; empty for
+            a single-city trip
+        city_results: Research sections of each stop, keyed by city
         weather_info: Weather data and clothing recommendations
         hotel_info: Hotel search results
         city_info: City attractions and historical places
         budget_info: Currency exchange and budget breakdown
+        context_budget: Prompt token counts before and after budgeting, per node
         travel_plan: Final compiled travel plan
+        plan_cache_hit: Whether the travel plan came from the plan cache
+        deadline: Wall-clock time (time.time()) the request must finish by, 0.0 for none
+        degraded_sections: Research nodes whose section was left out of the plan
     """
-    messages: List[Any]            # Store conversation messages
-    city: str                      # Target city for travel
-    travel_date: str               # Travel date in YYYY-MM-DD format
-    weather_info: Dict[str, Any]   # Weather data and clothing recommendations
-    hotel_info: Dict[str, Any]     # Hotel search results
-    city_info: Dict[str, Any]      # City attractions and historical places
-    budget_info: Dict[str, Any]    # Currency exchange and budget breakdown
-    travel_plan: str               # Final travel plan
+    messages: Annotated[List[Any], operator.add]          # Store conversation messages
+    city: str                                             # Target city for travel
+    travel_date: str                                      # Travel date in YYYY-MM-DD format
+    end_date: str                                         # Last day of the trip, empty for one day
+    origin: str                                           # Departure city or country
+    party_size: int                                       # Number of travellers
+    nights: int                                           # Number of nights to stay
+    local_currency: str                                   # Currency code used at the destination
+    home_currency: str                                    # Currency code used at the origin
+    stops: List[Dict[str, Any]]                           # Cities of a multi-city trip
+    city_results: Annotated[Dict[str, Dict[str, Any]], merge_dicts]  # Research sections per stop
+    weather_info: Annotated[Dict[str, Any], merge_dicts]  # Weather data and clothing recommendations
+    hotel_info: Annotated[Dict[str, Any], merge_dicts]    # Hotel search results
+    city_info: Annotated[Dict[str, Any], merge_dicts]     # City attractions and historical places
+    budget_info: Annotated[Dict[str, Any], merge_dicts]   # Currency exchange and budget breakdown
+    context_budget: Annotated[Dict[str, Any], merge_dicts]  # Prompt tokens saved per node
+    travel_plan: str                                      # Final travel plan
+    plan_cache_hit: bool                                  # Travel plan reused from the plan cache
+    deadline: float                                       # Time the request must finish by
+    degraded_sections: Annotated[List[str], add_sections]  # Research nodes cut off or failed
 
-def create_initial_state(user_query: str) -> TravelState:
+def create_initial_state(user_query: str, deadline_seconds: Optional[float] = None) -> TravelState:
     """
     Create an initial state with a user query.
     
     Args:
         user_query: Initial user query to start the workflow
+        deadline_seconds: Time the request may take, defaults to
+            REQUEST_DEADLINE_SECONDS (0 for no deadline)
         
     Returns:
         TravelState with initialized empty values
@@ -43,9 +126,21 @@ def create_initial_state(user_query: str) -> TravelState:
         "messages": [HumanMessage(content=user_query)],
         "city": "",
         "travel_date": "",
+        "end_date": "",
+        "origin": "",
+        "party_size": 0,
+        "nights": 0,
+        "local_currency": "",
+        "home_currency": "",
+        "stops": [],
+        "city_results": {},
         "weather_info": {},
         "city_info": {},
         "hotel_info": {},
         "budget_info": {},
-        "travel_plan": ""
+        "context_budget": {},
+        "travel_plan": "",
+        "plan_cache_hit": False,
+        "deadline": request_deadline(deadline_seconds),
+        "degraded_sections": []
     }
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+Structured trip details extracted from the user's request.
+Defines the validated schema returned by the extraction LLM call.
+"""
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from ..utils.date_utils import parse_date
+
+def _clean_city(value: str) -> str:
+    """Normalize surrounding whitespace and punctuation in a city name."""
+    city = value.strip().strip(".,;:!?\"'")
+    if not city:
+        raise ValueError("city must not be empty")
+    return city
+
+def _clean_currency(value: Optional[str]) -> Optional[str]:
+    """Keep only well-formed three-letter currency codes."""
+    if value is None:
+        return None
+    code = value.strip().upper()
+    return code if len(code) == 3 and code.isalpha() else None
+
+def _clean_date(value: Optional[str]) -> Optional[str]:
+    """
+    Keep only real YYYY-MM-DD dates.
+    
+    A malformed date becomes None instead of failing the whole extraction;
+    the date fast path or the missing information check handles it.
+    """
+    if value is None or not value.strip():
+        return None
+    try:
+        return parse_date(value.strip()).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+class TripStop(BaseModel):
+    """
+    One city of a trip visiting several cities.
+    """
+    city: str = Field(description="City name only, without country or extra text")
+    travel_date: Optional[str] = Field(
+        default=None,
+        description="First day in this city in YYYY-MM-DD format, or null if not mentioned"
+    )
+    end_date: Optional[str] = Field(
+        default=None,
+        description="Last day in this city in YYYY-MM-DD format, or null if not mentioned"
+    )
+    local_currency: Optional[str] = Field(
+        default=None,
+        description="ISO 4217 code of the currency used in this city, e.g. EUR"
+    )
+    
+    _strip_city = field_validator("city")(_clean_city)
+    _check_currency = field_validator("local_currency")(_clean_currency)
+    _check_dates = field_validator("travel_date", "end_date")(_clean_date)
+
+class TripDetails(BaseModel):
+    """
+    Trip slots mentioned in a travel planning request.
+    """
+    city: str = Field(description="Destination city name only, without country or extra text")
+    travel_date: Optional[str] = Field(
+        default=None,
+        description="Travel date (first day of the trip) in YYYY-MM-DD format, or null if no date is mentioned"
+    )
+    end_date: Optional[str] = Field(
+        default=None,
+        description="Last day of the trip in YYYY-MM-DD format if a date range or trip length is mentioned, otherwise null"
+    )
+    origin: Optional[str] = Field(
+        default=None,
+        description="City or country the traveller departs from, or null if not mentioned"
+    )
+    party_size: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Number of travellers, or null if not mentioned"
+    )
+    nights: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Number of nights to stay, or null if not mentioned"
+    )
+    local_currency: Optional[str] = Field(
+        default=None,
+        description="ISO 4217 code of the currency used in the destination city, e.g. EUR"
+    )
+    home_currency: Optional[str] = Field(
+        default=None,
+        description="ISO 4217 code of the currency used at the origin, or null if the origin is not mentioned"
+    )
+    stops: Optional[List[TripStop]] = Field(
+        default=None,
+        description="Every city of a trip visiting more than one city, in visiting order; null for a single-city trip"
+    )
+    
+    _strip_city = field_validator("city")(_clean_city)
+    _check_currency = field_validator("local_currency", "home_currency")(_clean_currency)
+    _check_travel_date = field_validator("travel_date", "end_date")(_clean_date)
\ No newline at end of file
@@ -1,15 +1,33 @@
 """
 Currency exchange rate tool using exchangerate-api.com.
 Provides current exchange rates between currencies.
+
+A single rate table (all currencies against EXCHANGE_RATE_TABLE_BASE) is
+cached until the upstream's next scheduled update, and rates for any base
+currency are derived from it as cross rates.
 """
-import requests
+import time
 from typing import Dict, Any, Union, List, Optional
 
-from langchain_core.tools import tool
-from ..config.settings import get_exchange_rate_api_key
+import httpx
+from langchain_core.tools import StructuredTool
+from ..config.settings import (
+    get_exchange_rate_api_key,
+    EXCHANGE_RATE_TABLE_BASE,
+    EXCHANGE_RATE_MIN_REFRESH_SECONDS
+)
+from ..utils.cache import TTLCache
+from ..utils.http import get_http_client, get_async_http_client
+from ..utils.singleflight import SingleFlight, AsyncSingleFlight
+
+# Latest rate table, kept until the upstream publishes new rates
+rate_table_cache = TTLCache("exchange_rate_table", EXCHANGE_RATE_MIN_REFRESH_SECONDS, max_entries=1)
+
+# Concurrent callers share a single table refresh
+_refresh_flight = SingleFlight("exchange_rate_refresh")
+_async_refresh_flight = AsyncSingleFlight("exchange_rate_refresh_async")
 
-@tool
-def get_currency_rates(base_currency: str = 'TRY', target_currencies: Optional[Union[str, List[str]]] = None) -> Dict[str, Any]:
+def fetch_currency_rates(base_currency: str = 'TRY', target_currencies: Optional[Union[str, List[str]]] = None) -> Dict[str, Any]:
     """
     Fetches currency exchange rate information.
     
@@ -21,48 +39,183 @@ def get_currency_rates(base_currency: str = 'TRY', target_currencies: Optional[U
     Returns:
         Dictionary containing exchange rate data
     """
-    api_key = get_exchange_rate_api_key()
+    try:
+        table = rate_table_cache.get(EXCHANGE_RATE_TABLE_BASE)
+        if table is None:
+            table = _refresh_flight.do(EXCHANGE_RATE_TABLE_BASE, _download_rate_table)
+        return _build_rates_result(table, base_currency, target_currencies)
+        
+    except httpx.HTTPError as e:
+        return _error_result(f"Error fetching currency rates: {str(e)}", base_currency)
+    except Exception as e:
+        return _error_result(f"Unexpected error: {str(e)}", base_currency)
+
+async def afetch_currency_rates(base_currency: str = 'TRY', target_currencies: Optional[Union[str, List[str]]] = None) -> Dict[str, Any]:
+    """
+    Asynchronously fetches currency exchange rate information.
     
+    Args:
+        base_currency: The base currency code (e.g., 'USD', 'EUR', default 'TRY')
+        target_currencies: The target currency code(s) to convert to
+            Can be a single currency code string or a list of currency codes
+            
+    Returns:
+        Dictionary containing exchange rate data
+    """
     try:
-        # Build the URL with the API key and base currency
-        url = f"https://v6.exchangerate-api.com/v6/{api_key}/latest/{base_currency}"
+        table = rate_table_cache.get(EXCHANGE_RATE_TABLE_BASE)
+        if table is None:
+            table = await _async_refresh_flight.do(EXCHANGE_RATE_TABLE_BASE, _adownload_rate_table)
+        return _build_rates_result(table, base_currency, target_currencies)
         
-        # Fetch data from the API
-        response = requests.get(url)
+    except httpx.HTTPError as e:
+        return _error_result(f"Error fetching currency rates: {str(e)}", base_currency)
+    except Exception as e:
+        return _error_result(f"Unexpected error: {str(e)}", base_currency)
+
+# Tool exposing both the sync and async implementations to agents
+get_currency_rates = StructuredTool.from_function(
+    func=fetch_currency_rates,
+    coroutine=afetch_currency_rates,
+    name="get_currency_rates"
+)
+
+def _latest_rates_url(base_currency: str) -> str:
+    """
+    Build the URL with the API key and base currency.
+    
+    Args:
+        base_currency: The base currency code
         
-        # Check if the response is successful
-        response.raise_for_status()
+    Returns:
+        Latest rates endpoint URL
+    """
+    return f"https://v6.exchangerate-api.com/v6/{get_exchange_rate_api_key()}/latest/{base_currency}"
+
+def _download_rate_table() -> Dict[str, Any]:
+    """
+    Download and cache the rate table for the table base currency.
+    
+    Returns:
+        Parsed rate table
+    """
+    response = get_http_client().get(_latest_rates_url(EXCHANGE_RATE_TABLE_BASE))
+    return _store_rate_table(response)
+
+async def _adownload_rate_table() -> Dict[str, Any]:
+    """
+    Asynchronously download and cache the rate table for the table base currency.
+    
+    Returns:
+        Parsed rate table
+    """
+    response = await get_async_http_client().get(_latest_rates_url(EXCHANGE_RATE_TABLE_BASE))
+    return _store_rate_table(response)
+
+def _store_rate_table(response: httpx.Response) -> Dict[str, Any]:
+    """
+    Parse a latest rates API response and cache it until the next upstream update.
+    
+    Args:
+        response: Exchange rate API response
         
-        # Parse the JSON response
-        data = response.json()
+    Returns:
+        Parsed rate table
+    """
+    # Check if the response is successful
+    response.raise_for_status()
+    
+    # Parse the JSON response
+    data = response.json()
+    
+    # Check if the API returned a successful response
+    if data.get('result') != 'success':
+        error_message = data.get('error-type', data.get('error', 'Unknown error'))
+        raise Exception(f"API Error: {error_message}")
+    
+    table = {
+        'base': data.get('base_code', EXCHANGE_RATE_TABLE_BASE),
+        'date': data['time_last_update_utc'],
+        'rates': data['conversion_rates']
+    }
+    
+    # Keep the table until the upstream publishes new rates
+    next_update = data.get('time_next_update_unix')
+    ttl_seconds = EXCHANGE_RATE_MIN_REFRESH_SECONDS
+    if next_update:
+        ttl_seconds = max(next_update - time.time(), EXCHANGE_RATE_MIN_REFRESH_SECONDS)
+    rate_table_cache.set(EXCHANGE_RATE_TABLE_BASE, table, ttl_seconds=ttl_seconds)
+    
+    return table
+
+def _build_rates_result(
+    table: Dict[str, Any],
+    base_currency: str,
+    target_currencies: Optional[Union[str, List[str]]]
+) -> Dict[str, Any]:
+    """
+    Derive the rates for a base currency from the cached table.
+    
+    Args:
+        table: Parsed rate table
+        base_currency: The base currency code
+        target_currencies: Target currency code(s) to filter for
         
-        # Check if the API returned a successful response
-        if data.get('result') != 'success':
-            error_message = data.get('error', 'Unknown error')
-            raise Exception(f"API Error: {error_message}")
-            
-        # Filter rates if target currencies are specified
-        rates = _filter_rates(data['conversion_rates'], target_currencies)
+    Returns:
+        Dictionary containing exchange rate data
+    """
+    base_currency = base_currency.upper()
+    table_rates = table['rates']
+    
+    if base_currency not in table_rates:
+        return _error_result(f"Unsupported currency: {base_currency}", base_currency)
+    
+    # Filter rates if target currencies are specified
+    filtered = _filter_rates(table_rates, _normalize_currencies(target_currencies))
+    
+    # Convert from the table base to the requested base (6 significant digits)
+    base_rate = table_rates[base_currency]
+    rates = {currency: float(f"{rate / base_rate:.6g}") for currency, rate in filtered.items()}
+    
+    # Return only the needed information
+    return {
+        'base': base_currency,
+        'date': table['date'],
+        'rates': rates
+    }
+
+def _normalize_currencies(target_currencies: Optional[Union[str, List[str]]]) -> Optional[Union[str, List[str]]]:
+    """
+    Upper-case requested currency codes.
+    
+    Args:
+        target_currencies: Target currency code(s)
         
-        # Return only the needed information
-        return {
-            'base': base_currency,
-            'date': data['time_last_update_utc'],
-            'rates': rates
-        }
+    Returns:
+        Target currency code(s) in upper case
+    """
+    if isinstance(target_currencies, str):
+        return target_currencies.upper()
+    if target_currencies:
+        return [currency.upper() for currency in target_currencies]
+    return target_currencies
+
+def _error_result(message: str, base_currency: str) -> Dict[str, Any]:
+    """
+    Build the tool result returned when rates cannot be fetched.
+    
+    Args:
+        message: Error description
+        base_currency: The base currency code
         
-    except requests.exceptions.RequestException as e:
-        return {
-            'error': f"Error fetching currency rates: {str(e)}",
-            'base': base_currency,
-            'rates': {}
-        }
-    except Exception as e:
-        return {
-            'error': f"Unexpected error: {str(e)}",
-            'base': base_currency,
-            'rates': {}
-        }
+    Returns:
+        Dictionary with the error and no rates
+    """
+    return {
+        'error': message,
+        'base': base_currency,
+        'rates': {}
+    }
 
 def _filter_rates(
     rates: Dict[str, float], 
@@ -2,21 +2,97 @@
 Historical places tool using Wikipedia API.
 Finds historical and cultural attractions in a specified city.
 """
-import requests
-from typing import List, Dict, Any, Optional
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Set
 
-from langchain_core.tools import tool
+import httpx
+from langchain_core.tools import StructuredTool
+from ..config.settings import WIKI_SEARCH_MAX_WORKERS
+from ..utils.cache import normalize_city
+from ..utils.http import get_http_client, get_async_http_client
+from ..utils.persistent_cache import city_cache
+from ..utils.singleflight import SingleFlight, AsyncSingleFlight
 
-@tool
-def get_historical_places(city_name: str, limit: int = 10, language: str = "en") -> List[Dict[str, str]]:
+# Persistent cache namespace for raw search results
+PLACES_CACHE_NAMESPACE = "historical_places"
+
+# Worker threads shared by all sync searches
+_search_executor = ThreadPoolExecutor(max_workers=WIKI_SEARCH_MAX_WORKERS, thread_name_prefix="wiki-search")
+
+# Concurrent lookups for the same city share a single set of searches
+_search_flight = SingleFlight("historical_places_search")
+_async_search_flight = AsyncSingleFlight("historical_places_search_async")
+
+def fetch_historical_places(city_name: str, limit: int = 10, language: str = "en") -> List[Dict[str, str]]:
     """
     Fetches historical places in the specified city using the Wikipedia API.
     
+    All search queries run concurrently; their results are merged in query
+    priority order, so deduplication and the limit behave as if they had run
+    one after another.
+    
+    Args:
+        city_name: Name of the city to search for historical places
+        limit: Maximum number of results to return (default: 10)
+        language: Wikipedia language code (default: "en" - English)
+        
+    Returns:
+        List of historical places information
+    """
+    # Serve from the persistent city cache when fresh
+    cached = _load_cached_places(city_name, limit, language)
+    if cached is not None:
+        return cached
+    
+    return _search_flight.do(
+        _places_cache_key(city_name, limit, language),
+        lambda: _search_places(city_name, limit, language)
+    )
+
+async def afetch_historical_places(city_name: str, limit: int = 10, language: str = "en") -> List[Dict[str, str]]:
+    """
+    Asynchronously fetches historical places in the specified city using the Wikipedia API.
+    
+    Queries run concurrently and are merged in priority order, like
+    fetch_historical_places; queries still running once the limit is reached
+    are cancelled.
+    
     Args:
         city_name: Name of the city to search for historical places
         limit: Maximum number of results to return (default: 10)
         language: Wikipedia language code (default: "en" - English)
         
+    Returns:
+        List of historical places information
+    """
+    # Serve from the persistent city cache when fresh, off the event loop
+    cached = await asyncio.to_thread(_load_cached_places, city_name, limit, language)
+    if cached is not None:
+        return cached
+    
+    return await _async_search_flight.do(
+        _places_cache_key(city_name, limit, language),
+        lambda: _asearch_places(city_name, limit, language)
+    )
+
+# Tool exposing both the sync and async implementations to agents
+get_historical_places = StructuredTool.from_function(
+    func=fetch_historical_places,
+    coroutine=afetch_historical_places,
+    name="get_historical_places"
+)
+
+def _search_places(city_name: str, limit: int, language: str) -> List[Dict[str, str]]:
+    """
+    Run the Wikipedia searches for a city and cache the merged places.
+    
+    Args:
+        city_name: Name of the city to search for historical places
+        limit: Maximum number of results to return
+        language: Wikipedia language code
+        
     Returns:
         List of historical places information
     """
@@ -26,41 +102,172 @@ def get_historical_places(city_name: str, limit: int = 10, language: str = "en")
     # Create search queries based on language
     search_queries = _generate_search_queries(city_name, language)
     
+    # Run all queries concurrently over the shared connection pool, under the caller's deadline
+    futures = [
+        _search_executor.submit(contextvars.copy_context().run, _execute_wiki_search, url, query, limit, language)
+        for query in search_queries
+    ]
+    
     all_results = []
     used_titles = set()  # Prevent duplicate titles
     
-    # Process each search query
-    for query in search_queries:
-        try:
-            results = _execute_wiki_search(url, query, limit, language)
+    try:
+        # Merge results in query priority order
+        for future in futures:
+            try:
+                results = future.result()
+            except httpx.HTTPError:
+                continue
+            except (KeyError, ValueError):
+                # Unexpected or non-JSON (e.g. truncated) response
+                continue
+                
+            # Exit if we've reached the limit
+            if _collect_places(results, city_name, limit, all_results, used_titles):
+                break
+    finally:
+        # Skip queries that have not started yet once we are done
+        for future in futures:
+            future.cancel()
             
-            # Process and filter results
-            for result in results:
-                if result["title"] in used_titles:
-                    continue
-                    
-                if _is_relevant_result(result, city_name):
-                    place = {
-                        "title": result["title"],
-                        "snippet": _clean_snippet(result["snippet"])
-                    }
-                    all_results.append(place)
-                    used_titles.add(result["title"])
-                    
-                    # Exit if we've reached the limit
-                    if len(all_results) >= limit:
-                        break
-                        
+    _store_places(city_name, limit, language, all_results)
+    return all_results
+
+async def _asearch_places(city_name: str, limit: int, language: str) -> List[Dict[str, str]]:
+    """
+    Asynchronously run the Wikipedia searches for a city and cache the merged places.
+    
+    Args:
+        city_name: Name of the city to search for historical places
+        limit: Maximum number of results to return
+        language: Wikipedia language code
+        
+    Returns:
+        List of historical places information
+    """
+    # Wikipedia API endpoint
+    url = f"https://{language}.wikipedia.org/w/api.php"
+    
+    # Create search queries based on language
+    search_queries = _generate_search_queries(city_name, language)
+    
+    # Run all queries concurrently on the event loop
+    tasks = [
+        asyncio.ensure_future(_aexecute_wiki_search(url, query, limit, language))
+        for query in search_queries
+    ]
+    
+    all_results = []
+    used_titles = set()  # Prevent duplicate titles
+    
+    try:
+        # Merge results in query priority order
+        for task in tasks:
+            try:
+                results = await task
+            except httpx.HTTPError:
+                continue
+            except (KeyError, ValueError):
+                # Unexpected or non-JSON (e.g. truncated) response
+                continue
+                
             # Exit if we've reached the limit
-            if len(all_results) >= limit:
+            if _collect_places(results, city_name, limit, all_results, used_titles):
                 break
+    finally:
+        # Cancel queries that are still running once we are done
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()  # Mark failures of unused queries as retrieved
                 
-        except requests.exceptions.RequestException as e:
-            continue
-        except KeyError:
+    await asyncio.to_thread(_store_places, city_name, limit, language, all_results)
+    return all_results
+
+def _places_cache_key(city_name: str, limit: int, language: str) -> str:
+    """
+    Build the persistent cache key for a historical places lookup.
+    
+    Args:
+        city_name: Name of the city
+        limit: Maximum number of results
+        language: Wikipedia language code
+        
+    Returns:
+        Cache key combining the normalized city, language and limit
+    """
+    return f"{normalize_city(city_name)}|{language}|{limit}"
+
+def _load_cached_places(city_name: str, limit: int, language: str) -> Optional[List[Dict[str, str]]]:
+    """
+    Load previously fetched historical places from the persistent city cache.
+    
+    Args:
+        city_name: Name of the city
+        limit: Maximum number of results
+        language: Wikipedia language code
+        
+    Returns:
+        Cached places, or None if the cache is disabled, empty or stale
+    """
+    if city_cache is None:
+        return None
+    return city_cache.get(PLACES_CACHE_NAMESPACE, _places_cache_key(city_name, limit, language))
+
+def _store_places(city_name: str, limit: int, language: str, places: List[Dict[str, str]]) -> None:
+    """
+    Store fetched historical places in the persistent city cache.
+    
+    Empty results are not stored, so a transient upstream failure is retried.
+    
+    Args:
+        city_name: Name of the city
+        limit: Maximum number of results
+        language: Wikipedia language code
+        places: Places to store
+    """
+    if city_cache is not None and places:
+        city_cache.set(PLACES_CACHE_NAMESPACE, _places_cache_key(city_name, limit, language), places)
+
+def _collect_places(
+    results: List[Dict[str, Any]],
+    city_name: str,
+    limit: int,
+    all_results: List[Dict[str, str]],
+    used_titles: Set[str]
+) -> bool:
+    """
+    Add relevant, previously unseen search results to the collected places.
+    
+    Args:
+        results: Raw search results for one query
+        city_name: City name to check relevance against
+        limit: Maximum number of places to collect
+        all_results: Places collected so far, extended in place
+        used_titles: Titles already collected, extended in place
+        
+    Returns:
+        True once the limit has been reached
+    """
+    # Process and filter results
+    for result in results:
+        if result["title"] in used_titles:
             continue
             
-    return all_results
+        if _is_relevant_result(result, city_name):
+            place = {
+                "title": result["title"],
+                "snippet": _clean_snippet(result["snippet"])
+            }
+            all_results.append(place)
+            used_titles.add(result["title"])
+            
+            # Exit if we've reached the limit
+            if len(all_results) >= limit:
+                break
+                
+    return len(all_results) >= limit
 
 def _generate_search_queries(city_name: str, language: str) -> List[str]:
     """
@@ -102,7 +309,39 @@ def _execute_wiki_search(url: str, query: str, limit: int, language: str) -> Lis
     Returns:
         List of search results
     """
-    params = {
+    response = get_http_client().get(url, params=_search_params(query, limit))
+    response.raise_for_status()
+    return _parse_search_response(response.json())
+
+async def _aexecute_wiki_search(url: str, query: str, limit: int, language: str) -> List[Dict[str, Any]]:
+    """
+    Asynchronously execute search against Wikipedia API.
+    
+    Args:
+        url: Wikipedia API URL
+        query: Search query
+        limit: Maximum results to return
+        language: Wikipedia language code
+        
+    Returns:
+        List of search results
+    """
+    response = await get_async_http_client().get(url, params=_search_params(query, limit))
+    response.raise_for_status()
+    return _parse_search_response(response.json())
+
+def _search_params(query: str, limit: int) -> Dict[str, Any]:
+    """
+    Build the Wikipedia search request parameters.
+    
+    Args:
+        query: Search query
+        limit: Maximum results to return
+        
+    Returns:
+        Query parameters for the search API
+    """
+    return {
         "action": "query",
         "format": "json",
         "list": "search",
@@ -110,11 +349,17 @@ def _execute_wiki_search(url: str, query: str, limit: int, language: str) -> Lis
         "srlimit": limit,
         "srprop": "snippet"
     }
+
+def _parse_search_response(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Extract search results from a Wikipedia API response.
     
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    data = response.json()
-    
+    Args:
+        data: Parsed JSON response
+        
+    Returns:
+        List of search results
+    """
     if "query" in data and "search" in data["query"]:
         return data["query"]["search"]
     return []
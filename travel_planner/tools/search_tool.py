@@ -2,13 +2,92 @@
 Search tool wrapper using Tavily Search API.
 Provides search capabilities for finding hotels and other information.
 """
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
 from langchain_community.tools.tavily_search import TavilySearchResults
+from langchain_core.callbacks import AsyncCallbackManagerForToolRun, CallbackManagerForToolRun
 from ..config.settings import get_tavily_api_key
+from ..utils.http import get_http_client, get_async_http_client
+from ..utils.singleflight import SingleFlight, AsyncSingleFlight
+
+# Tavily search endpoint
+SEARCH_URL = "https://api.tavily.com/search"
+
+# Concurrent identical searches share a single Tavily request
+_search_flight = SingleFlight("tavily_search")
+_async_search_flight = AsyncSingleFlight("tavily_search_async")
+
+class CoalescingTavilySearchResults(TavilySearchResults):
+    """
+    Tavily search tool whose concurrent identical queries share one request.
+    
+    Searches are sent through the shared HTTP clients, so they draw from the
+    Tavily request quota and concurrency limit and are retried with backoff
+    (honoring Retry-After) when Tavily rate limits them or is unavailable.
+    """
+    
+    def _run(
+        self,
+        query: str,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> Tuple[Union[List[Dict[str, str]], str], Dict]:
+        return _search_flight.do(self._flight_key(query), lambda: self._search(query))
+        
+    async def _arun(
+        self,
+        query: str,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> Tuple[Union[List[Dict[str, str]], str], Dict]:
+        return await _async_search_flight.do(self._flight_key(query), lambda: self._asearch(query))
+        
+    def _search(self, query: str) -> Tuple[Union[List[Dict[str, str]], str], Dict]:
+        """Run a search, returning the error text like the base tool on failure."""
+        try:
+            response = get_http_client().post(SEARCH_URL, json=self._search_params(query))
+            response.raise_for_status()
+            raw_results = response.json()
+        except Exception as e:
+            return repr(e), {}
+        return self.api_wrapper.clean_results(raw_results["results"]), raw_results
+        
+    async def _asearch(self, query: str) -> Tuple[Union[List[Dict[str, str]], str], Dict]:
+        """Run a search asynchronously, returning the error text on failure."""
+        try:
+            response = await get_async_http_client().post(SEARCH_URL, json=self._search_params(query))
+            response.raise_for_status()
+            raw_results = response.json()
+        except Exception as e:
+            return repr(e), {}
+        return self.api_wrapper.clean_results(raw_results["results"]), raw_results
+        
+    def _search_params(self, query: str) -> Dict[str, Any]:
+        """Request body of a search with the tool's options."""
+        return {
+            "api_key": self.api_wrapper.tavily_api_key.get_secret_value(),
+            "query": query,
+            "max_results": self.max_results,
+            "search_depth": self.search_depth,
+            "include_domains": self.include_domains,
+            "exclude_domains": self.exclude_domains,
+            "include_answer": self.include_answer,
+            "include_raw_content": self.include_raw_content,
+            "include_images": self.include_images,
+        }
+        
+    def _flight_key(self, query: str) -> Tuple[Any, ...]:
+        """Identify a search by the tool configuration and the normalized query."""
+        return id(self), " ".join(query.split()).casefold()
 
+@lru_cache(maxsize=None)
 def create_tavily_search_tool(max_results: int = 2) -> TavilySearchResults:
     """
     Create a Tavily search tool with specified parameters.
     
+    The tool is cached per configuration so agents built from it can be
+    shared through the agent registry, and so concurrent identical searches
+    made through it can share one request.
+    
     Args:
         max_results: Maximum number of search results to return
         
@@ -19,7 +98,7 @@ def create_tavily_search_tool(max_results: int = 2) -> TavilySearchResults:
     api_key = get_tavily_api_key()
     
     # Create and return the search tool
-    return TavilySearchResults(
+    return CoalescingTavilySearchResults(
         max_results=max_results,
         api_key=api_key
     )
\ No newline at end of file
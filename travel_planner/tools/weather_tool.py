@@ -1,86 +1,218 @@
 """
 Weather forecast tool using OpenWeatherMap API.
-Provides weather information for a specific city and date.
+Provides weather information for a specific city and date or date range.
 """
-import requests
 from datetime import datetime
-from typing import Dict, Any, Union, List
+from typing import Dict, Any, Optional, Union, List
 
-from langchain_core.tools import tool
-from ..config.settings import get_openweather_api_key
+import httpx
+from langchain_core.tools import StructuredTool
+from ..config.settings import get_openweather_api_key, WEATHER_CACHE_TTL_SECONDS
+from ..utils.cache import TTLCache, normalize_city
+from ..utils.date_utils import trip_dates
+from ..utils.http import get_http_client, get_async_http_client
+from ..utils.singleflight import SingleFlight, AsyncSingleFlight
 
-@tool
-def get_weather(city: str, date: str) -> Union[Dict[str, Any], str]:
+FORECAST_URL = "https://api.openweathermap.org/data/2.5/forecast"
+
+# Parsed 5-day forecasts keyed by normalized city name
+forecast_cache = TTLCache("weather_forecast", WEATHER_CACHE_TTL_SECONDS)
+
+# Concurrent lookups for the same city share a single forecast download
+_forecast_flight = SingleFlight("weather_forecast_download")
+_async_forecast_flight = AsyncSingleFlight("weather_forecast_download_async")
+
+class ForecastError(Exception):
+    """Raised when the forecast API returns an error response."""
+
+def fetch_weather(city: str, date: str, end_date: Optional[str] = None) -> Union[Dict[str, Any], str]:
+    """
+    Retrieves weather forecast for a specified city and date, or for every day of a trip.
+    
+    Args:
+        city: The name of the city for which weather information is requested
+        date: The date, or the first day of the trip, in "YYYY-MM-DD" format
+        end_date: The last day of the trip in "YYYY-MM-DD" format, for trips longer than one day
+        
+    Returns:
+        Dict with weather information or error message string
+    """
+    try:
+        forecast = forecast_cache.get(normalize_city(city))
+        if forecast is None:
+            forecast = _forecast_flight.do(normalize_city(city), lambda: _download_forecast(city))
+        return _build_weather_result(forecast, date, end_date)
+        
+    except ForecastError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        return f"An error occurred: {str(e)}"
+
+async def afetch_weather(city: str, date: str, end_date: Optional[str] = None) -> Union[Dict[str, Any], str]:
     """
-    Retrieves weather forecast for a specified city and date.
+    Asynchronously retrieves weather forecast for a specified city and date, or for every day of a trip.
     
     Args:
         city: The name of the city for which weather information is requested
-        date: The date in "YYYY-MM-DD" format
+        date: The date, or the first day of the trip, in "YYYY-MM-DD" format
+        end_date: The last day of the trip in "YYYY-MM-DD" format, for trips longer than one day
         
     Returns:
         Dict with weather information or error message string
     """
-    url = "https://api.openweathermap.org/data/2.5/forecast"
-    api_key = get_openweather_api_key()
+    try:
+        forecast = forecast_cache.get(normalize_city(city))
+        if forecast is None:
+            forecast = await _async_forecast_flight.do(normalize_city(city), lambda: _adownload_forecast(city))
+        return _build_weather_result(forecast, date, end_date)
+        
+    except ForecastError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        return f"An error occurred: {str(e)}"
+
+# Tool exposing both the sync and async implementations to agents
+get_weather = StructuredTool.from_function(
+    func=fetch_weather,
+    coroutine=afetch_weather,
+    name="get_weather"
+)
+
+def _download_forecast(city: str) -> Dict[str, Any]:
+    """
+    Download and cache the forecast for a city.
+    
+    Args:
+        city: The name of the city
+        
+    Returns:
+        Parsed forecast with slots grouped by date
+    """
+    # Make API request
+    response = get_http_client().get(FORECAST_URL, params=_forecast_params(city))
+    return _store_forecast(city, response)
+
+async def _adownload_forecast(city: str) -> Dict[str, Any]:
+    """
+    Asynchronously download and cache the forecast for a city.
+    
+    Args:
+        city: The name of the city
+        
+    Returns:
+        Parsed forecast with slots grouped by date
+    """
+    # Make API request
+    response = await get_async_http_client().get(FORECAST_URL, params=_forecast_params(city))
+    return _store_forecast(city, response)
+
+def _forecast_params(city: str) -> Dict[str, Any]:
+    """
+    Build the OpenWeather forecast request parameters.
     
-    # API parameters
-    params = {
+    Args:
+        city: The name of the city
+        
+    Returns:
+        Query parameters for the forecast endpoint
+    """
+    return {
         "q": city,
-        "appid": api_key,
+        "appid": get_openweather_api_key(),
         "units": "metric",
         "cnt": 40  # Retrieves data in 3-hour intervals for up to 5 days
     }
+
+def _store_forecast(city: str, response: httpx.Response) -> Dict[str, Any]:
+    """
+    Parse a successful forecast response and cache it for the city.
     
-    try:
-        # Make API request
-        response = requests.get(url, params=params)
-        data = response.json()
+    Args:
+        city: The name of the city that was requested
+        response: Forecast API response
         
-        if response.status_code == 200:
-            # Filter forecasts for the requested date
-            selected_date_weather = _extract_date_forecasts(data, date)
-            
-            if selected_date_weather:
-                return {
-                    'City': data['city']['name'],
-                    'Date': date,
-                    'Forecasts': selected_date_weather
-                }
-            else:
-                return f"No weather data found for {date}."
-                
-        else:
-            return f"Error: {data.get('message', 'Unknown error')}"
-            
-    except Exception as e:
-        return f"An error occurred: {str(e)}"
+    Returns:
+        Parsed forecast with slots grouped by date
+        
+    Raises:
+        ForecastError: If the API returned an error
+    """
+    data = response.json()
+    
+    if response.status_code != 200:
+        raise ForecastError(data.get('message', 'Unknown error'))
+    
+    forecast = {
+        'city': data['city']['name'],
+        'dates': _group_forecasts_by_date(data)
+    }
+    forecast_cache.set(normalize_city(city), forecast)
+    return forecast
+
+def _build_weather_result(forecast: Dict[str, Any], date: str,
+                          end_date: Optional[str] = None) -> Union[Dict[str, Any], str]:
+    """
+    Slice the tool result for one date or a date range out of a parsed forecast.
+    
+    A range is answered from the same downloaded forecast: Days maps each
+    date with forecasts to its slots, and Missing lists the dates beyond
+    the 5-day forecast.
+    
+    Args:
+        forecast: Parsed forecast with slots grouped by date
+        date: Date (or first day) to return forecasts for (YYYY-MM-DD)
+        end_date: Last day to return forecasts for (YYYY-MM-DD), if a range
+        
+    Returns:
+        Dict with weather information or error message string
+    """
+    if end_date and end_date != date:
+        dates = trip_dates(date, end_date)
+        days = {day: forecast['dates'][day] for day in dates if forecast['dates'].get(day)}
+        if not days:
+            return f"No weather data found from {date} to {end_date}."
+        return {
+            'City': forecast['city'],
+            'Date': date,
+            'EndDate': end_date,
+            'Days': days,
+            'Missing': [day for day in dates if day not in days]
+        }
+        
+    # Filter forecasts for the requested date
+    selected_date_weather = forecast['dates'].get(date)
+    
+    if selected_date_weather:
+        return {
+            'City': forecast['city'],
+            'Date': date,
+            'Forecasts': selected_date_weather
+        }
+    else:
+        return f"No weather data found for {date}."
 
-def _extract_date_forecasts(data: Dict[str, Any], target_date: str) -> List[Dict[str, Any]]:
+def _group_forecasts_by_date(data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
     """
-    Extract forecasts for a specific date from weather data.
+    Group all forecast data points by date.
     
     Args:
         data: Weather API response data
-        target_date: Date to filter forecasts for (YYYY-MM-DD)
         
     Returns:
-        List of forecast data points for the target date
+        Forecast data points keyed by date (YYYY-MM-DD)
     """
-    forecast_list = data['list']
-    selected_date_weather = []
+    forecasts_by_date: Dict[str, List[Dict[str, Any]]] = {}
     
-    for forecast in forecast_list:
-        forecast_time = datetime.utcfromtimestamp(forecast['dt']).strftime('%Y-%m-%d')
+    for forecast in data['list']:
+        forecast_time = datetime.utcfromtimestamp(forecast['dt'])
+        
+        forecasts_by_date.setdefault(forecast_time.strftime('%Y-%m-%d'), []).append({
+            'time': forecast_time.strftime('%H:%M'),
+            'temperature': forecast['main']['temp'],
+            'wind_speed': forecast['wind']['speed'],
+            'rain_probability': forecast.get('clouds', {}).get('all', 0),
+            'weather_main': forecast.get('weather', [{}])[0].get('main', ''),
+            'weather_description': forecast.get('weather', [{}])[0].get('description', '')
+        })
         
-        if forecast_time == target_date:
-            selected_date_weather.append({
-                'time': datetime.utcfromtimestamp(forecast['dt']).strftime('%H:%M'),
-                'temperature': forecast['main']['temp'],
-                'wind_speed': forecast['wind']['speed'],
-                'rain_probability': forecast.get('clouds', {}).get('all', 0),
-                'weather_main': forecast.get('weather', [{}])[0].get('main', ''),
-                'weather_description': forecast.get('weather', [{}])[0].get('description', '')
-            })
-            
-    return selected_date_weather
\ No newline at end of file
+    return forecasts_by_date
\ No newline at end of file
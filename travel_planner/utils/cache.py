@@ -0,0 +1,130 @@
+"""
+In-memory caches.
+Provides a thread-safe TTL cache with hit and miss counters.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+# Named caches, so their counters can be collected in one place
+_caches: Dict[str, Any] = {}
+
+def normalize_city(city: str) -> str:
+    """
+    Normalize a city name for use in cache keys.
+    
+    Args:
+        city: The name of the city
+        
+    Returns:
+        Case-folded city name with collapsed whitespace
+    """
+    return " ".join(city.split()).casefold()
+
+def register_cache(name: str, cache: Any) -> None:
+    """
+    Register a cache so its counters are included in cache_stats().
+    
+    Args:
+        name: Unique cache name
+        cache: Object with a stats() method returning a dictionary of counters
+    """
+    _caches[name] = cache
+
+class TTLCache:
+    """
+    Thread-safe key-value cache whose entries expire after a fixed time.
+    
+    Entries are evicted lazily when read after expiry, and the oldest entry is
+    dropped when the cache is full.
+    """
+    
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int = 1024):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        register_cache(name, self)
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value and record a hit or miss.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store a value.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Lifetime of this entry, defaults to the cache TTL
+        """
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def expires_in(self, key: Hashable) -> Optional[float]:
+        """
+        Get how long an entry stays fresh, without counting a hit or miss.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Seconds until the entry expires, or None if it is missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            remaining = entry[0] - time.monotonic() if entry is not None else 0.0
+            return remaining if remaining > 0 else None
+    
+    def clear(self) -> None:
+        """
+        Drop all entries and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters.
+        
+        Returns:
+            Dictionary with hits, misses and current size
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Get the counters of every named cache in the process.
+    
+    Returns:
+        Counters keyed by cache name
+    """
+    return {name: cache.stats() for name, cache in _caches.items()}
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""
+Prompt context budgeting.
+Measures the size of prompt sections and compresses them to fit a token budget.
+"""
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Rough characters per token of English text, used instead of a model tokenizer
+CHARS_PER_TOKEN = 4
+
+# Units of text that carry facts the planner needs (numbers, prices, list items)
+_FACT_PATTERN = re.compile(r"\d|[$€£₺¥%°]|\b[A-Z]{3}\b")
+_LIST_ITEM_PATTERN = re.compile(r"^\s*(?:[-*•#]|\d+[.)])")
+_SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+# Longest unit of text kept or dropped as a whole during compression
+_MAX_UNIT_TOKENS = 60
+
+@dataclass
+class BudgetReport:
+    """
+    Token counts of a prompt before and after budgeting.
+    
+    Attributes:
+        budget: Token budget the sections had to fit
+        sections: (original, final) estimated tokens per section
+    """
+    budget: int
+    sections: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    
+    @property
+    def original_tokens(self) -> int:
+        return sum(original for original, _ in self.sections.values())
+        
+    @property
+    def final_tokens(self) -> int:
+        return sum(final for _, final in self.sections.values())
+        
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.final_tokens
+        
+    def as_dict(self) -> Dict[str, int]:
+        """
+        Summarize the report for the workflow state.
+        
+        Returns:
+            Budget, original, final and saved token counts
+        """
+        return {
+            "budget": self.budget,
+            "original_tokens": self.original_tokens,
+            "final_tokens": self.final_tokens,
+            "tokens_saved": self.tokens_saved
+        }
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+    
+    Args:
+        text: Text to measure
+        
+    Returns:
+        Estimated token count
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def compress_text(text: str, max_tokens: int) -> str:
+    """
+    Shorten a text to a token budget by keeping its most informative lines.
+    
+    Lines and sentences containing numbers, prices, currencies or list
+    markers are kept first; the kept units stay in their original order.
+    
+    Args:
+        text: Text to compress
+        max_tokens: Token budget
+        
+    Returns:
+        Text within the budget (unchanged if it already fits)
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+        
+    units = _split_units(text)
+    ranked = sorted(range(len(units)), key=lambda index: (-_unit_score(units[index]), index))
+    kept = set()
+    used = 0
+    for index in ranked:
+        # Every kept unit costs its own tokens plus a line break
+        cost = estimate_tokens(units[index]) + 1
+        if used + cost <= max_tokens:
+            kept.add(index)
+            used += cost
+            
+    return "\n".join(units[index] for index in sorted(kept))
+
+def fit_sections(
+    sections: Dict[str, str],
+    budget: int,
+    key_facts: Optional[Dict[str, str]] = None
+) -> Tuple[Dict[str, str], BudgetReport]:
+    """
+    Fit prompt sections into a shared token budget.
+    
+    Sections smaller than an equal share of the budget are kept as they are,
+    and their unused share goes to the larger ones. A section over its share
+    is replaced by its key facts (if given) followed by the most informative
+    part of its text that still fits. Key facts longer than the share are
+    compressed as well, so the fitted sections never exceed the budget.
+    
+    Args:
+        sections: Section texts keyed by section name
+        budget: Total token budget of all sections
+        key_facts: Compact structured facts per section that must survive compression
+        
+    Returns:
+        Fitted section texts and a report of the tokens per section
+    """
+    key_facts = key_facts or {}
+    sizes = {name: estimate_tokens(text) for name, text in sections.items()}
+    allocations = _allocate(sizes, budget)
+    
+    fitted = {}
+    report = BudgetReport(budget)
+    for name, text in sections.items():
+        allocation = allocations[name]
+        if sizes[name] <= allocation:
+            fitted[name] = text
+        else:
+            facts = key_facts.get(name, "")
+            if estimate_tokens(facts) > allocation:
+                # Keep the most informative facts when they alone overflow the share
+                facts = compress_text(facts, allocation)
+            remaining = allocation - estimate_tokens(facts) - 1
+            body = compress_text(text, remaining) if remaining > 0 else ""
+            fitted[name] = "\n".join(part for part in (facts, body) if part)
+        report.sections[name] = (sizes[name], estimate_tokens(fitted[name]))
+        
+    return fitted, report
+
+def _allocate(sizes: Dict[str, int], budget: int) -> Dict[str, int]:
+    """
+    Split a budget between sections, giving small sections what they need.
+    """
+    allocations = {}
+    pending = sorted(sizes, key=lambda name: sizes[name])
+    remaining = budget
+    while pending:
+        share = remaining // len(pending)
+        name = pending[0]
+        if sizes[name] > share:
+            break
+        allocations[name] = sizes[name]
+        remaining -= sizes[name]
+        pending.pop(0)
+    for name in pending:
+        allocations[name] = remaining // len(pending)
+    return allocations
+
+def _split_units(text: str) -> List[str]:
+    """
+    Split text into lines, long prose lines into sentences, and overlong
+    sentences into word chunks of at most _MAX_UNIT_TOKENS.
+    """
+    units = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if _LIST_ITEM_PATTERN.match(line) or estimate_tokens(line) <= _MAX_UNIT_TOKENS:
+            sentences = [line]
+        else:
+            sentences = [sentence for sentence in _SENTENCE_SPLIT_PATTERN.split(line) if sentence]
+        for sentence in sentences:
+            units.extend(_word_chunks(sentence))
+    return units
+
+def _word_chunks(unit: str) -> List[str]:
+    """
+    Split a unit into word chunks of at most _MAX_UNIT_TOKENS.
+    """
+    if estimate_tokens(unit) <= _MAX_UNIT_TOKENS:
+        return [unit]
+    chunks = []
+    current: List[str] = []
+    length = 0
+    for word in unit.split():
+        if current and length + len(word) + 1 > _MAX_UNIT_TOKENS * CHARS_PER_TOKEN:
+            chunks.append(" ".join(current))
+            current, length = [], 0
+        current.append(word)
+        length += len(word) + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+def _unit_score(unit: str) -> int:
+    """
+    Score how likely a unit is to carry facts the planner needs.
+    """
+    score = 0
+    if _FACT_PATTERN.search(unit):
+        score += 2
+    if _LIST_ITEM_PATTERN.match(unit):
+        score += 1
+    if unit.endswith(":"):
+        # Headings help the planner read the facts under them
+        score += 1
+    return score
\ No newline at end of file
@@ -1,4 +1,126 @@
-from datetime import datetime
+"""
+Date helpers for the travel planning workflow.
+Includes a deterministic parser for common travel date phrases and trip date ranges.
+"""
+import re
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+_ISO_DATE_PATTERN = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+_RELATIVE_DAY_PATTERN = re.compile(r"\b(day after tomorrow|tomorrow|today|tonight)\b")
+_WEEKDAY_PATTERN = re.compile(r"\b(this|on|next)?\s*(" + "|".join(WEEKDAYS) + r")\b")
+_TRIP_LENGTH_PATTERN = re.compile(r"\b(\d{1,2})[- ](day|days|night|nights)\b")
 
 def parse_date(date_string):
     return datetime.strptime(date_string, "%Y-%m-%d")
+
+def resolve_date_phrase(text: str, today: Optional[date] = None) -> Optional[str]:
+    """
+    Resolve a common date phrase in free text without calling an LLM.
+    
+    Handles ISO dates ("2025-06-07"), "today", "tonight", "tomorrow",
+    "day after tomorrow" and weekday references such as "this saturday" or
+    "on friday", which resolve to the next occurrence of that day (today
+    included). Anything ambiguous, such as "next saturday" or text mentioning
+    more than one date, returns None so the caller can fall back to the LLM.
+    
+    Args:
+        text: Free text that may contain a date phrase
+        today: Reference date, defaults to the current date
+        
+    Returns:
+        Date in YYYY-MM-DD format, or None if no unambiguous phrase was found
+    """
+    today = today or date.today()
+    lowered = text.lower()
+    
+    iso_dates = set(_ISO_DATE_PATTERN.findall(lowered))
+    relative_days = set(_RELATIVE_DAY_PATTERN.findall(lowered))
+    weekdays = set(_WEEKDAY_PATTERN.findall(lowered))
+    
+    # Only resolve when exactly one date expression is present
+    if len(iso_dates) + len(relative_days) + len(weekdays) != 1:
+        return None
+    
+    if iso_dates:
+        try:
+            return parse_date(iso_dates.pop()).strftime("%Y-%m-%d")
+        except ValueError:
+            return None
+    
+    if relative_days:
+        offsets = {"today": 0, "tonight": 0, "tomorrow": 1, "day after tomorrow": 2}
+        return (today + timedelta(days=offsets[relative_days.pop()])).strftime("%Y-%m-%d")
+    
+    qualifier, weekday = weekdays.pop()
+    if qualifier == "next":
+        # "next saturday" means different things to different people
+        return None
+    days_ahead = (WEEKDAYS.index(weekday) - today.weekday()) % 7
+    return (today + timedelta(days=days_ahead)).strftime("%Y-%m-%d")
+
+def resolve_date_range(text: str, today: Optional[date] = None) -> Optional[Tuple[str, str]]:
+    """
+    Resolve the first and last day of a trip in free text without calling an LLM.
+    
+    Handles two ISO dates ("from 2025-06-07 to 2025-06-10") and one date
+    phrase understood by resolve_date_phrase with a trip length ("3 nights",
+    "a 4-day trip"; N nights end N days after the start, N days end N - 1
+    days after it). Anything else returns None.
+    
+    Args:
+        text: Free text that may describe a date range
+        today: Reference date, defaults to the current date
+        
+    Returns:
+        First and last day in YYYY-MM-DD format, or None if no range was found
+    """
+    lowered = text.lower()
+    iso_dates = sorted(set(_ISO_DATE_PATTERN.findall(lowered)))
+    if len(iso_dates) == 2:
+        try:
+            return tuple(parse_date(iso_date).strftime("%Y-%m-%d") for iso_date in iso_dates)
+        except ValueError:
+            return None
+        
+    lengths = set(_TRIP_LENGTH_PATTERN.findall(lowered))
+    start = resolve_date_phrase(text, today)
+    if start is None or len(lengths) != 1:
+        return None
+    count, unit = lengths.pop()
+    days = int(count) if unit.startswith("night") else int(count) - 1
+    if days < 1:
+        return None
+    return start, (parse_date(start) + timedelta(days=days)).strftime("%Y-%m-%d")
+
+def trip_dates(start: str, end: Optional[str] = None) -> List[str]:
+    """
+    List the days of a trip.
+    
+    Args:
+        start: First day in YYYY-MM-DD format
+        end: Last day in YYYY-MM-DD format, empty or None for a one-day trip
+        
+    Returns:
+        Every day from start to end, inclusive
+    """
+    first = parse_date(start)
+    last = parse_date(end) if end else first
+    return [(first + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range((last - first).days + 1)]
+
+def describe_trip_period(start: str, end: Optional[str] = None) -> str:
+    """
+    Describe when a trip takes place, for prompts and plans.
+    
+    Args:
+        start: First day in YYYY-MM-DD format
+        end: Last day in YYYY-MM-DD format, empty or None for a one-day trip
+        
+    Returns:
+        "on <start>" or "from <start> to <end> (<n> days)"
+    """
+    if not end or end == start:
+        return f"on {start}"
+    return f"from {start} to {end} ({len(trip_dates(start, end))} days)"
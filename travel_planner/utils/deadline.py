@@ -0,0 +1,167 @@
+"""
+Request deadlines.
+Carries the deadline of a travel plan request to every node, tool and HTTP
+call made for it, and runs nodes within a time budget.
+"""
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, Dict, Iterator, List, Optional
+
+from ..config.settings import BOUNDED_NODE_MAX_WORKERS, REQUEST_DEADLINE_SECONDS
+
+# Wall-clock time (time.time()) the running request must finish by, if any.
+# Wall-clock time is used so a deadline stored in the workflow state stays
+# meaningful in another process.
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+_bounded_executor = ThreadPoolExecutor(max_workers=BOUNDED_NODE_MAX_WORKERS, thread_name_prefix="bounded-node")
+
+def deadline_after(seconds: Optional[float]) -> float:
+    """
+    Get the deadline of a request starting now.
+    
+    Args:
+        seconds: Time the request may take, None or 0 for no deadline
+        
+    Returns:
+        Wall-clock deadline, or 0.0 for no deadline
+    """
+    return time.time() + seconds if seconds else 0.0
+
+def request_deadline(deadline_seconds: Optional[float] = None) -> float:
+    """
+    Get the deadline of a travel plan request starting now.
+    
+    Args:
+        deadline_seconds: Time the request may take, defaults to
+            REQUEST_DEADLINE_SECONDS (0 for no deadline)
+            
+    Returns:
+        Wall-clock deadline, or 0.0 for no deadline
+    """
+    return deadline_after(REQUEST_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds)
+
+@contextmanager
+def deadline_scope(deadline: Optional[float]) -> Iterator[None]:
+    """
+    Apply a request deadline to everything run within the block.
+    
+    Threads and tasks started from the block inherit the deadline when they
+    copy the context (LangGraph and asyncio do).
+    
+    Args:
+        deadline: Wall-clock deadline, None or 0.0 for no deadline
+    """
+    token = _deadline.set(deadline or None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining_seconds() -> Optional[float]:
+    """
+    Get the time left until the current deadline.
+    
+    Returns:
+        Seconds left (0.0 once passed), or None if there is no deadline
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.time())
+
+def clamp_timeout(timeout: Optional[float], reserve: float = 0.0) -> Optional[float]:
+    """
+    Shorten a timeout so it ends before the current deadline.
+    
+    Args:
+        timeout: Timeout in seconds, None for no timeout
+        reserve: Seconds to keep free before the deadline
+        
+    Returns:
+        The shorter of the timeout and the time left, or the timeout if there is no deadline
+    """
+    remaining = remaining_seconds()
+    if remaining is None:
+        return timeout
+    remaining = max(0.0, remaining - reserve)
+    return remaining if timeout is None else min(timeout, remaining)
+
+def run_within(func: Callable[[Any], Dict[str, Any]], state: Any, timeout: Optional[float],
+               reserve: float = 0.0) -> Dict[str, Any]:
+    """
+    Run a sync node, giving up after a timeout counted from when it starts.
+    
+    The node runs on a worker thread so the caller can stop waiting for it.
+    Its budget is the timeout, shortened to end reserve seconds before the
+    request deadline, and starts once a worker picks the node up; a node
+    still queued when no time would be left is cancelled. A thread cannot be
+    interrupted, so a node that overran goes on in the background until its
+    next deadline check (its deadline is the end of its budget) and its
+    result is dropped.
+    
+    Args:
+        func: Sync node function
+        state: Workflow state passed to the node
+        timeout: Seconds the node may run, None for up to the deadline
+        reserve: Seconds of the request deadline the node must leave free
+        
+    Returns:
+        Node state update
+        
+    Raises:
+        TimeoutError: If the node did not start or finish in time
+    """
+    if clamp_timeout(timeout, reserve) is None:
+        return func(state)
+    
+    started = threading.Event()
+    budget_end: List[float] = []
+    
+    def work() -> Dict[str, Any]:
+        budget = clamp_timeout(timeout, reserve)
+        budget_end.append(time.time() + budget)
+        started.set()
+        if budget <= 0:
+            raise TimeoutError("no time left before the deadline")
+        with deadline_scope(budget_end[0]):
+            return func(state)
+    
+    future = _bounded_executor.submit(contextvars.copy_context().run, work)
+    if not started.wait(clamp_timeout(None, reserve)):
+        # Every worker stayed busy until no time was left for the node
+        if future.cancel():
+            raise TimeoutError("no worker was free before the deadline")
+        started.wait()
+    try:
+        return future.result(timeout=max(0.0, budget_end[0] - time.time()))
+    except TimeoutError:
+        future.cancel()
+        raise
+
+async def arun_within(afunc: Callable[[Any], Coroutine[Any, Any, Dict[str, Any]]], state: Any,
+                      timeout: Optional[float]) -> Dict[str, Any]:
+    """
+    Run an async node, cancelling it after a timeout.
+    
+    Args:
+        afunc: Async node function
+        state: Workflow state passed to the node
+        timeout: Seconds to wait, None to wait without limit
+        
+    Returns:
+        Node state update
+        
+    Raises:
+        TimeoutError: If the node did not finish in time
+    """
+    if timeout is None:
+        return await afunc(state)
+    if timeout <= 0:
+        raise TimeoutError("no time left before the deadline")
+    return await asyncio.wait_for(afunc(state), timeout)
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Shared HTTP clients.
+Provides process-wide connection pools so LLM and tool calls reuse connections.
+Requests to known upstream APIs are rate limited and retried (see rate_limit),
+and every request times out by the request deadline (see deadline).
+"""
+import asyncio
+import threading
+import weakref
+from typing import Any, Optional
+
+import httpx
+
+from ..config.settings import (
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_TIMEOUT_SECONDS,
+    HTTP_CONNECT_TIMEOUT_SECONDS
+)
+from .rate_limit import RateLimitedTransport
+
+_client_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+# Async clients are bound to the event loop they were created on
+_async_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+# Clients for long-lived holders, sending through the current shared clients
+# (see get_shared_http_client and get_shared_async_http_client)
+_shared_http_client: Optional[httpx.Client] = None
+_shared_async_http_client: Optional[httpx.AsyncClient] = None
+# Transport used by new clients instead of the network, if set
+_http_transport: Optional[Any] = None
+
+class _CurrentClientTransport(httpx.BaseTransport):
+    """
+    Transport sending each request through the current shared synchronous client.
+    """
+    
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return get_http_client().send(request, stream=True)
+
+class _RunningLoopTransport(httpx.AsyncBaseTransport):
+    """
+    Async transport sending each request through the shared client of the running event loop.
+    """
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await get_async_http_client().send(request, stream=True)
+
+def _connection_limits() -> httpx.Limits:
+    """Connection pool limits shared by all clients."""
+    return httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+    )
+
+def _timeout() -> httpx.Timeout:
+    """Default request timeouts shared by all clients."""
+    return httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS)
+
+def get_http_client() -> httpx.Client:
+    """
+    Get the process-wide synchronous HTTP client.
+    
+    The client keeps connections alive between requests, so repeated calls to
+    the same host skip the TCP and TLS handshakes.
+    
+    Returns:
+        Shared httpx.Client instance
+    """
+    global _http_client
+    if _http_client is None:
+        with _client_lock:
+            if _http_client is None:
+                transport = _http_transport or httpx.HTTPTransport(limits=_connection_limits())
+                _http_client = httpx.Client(transport=RateLimitedTransport(transport), timeout=_timeout())
+    return _http_client
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared asynchronous HTTP client for the running event loop.
+    
+    Must be called from within a coroutine. Every coroutine on the same loop
+    shares one connection pool.
+    
+    Returns:
+        Shared httpx.AsyncClient instance for the current loop
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_http_clients.get(loop)
+    if client is None:
+        transport = _http_transport or httpx.AsyncHTTPTransport(limits=_connection_limits())
+        client = httpx.AsyncClient(transport=RateLimitedTransport(transport), timeout=_timeout())
+        _async_http_clients[loop] = client
+    return client
+
+def get_shared_http_client() -> httpx.Client:
+    """
+    Get a process-wide synchronous HTTP client that outlives transport changes.
+    
+    Requests go through the current shared client (see get_http_client), so
+    long-lived objects (like the shared chat models) can hold this client
+    even after set_http_transport replaces and closes the shared one.
+    
+    Returns:
+        Shared httpx.Client instance
+    """
+    global _shared_http_client
+    if _shared_http_client is None:
+        with _client_lock:
+            if _shared_http_client is None:
+                _shared_http_client = httpx.Client(transport=_CurrentClientTransport(), timeout=_timeout())
+    return _shared_http_client
+
+def get_shared_async_http_client() -> httpx.AsyncClient:
+    """
+    Get a process-wide asynchronous HTTP client that works on any event loop.
+    
+    Requests go through the shared client of the loop they are sent from, so
+    long-lived objects (like the shared chat models) can hold one client
+    while still reusing each loop's connection pool and rate limits.
+    
+    Returns:
+        Shared httpx.AsyncClient instance
+    """
+    global _shared_async_http_client
+    if _shared_async_http_client is None:
+        with _client_lock:
+            if _shared_async_http_client is None:
+                _shared_async_http_client = httpx.AsyncClient(transport=_RunningLoopTransport(), timeout=_timeout())
+    return _shared_async_http_client
+
+def set_http_transport(transport: Optional[Any]) -> None:
+    """
+    Route the shared clients through a custom transport, or back to the network.
+    
+    Existing clients are dropped so the next call builds new ones with the
+    transport; clients from get_shared_http_client and
+    get_shared_async_http_client switch over with them. Used to replay
+    recorded responses offline.
+    
+    Args:
+        transport: Transport implementing both the sync and async httpx
+            transport interfaces (like httpx.MockTransport), or None
+    """
+    global _http_transport
+    close_http_clients()
+    _async_http_clients.clear()
+    _http_transport = transport
+
+def close_http_clients() -> None:
+    """
+    Close the shared synchronous HTTP client and release its connections.
+    """
+    global _http_client
+    with _client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+async def aclose_http_clients() -> None:
+    """
+    Close the shared asynchronous HTTP client of the running event loop.
+    
+    Called when a long-running loop (the server, a batch) shuts down; a
+    later request on the loop opens a new client.
+    """
+    client = _async_http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+Latency recording.
+Collects per-node wall times for the current run and summarizes latency samples.
+"""
+import math
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Sequence
+
+# Node timings of the run executing in the current context, if recording
+_node_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("node_timings", default=None)
+
+@contextmanager
+def record_node_timings() -> Iterator[Dict[str, float]]:
+    """
+    Record the wall time of every workflow node run in this context.
+    
+    Yields:
+        Dictionary filled with seconds per node name as nodes finish
+    """
+    timings: Dict[str, float] = {}
+    token = _node_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _node_timings.reset(token)
+
+def add_node_timing(node: str, seconds: float) -> None:
+    """
+    Report a node's wall time to the active recorder, if any.
+    
+    Args:
+        node: Workflow node name
+        seconds: Wall time of the node
+    """
+    timings = _node_timings.get()
+    if timings is not None:
+        timings[node] = timings.get(node, 0.0) + seconds
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """
+    Nearest-rank percentile of a list of samples.
+    
+    Args:
+        samples: Latency samples
+        q: Percentile between 0 and 100
+        
+    Returns:
+        Sample at the requested percentile, 0.0 if there are none
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def summarize_latencies(samples: Sequence[float]) -> Dict[str, float]:
+    """
+    Summarize latency samples.
+    
+    Args:
+        samples: Latency samples in seconds
+        
+    Returns:
+        Count, p50, p95, p99 and max of the samples
+    """
+    return {
+        "count": len(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples) if samples else 0.0
+    }
\ No newline at end of file
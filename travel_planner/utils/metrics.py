@@ -0,0 +1,423 @@
+"""
+Workflow instrumentation.
+Records node and tool wall times, LLM token usage, ReAct iterations, cache
+counters, upstream request queueing, model fallbacks, degraded sections and
+HTTP server requests, and exports them as Prometheus metrics or OpenTelemetry
+spans.
+"""
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from ..config.settings import METRICS_MODE
+from .cache import cache_stats
+
+# Supported values of METRICS_MODE
+METRICS_MODES = ("", "prometheus", "otel")
+
+# Histogram buckets for node and tool wall times (seconds)
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Histogram buckets for LLM calls per node run
+ITERATION_BUCKETS = (1, 2, 3, 4, 6, 8, 12, 16)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class _Histogram:
+    """Cumulative histogram in the Prometheus layout."""
+    
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class _NodeRun:
+    """Counters of one node execution, filled by the callback handler."""
+    
+    __slots__ = ("name", "started", "llm_calls", "prompt_tokens", "completion_tokens", "span", "otel_token")
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.llm_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.span: Optional[Any] = None
+        self.otel_token: Optional[Any] = None
+
+# Node execution active in the current context, if instrumented
+_active_node: ContextVar[Optional[_NodeRun]] = ContextVar("active_node", default=None)
+
+class WorkflowMetrics:
+    """
+    Thread-safe store of workflow counters and histograms.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], _Histogram] = {}
+        
+    def increment(self, name: str, labels: Labels, amount: float = 1) -> None:
+        """
+        Add to a counter.
+        
+        Args:
+            name: Metric name
+            labels: Metric labels as (name, value) pairs
+            amount: Value to add
+        """
+        with self._lock:
+            self._counters[(name, labels)] = self._counters.get((name, labels), 0) + amount
+            
+    def observe(self, name: str, labels: Labels, value: float, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """
+        Record a histogram sample.
+        
+        Args:
+            name: Metric name
+            labels: Metric labels as (name, value) pairs
+            value: Sample value
+            buckets: Bucket upper bounds used when the histogram is created
+        """
+        with self._lock:
+            histogram = self._histograms.get((name, labels))
+            if histogram is None:
+                histogram = self._histograms[(name, labels)] = _Histogram(buckets)
+            histogram.observe(value)
+            
+    def reset(self) -> None:
+        """
+        Drop all recorded values.
+        """
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            
+    def render_prometheus(self) -> str:
+        """
+        Render all metrics, including cache counters, in the Prometheus text format.
+        
+        Returns:
+            Exposition text ending with a newline
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, list(h.counts), h.sum, h.count, h.buckets) for key, h in self._histograms.items()
+            )
+            
+        for cache_name, stats in sorted(cache_stats().items()):
+            for field, result in (("hits", "hit"), ("misses", "miss")):
+                labels = (("cache", cache_name), ("result", result))
+                counters.append((("travel_planner_cache_requests_total", labels), stats[field]))
+                
+        lines: List[str] = []
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        for (name, labels), counts, total, count, buckets in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, bucket_count in zip(buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total:g}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+def _format_labels(labels: Labels) -> str:
+    """Format labels as a Prometheus label set."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    LangChain callback handler recording LLM token usage and tool call timings.
+    
+    Runs inline with the callbacks so it sees the context of the node that
+    made the call.
+    """
+    
+    run_inline = True
+    
+    def __init__(self, metrics: WorkflowMetrics):
+        self.metrics = metrics
+        self._tool_calls: Dict[UUID, Tuple[str, float, Any]] = {}
+        
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        node_run = _active_node.get()
+        if node_run is None:
+            return
+        prompt_tokens, completion_tokens = _token_usage(response)
+        node_run.llm_calls += 1
+        node_run.prompt_tokens += prompt_tokens
+        node_run.completion_tokens += completion_tokens
+        
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID, **kwargs: Any) -> None:
+        name = (serialized or {}).get("name") or kwargs.get("name") or "unknown"
+        span = _tracer.start_span(f"tool {name}") if _tracer is not None else None
+        self._tool_calls[run_id] = (name, time.perf_counter(), span)
+        
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish_tool_call(run_id, "ok")
+        
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish_tool_call(run_id, "error")
+        
+    def _finish_tool_call(self, run_id: UUID, status: str) -> None:
+        call = self._tool_calls.pop(run_id, None)
+        if call is None:
+            return
+        name, started, span = call
+        labels = (("tool", name),)
+        self.metrics.observe("travel_planner_tool_duration_seconds", labels, time.perf_counter() - started)
+        self.metrics.increment("travel_planner_tool_calls_total", labels + (("status", status),))
+        if span is not None:
+            span.set_attribute("tool.status", status)
+            span.end()
+
+def _token_usage(response: LLMResult) -> Tuple[int, int]:
+    """
+    Extract prompt and completion token counts from an LLM result.
+    """
+    prompt_tokens = completion_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+    if not prompt_tokens and not completion_tokens:
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+    return prompt_tokens, completion_tokens
+
+# Process-wide metrics store and callback handler
+workflow_metrics = WorkflowMetrics()
+metrics_callback_handler = MetricsCallbackHandler(workflow_metrics)
+
+# Active instrumentation mode and OpenTelemetry tracer (only in "otel" mode)
+_mode = ""
+_tracer: Optional[Any] = None
+
+def configure_metrics(mode: str) -> None:
+    """
+    Select the instrumentation mode.
+    
+    Only affects workflows built afterwards; instrumentation is wired in when
+    the graph is built so a disabled mode costs nothing at run time.
+    
+    Args:
+        mode: "" to disable, "prometheus" to record metrics, or "otel" to
+            also emit OpenTelemetry spans (requires opentelemetry-api)
+            
+    Raises:
+        ValueError: If the mode is unknown
+        ImportError: If "otel" is requested without opentelemetry installed
+    """
+    global _mode, _tracer
+    if mode not in METRICS_MODES:
+        raise ValueError(f"Unknown metrics mode {mode!r}, expected one of {METRICS_MODES}")
+    _tracer = None
+    if mode == "otel":
+        from opentelemetry import trace
+        _tracer = trace.get_tracer("travel_planner")
+    _mode = mode
+
+def metrics_enabled() -> bool:
+    """
+    Check whether workflow instrumentation is enabled.
+    """
+    return bool(_mode)
+
+def render_prometheus() -> str:
+    """
+    Render the process-wide workflow metrics in the Prometheus text format.
+    """
+    return workflow_metrics.render_prometheus()
+
+def record_tokens_saved(node: str, tokens: int) -> None:
+    """
+    Count prompt tokens removed by context budgeting, if metrics are enabled.
+    
+    Args:
+        node: Workflow node that built the prompt
+        tokens: Estimated tokens saved
+    """
+    if _mode:
+        workflow_metrics.increment("travel_planner_prompt_tokens_saved_total", (("node", node),), tokens)
+
+def record_upstream_wait(provider: str, seconds: float) -> None:
+    """
+    Record how long a request queued for its provider's quota and concurrency limit.
+    
+    Args:
+        provider: Upstream provider name
+        seconds: Time spent waiting before the request was sent
+    """
+    if _mode:
+        workflow_metrics.observe("travel_planner_upstream_queue_wait_seconds", (("provider", provider),), seconds)
+
+def record_upstream_request(provider: str, outcome: str) -> None:
+    """
+    Count an upstream request attempt, if metrics are enabled.
+    
+    Args:
+        provider: Upstream provider name
+        outcome: "ok", "retry" or "error"
+    """
+    if _mode:
+        workflow_metrics.increment("travel_planner_upstream_requests_total", (("provider", provider), ("outcome", outcome)))
+
+def record_degraded_section(node: str, reason: str) -> None:
+    """
+    Count a research section left out of a plan, if metrics are enabled.
+    
+    Args:
+        node: Workflow node that was cut off or failed
+        reason: "timeout" or "error"
+    """
+    if _mode:
+        workflow_metrics.increment("travel_planner_degraded_sections_total", (("node", node), ("reason", reason)))
+
+def record_model_fallback(node: str, model: str) -> None:
+    """
+    Count a node retried on the fallback model, if metrics are enabled.
+    
+    Args:
+        node: Workflow node
+        model: Model whose output failed validation
+    """
+    if _mode:
+        workflow_metrics.increment("travel_planner_model_fallbacks_total", (("node", node), ("model", model)))
+
+def record_server_request(route: str, status: int) -> None:
+    """
+    Count a request answered by the HTTP server, if metrics are enabled.
+    
+    Args:
+        route: Route pattern, e.g. "/jobs/{id}"
+        status: HTTP status code of the response
+    """
+    if _mode:
+        workflow_metrics.increment("travel_planner_server_requests_total", (("route", route), ("status", str(status))))
+
+def record_server_queue_wait(seconds: float) -> None:
+    """
+    Record how long a plan waited in the server's queue for a worker.
+    
+    Args:
+        seconds: Time between submission and the start of the plan
+    """
+    if _mode:
+        workflow_metrics.observe("travel_planner_server_queue_wait_seconds", (), seconds)
+
+def instrument_node(name: str, func: Callable[[Any], Dict[str, Any]]) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Wrap a sync node function so its runs are recorded.
+    
+    Args:
+        name: Workflow node name
+        func: Sync node function
+        
+    Returns:
+        Instrumented node function
+    """
+    @functools.wraps(func)
+    def instrumented(state: Any) -> Dict[str, Any]:
+        node_run, token = _start_node(name)
+        status = "error"
+        try:
+            result = func(state)
+            status = "ok"
+            return result
+        finally:
+            _finish_node(node_run, token, status)
+    return instrumented
+
+def ainstrument_node(name: str, afunc: Callable[[Any], Coroutine[Any, Any, Dict[str, Any]]]
+                     ) -> Callable[[Any], Coroutine[Any, Any, Dict[str, Any]]]:
+    """
+    Wrap an async node function so its runs are recorded.
+    
+    Args:
+        name: Workflow node name
+        afunc: Async node function
+        
+    Returns:
+        Instrumented node coroutine function
+    """
+    @functools.wraps(afunc)
+    async def instrumented(state: Any) -> Dict[str, Any]:
+        node_run, token = _start_node(name)
+        status = "error"
+        try:
+            result = await afunc(state)
+            status = "ok"
+            return result
+        finally:
+            _finish_node(node_run, token, status)
+    return instrumented
+
+def _start_node(name: str) -> Tuple[_NodeRun, Any]:
+    """Open the counters, and the span in "otel" mode, of a node run."""
+    node_run = _NodeRun(name)
+    if _tracer is not None:
+        from opentelemetry import context, trace
+        node_run.span = _tracer.start_span(f"node {name}")
+        # Make the node span current so tool spans become its children
+        node_run.otel_token = context.attach(trace.set_span_in_context(node_run.span))
+    return node_run, _active_node.set(node_run)
+
+def _finish_node(node_run: _NodeRun, token: Any, status: str) -> None:
+    """Record the counters of a finished node run."""
+    elapsed = time.perf_counter() - node_run.started
+    _active_node.reset(token)
+    
+    labels = (("node", node_run.name),)
+    workflow_metrics.observe("travel_planner_node_duration_seconds", labels, elapsed)
+    workflow_metrics.increment("travel_planner_node_runs_total", labels + (("status", status),))
+    if node_run.llm_calls:
+        # Each ReAct iteration is one model call
+        workflow_metrics.observe(
+            "travel_planner_node_react_iterations", labels, node_run.llm_calls, buckets=ITERATION_BUCKETS
+        )
+        workflow_metrics.increment(
+            "travel_planner_llm_tokens_total", labels + (("type", "prompt"),), node_run.prompt_tokens
+        )
+        workflow_metrics.increment(
+            "travel_planner_llm_tokens_total", labels + (("type", "completion"),), node_run.completion_tokens
+        )
+    
+    if node_run.span is not None:
+        from opentelemetry import context
+        context.detach(node_run.otel_token)
+        node_run.span.set_attribute("node.status", status)
+        node_run.span.set_attribute("llm.react_iterations", node_run.llm_calls)
+        node_run.span.set_attribute("llm.prompt_tokens", node_run.prompt_tokens)
+        node_run.span.set_attribute("llm.completion_tokens", node_run.completion_tokens)
+        node_run.span.end()
+
+configure_metrics(METRICS_MODE)
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Persistent on-disk cache.
+Stores slowly changing results (such as city attractions) in a local SQLite file.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from ..config.settings import CITY_CACHE_PATH, CITY_CACHE_MAX_AGE_SECONDS
+from .cache import register_cache
+
+class PersistentCache:
+    """
+    JSON key-value store backed by SQLite, grouped into namespaces.
+    
+    Entries never expire on their own; readers pass the maximum age they
+    accept, so different callers can apply different staleness rules.
+    """
+    
+    def __init__(self, name: str, path: str, max_age_seconds: float):
+        self.name = name
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        register_cache(name, self)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (caller holds the lock)."""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "namespace TEXT NOT NULL, "
+                "key TEXT NOT NULL, "
+                "value TEXT NOT NULL, "
+                "updated_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+    
+    def get(self, namespace: str, key: str, max_age_seconds: Optional[float] = None) -> Optional[Any]:
+        """
+        Get a stored value if it is fresh enough.
+        
+        Args:
+            namespace: Group of related entries
+            key: Entry key within the namespace
+            max_age_seconds: Oldest acceptable entry, defaults to the cache setting
+            
+        Returns:
+            Stored value, or None if missing or stale
+        """
+        max_age = self.max_age_seconds if max_age_seconds is None else max_age_seconds
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value, updated_at FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+            if row is not None and time.time() - row[1] <= max_age:
+                self.hits += 1
+                return json.loads(row[0])
+            self.misses += 1
+            return None
+    
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """
+        Store a JSON-serializable value.
+        
+        Args:
+            namespace: Group of related entries
+            key: Entry key within the namespace
+            value: Value to store
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, updated_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value, ensure_ascii=False), time.time())
+            )
+            connection.commit()
+    
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """
+        Delete stored entries.
+        
+        Args:
+            namespace: Only delete this namespace, or everything if None
+        """
+        with self._lock:
+            connection = self._connect()
+            if namespace is None:
+                connection.execute("DELETE FROM entries")
+            else:
+                connection.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+            connection.commit()
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters.
+        
+        Returns:
+            Dictionary with hits and misses
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+    
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+# Attractions and historical places per city; disabled when the path is empty
+city_cache: Optional[PersistentCache] = (
+    PersistentCache("city_info", CITY_CACHE_PATH, CITY_CACHE_MAX_AGE_SECONDS) if CITY_CACHE_PATH else None
+)
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+Travel plan cache.
+Reuses finished travel plans for requests with the same extracted trip details.
+"""
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from ..config.settings import PLAN_CACHE_MAX_ENTRIES, PLAN_CACHE_SIMILARITY_THRESHOLD, WEATHER_CACHE_TTL_SECONDS
+from .cache import TTLCache, normalize_city
+
+@dataclass(frozen=True)
+class PlanKey:
+    """
+    Trip details a travel plan depends on, normalized for comparison.
+    
+    Attributes:
+        city: Normalized destination city
+        travel_date: Travel date in YYYY-MM-DD format
+        end_date: Last day of the trip in YYYY-MM-DD format, empty for one day
+        origin: Normalized departure city or country, empty if not mentioned
+        party_size: Number of travellers, 0 if not mentioned
+        nights: Number of nights to stay, 0 if not mentioned
+        stops: Normalized city and dates of each stop of a multi-city trip
+    """
+    city: str
+    travel_date: str
+    end_date: str = ""
+    origin: str = ""
+    party_size: int = 0
+    nights: int = 0
+    stops: Tuple[Tuple[str, str, str], ...] = ()
+    
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> Optional["PlanKey"]:
+        """
+        Build the key of the trip extracted into a workflow state.
+        
+        Args:
+            state: Workflow state after trip details extraction
+            
+        Returns:
+            Plan key, or None if the city or date is missing
+        """
+        if not state.get("city") or not state.get("travel_date"):
+            return None
+        return cls(
+            city=normalize_city(state["city"]),
+            travel_date=state["travel_date"],
+            end_date=state.get("end_date") or "",
+            origin=normalize_city(state.get("origin") or ""),
+            party_size=state.get("party_size") or 0,
+            nights=state.get("nights") or 0,
+            stops=tuple(
+                (normalize_city(stop["city"]), stop["travel_date"], stop["end_date"])
+                for stop in state.get("stops") or []
+            )
+        )
+        
+    def preferences(self) -> Tuple[str, str, str, int, int, Tuple[Tuple[str, str], ...]]:
+        """
+        Everything in the key except the city names.
+        
+        Returns:
+            Travel dates, origin, party size, nights and the dates of the stops
+        """
+        stop_dates = tuple((travel_date, end_date) for _, travel_date, end_date in self.stops)
+        return self.travel_date, self.end_date, self.origin, self.party_size, self.nights, stop_dates
+
+class PlanCache:
+    """
+    In-memory cache of finished travel plans.
+    
+    Plans are found by their exact PlanKey. When an embeddings model is set,
+    a request whose key only differs in the city's spelling ("NYC" and
+    "New York") can also reuse a plan: among the cached plans with the same
+    date and preferences, the one whose request is most similar is returned
+    if the similarity reaches the threshold.
+    """
+    
+    def __init__(self, name: str, max_entries: int = PLAN_CACHE_MAX_ENTRIES,
+                 similarity_threshold: float = PLAN_CACHE_SIMILARITY_THRESHOLD):
+        self.embeddings: Optional[Embeddings] = None
+        self.similarity_threshold = similarity_threshold
+        self._plans = TTLCache(name, WEATHER_CACHE_TTL_SECONDS, max_entries=max_entries)
+        self._lock = threading.Lock()
+        # Request embeddings of the cached plans, grouped by their preferences
+        self._request_embeddings: Dict[Tuple[Any, ...], Dict[PlanKey, List[float]]] = {}
+        
+    def set_embeddings(self, embeddings: Optional[Embeddings]) -> None:
+        """
+        Enable (or with None, disable) near-duplicate matching.
+        
+        Args:
+            embeddings: Model used to embed the user requests
+        """
+        self.embeddings = embeddings
+        with self._lock:
+            self._request_embeddings.clear()
+            
+    def get(self, key: PlanKey) -> Optional[str]:
+        """
+        Get the plan cached for exactly this key.
+        
+        Args:
+            key: Plan key of the request
+            
+        Returns:
+            Cached travel plan, or None
+        """
+        return self._plans.get(key)
+        
+    def has_similar_candidates(self, key: PlanKey) -> bool:
+        """
+        Check whether a near-duplicate lookup could find anything.
+        
+        Lets callers skip embedding the request when it cannot help.
+        
+        Args:
+            key: Plan key of the request
+            
+        Returns:
+            True if embeddings are enabled and plans with the same preferences are cached
+        """
+        if self.embeddings is None:
+            return False
+        with self._lock:
+            return bool(self._request_embeddings.get(key.preferences()))
+            
+    def get_similar(self, key: PlanKey, request_embedding: List[float]) -> Optional[str]:
+        """
+        Get the cached plan of the most similar request with the same preferences.
+        
+        Args:
+            key: Plan key of the request
+            request_embedding: Embedding of the user request
+            
+        Returns:
+            Cached travel plan, or None if no request is similar enough
+        """
+        with self._lock:
+            candidates = list(self._request_embeddings.get(key.preferences(), {}).items())
+        scored = [(_cosine_similarity(request_embedding, embedding), candidate) for candidate, embedding in candidates]
+        best = max(scored, key=lambda item: item[0], default=None)
+        if best is None or best[0] < self.similarity_threshold:
+            return None
+        return self._plans.get(best[1])
+        
+    def set(self, key: PlanKey, travel_plan: str, ttl_seconds: float,
+            request_embedding: Optional[List[float]] = None) -> None:
+        """
+        Cache a finished travel plan.
+        
+        Args:
+            key: Plan key of the request
+            travel_plan: Final travel plan
+            ttl_seconds: How long the plan stays valid
+            request_embedding: Embedding of the user request, for near-duplicate matching
+        """
+        self._plans.set(key, travel_plan, ttl_seconds=ttl_seconds)
+        if request_embedding is None:
+            return
+        with self._lock:
+            group = self._request_embeddings.setdefault(key.preferences(), {})
+            group[key] = request_embedding
+            # Forget the embeddings of plans that expired or were evicted
+            for candidate in [candidate for candidate in group if self._plans.expires_in(candidate) is None]:
+                del group[candidate]
+                
+    def clear(self) -> None:
+        """
+        Drop all cached plans and reset the counters.
+        """
+        self._plans.clear()
+        with self._lock:
+            self._request_embeddings.clear()
+            
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters.
+        
+        Returns:
+            Dictionary with hits, misses and current size
+        """
+        return self._plans.stats()
+
+def _cosine_similarity(left: List[float], right: List[float]) -> float:
+    """Cosine similarity of two vectors."""
+    norm = math.sqrt(sum(value * value for value in left)) * math.sqrt(sum(value * value for value in right))
+    if not norm:
+        return 0.0
+    return sum(a * b for a, b in zip(left, right)) / norm
+
+# Finished travel plans shared by every workflow in the process
+plan_cache = PlanCache("travel_plan")
\ No newline at end of file
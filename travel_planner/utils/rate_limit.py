@@ -0,0 +1,544 @@
+"""
+Upstream rate limiting.
+Throttles, retries and adapts the concurrency of requests to each external API.
+"""
+import asyncio
+import random
+import re
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, Type, TypeVar
+
+import httpx
+from langchain_core.rate_limiters import BaseRateLimiter
+
+from ..config.settings import (
+    UPSTREAM_RATE_LIMITS,
+    UPSTREAM_HOSTS,
+    UPSTREAM_MAX_RETRIES,
+    UPSTREAM_BACKOFF_BASE_SECONDS,
+    UPSTREAM_BACKOFF_MAX_SECONDS,
+    UPSTREAM_CONCURRENCY
+)
+from .deadline import clamp_timeout, remaining_seconds
+from .metrics import record_upstream_request, record_upstream_wait
+
+T = TypeVar("T")
+
+# Response statuses worth retrying after a pause
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+class UpstreamOverloaded(Exception):
+    """
+    Raised for a response that asks the client to slow down or retry later.
+    
+    Attributes:
+        status: HTTP status code
+        retry_after: Seconds the upstream asked to wait, if it said
+        response: Response to hand back if no retry is left, if any
+    """
+    
+    def __init__(self, status: int, retry_after: Optional[float] = None, response: Any = None):
+        super().__init__(f"Upstream returned {status}")
+        self.status = status
+        self.retry_after = retry_after
+        self.response = response
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    
+    Callers reserve a token and wait the returned time before using it, so
+    waiting callers are served in order whether they sleep in a thread or on
+    an event loop.
+    """
+    
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Take a token.
+        
+        Args:
+            max_wait: Longest acceptable wait in seconds, None for any
+            
+        Returns:
+            Seconds to wait until the token may be used, or None (and no
+            token is taken) if that is longer than max_wait
+        """
+        with self._lock:
+            self._refill()
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+            
+    def try_take(self) -> bool:
+        """
+        Take a token only if one is available now.
+        
+        Returns:
+            True if a token was taken
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+            
+    def _refill(self) -> None:
+        """Add the tokens earned since the last update (caller holds the lock)."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limit that adapts to the upstream's health (AIMD).
+    
+    Every successful request raises the limit by 1/limit, so it grows by
+    about one per round of requests. An error, a 429 or a response slower
+    than latency_spike_factor times the average latency cuts it by 30%.
+    Threads and coroutines share the same limit.
+    """
+    
+    def __init__(self, initial: int, minimum: int, maximum: int, latency_spike_factor: float):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_spike_factor = latency_spike_factor
+        self.in_flight = 0
+        self._average_latency: Optional[float] = None
+        self._condition = threading.Condition()
+        self._async_waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait in the current thread for a free slot and take it.
+        
+        Args:
+            timeout: Longest wait in seconds, None for no limit
+            
+        Returns:
+            True if a slot was taken, False if none came free in time
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.in_flight < int(self.limit), timeout):
+                return False
+            self.in_flight += 1
+            return True
+            
+    async def aacquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait on the event loop for a free slot and take it.
+        
+        Args:
+            timeout: Longest wait in seconds, None for no limit
+            
+        Returns:
+            True if a slot was taken, False if none came free in time
+        """
+        loop = asyncio.get_running_loop()
+        give_up = None if timeout is None else loop.time() + timeout
+        while True:
+            with self._condition:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return True
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await asyncio.wait_for(waiter, None if give_up is None else max(0.0, give_up - loop.time()))
+            except asyncio.TimeoutError:
+                return False
+            
+    def release(self, latency: Optional[float], overloaded: bool) -> None:
+        """
+        Free a slot and adjust the limit to the request's outcome.
+        
+        Args:
+            latency: Seconds the request took, or None if it did not complete
+            overloaded: Whether the upstream failed or asked to slow down
+        """
+        with self._condition:
+            self.in_flight -= 1
+            self._adjust(latency, overloaded)
+            self._condition.notify_all()
+            waiters = list(self._async_waiters)
+            self._async_waiters.clear()
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                pass  # The waiter's loop is closed
+                
+    def _adjust(self, latency: Optional[float], overloaded: bool) -> None:
+        """Apply additive increase or multiplicative decrease (caller holds the lock)."""
+        spike = (
+            latency is not None
+            and self._average_latency is not None
+            and latency > self.latency_spike_factor * self._average_latency
+        )
+        if overloaded or spike:
+            self.limit = max(float(self.minimum), self.limit * 0.7)
+        else:
+            self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+        if latency is not None:
+            self._average_latency = latency if self._average_latency is None else 0.9 * self._average_latency + 0.1 * latency
+
+def _wake(waiter: asyncio.Future) -> None:
+    """Resolve a waiting coroutine's future unless it was cancelled."""
+    if not waiter.done():
+        waiter.set_result(None)
+
+class UpstreamProvider:
+    """
+    Request quota, adaptive concurrency limit and retry policy of one external API.
+    
+    Attributes:
+        name: Provider name used in settings and metrics
+        bucket: Token bucket enforcing the request quota
+        limiter: Adaptive concurrency limit
+        max_retries: Retries after a retryable failure
+        backoff_base: First backoff step in seconds
+        backoff_max: Longest wait before a retry in seconds
+    """
+    
+    def __init__(self, name: str, requests_per_second: float, burst: float,
+                 max_retries: int = UPSTREAM_MAX_RETRIES,
+                 backoff_base: float = UPSTREAM_BACKOFF_BASE_SECONDS,
+                 backoff_max: float = UPSTREAM_BACKOFF_MAX_SECONDS):
+        self.name = name
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.limiter = AdaptiveConcurrencyLimiter(
+            UPSTREAM_CONCURRENCY["initial"],
+            UPSTREAM_CONCURRENCY["min"],
+            UPSTREAM_CONCURRENCY["max"],
+            UPSTREAM_CONCURRENCY["latency_spike_factor"]
+        )
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        
+    def reserve_within_deadline(self) -> float:
+        """
+        Reserve a quota token that can be used before the request deadline.
+        
+        Returns:
+            Seconds to wait until the token may be used
+            
+        Raises:
+            TimeoutError: If the deadline has passed or would pass while
+                waiting; no token is taken then
+        """
+        remaining = remaining_seconds()
+        wait = self.bucket.reserve(remaining) if remaining is None or remaining > 0 else None
+        if wait is None:
+            raise TimeoutError(f"no {self.name} request quota is free before the deadline")
+        return wait
+        
+    def call(self, send: Callable[[], T], transient: Tuple[Type[BaseException], ...] = ()) -> T:
+        """
+        Send a request within the quota and concurrency limit, retrying failures.
+        
+        Args:
+            send: Function making the request; raises UpstreamOverloaded for
+                responses that should be retried
+            transient: Exception types of failed requests that should be retried
+            
+        Returns:
+            Result of the first successful attempt
+            
+        Raises:
+            UpstreamOverloaded: If the upstream still refuses after all retries
+            TimeoutError: If the request could not get its quota or a slot
+                before the request deadline
+        """
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            time.sleep(self.reserve_within_deadline())
+            if not self.limiter.acquire(remaining_seconds()):
+                raise TimeoutError(f"no {self.name} request slot came free before the deadline")
+            record_upstream_wait(self.name, time.perf_counter() - started)
+            
+            sent = time.perf_counter()
+            try:
+                result = send()
+            except (UpstreamOverloaded, *transient) as error:
+                self.limiter.release(None, overloaded=True)
+                delay = self._retry_delay(attempt, error)
+                if delay is None:
+                    record_upstream_request(self.name, "error")
+                    raise
+            except BaseException:
+                self.limiter.release(None, overloaded=False)
+                raise
+            else:
+                self.limiter.release(time.perf_counter() - sent, overloaded=False)
+                record_upstream_request(self.name, "ok")
+                return result
+            record_upstream_request(self.name, "retry")
+            time.sleep(delay)
+            
+    async def acall(self, send: Callable[[], Awaitable[T]], transient: Tuple[Type[BaseException], ...] = ()) -> T:
+        """
+        Asynchronously send a request within the quota and concurrency limit, retrying failures.
+        
+        Args:
+            send: Coroutine function making the request; raises
+                UpstreamOverloaded for responses that should be retried
+            transient: Exception types of failed requests that should be retried
+            
+        Returns:
+            Result of the first successful attempt
+            
+        Raises:
+            UpstreamOverloaded: If the upstream still refuses after all retries
+            TimeoutError: If the request could not get its quota or a slot
+                before the request deadline
+        """
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            await asyncio.sleep(self.reserve_within_deadline())
+            if not await self.limiter.aacquire(remaining_seconds()):
+                raise TimeoutError(f"no {self.name} request slot came free before the deadline")
+            record_upstream_wait(self.name, time.perf_counter() - started)
+            
+            sent = time.perf_counter()
+            try:
+                result = await send()
+            except (UpstreamOverloaded, *transient) as error:
+                self.limiter.release(None, overloaded=True)
+                delay = self._retry_delay(attempt, error)
+                if delay is None:
+                    record_upstream_request(self.name, "error")
+                    raise
+            except BaseException:
+                self.limiter.release(None, overloaded=False)
+                raise
+            else:
+                self.limiter.release(time.perf_counter() - sent, overloaded=False)
+                record_upstream_request(self.name, "ok")
+                return result
+            record_upstream_request(self.name, "retry")
+            await asyncio.sleep(delay)
+            
+    def _retry_delay(self, attempt: int, error: BaseException) -> Optional[float]:
+        """
+        Choose how long to wait before retrying a failed attempt.
+        
+        Honors the upstream's Retry-After plus a little jitter; otherwise uses
+        exponential backoff with full jitter. A retry that could not start
+        before the request deadline is not made.
+        
+        Args:
+            attempt: Number of the failed attempt, starting at 0
+            error: Failure of the attempt
+            
+        Returns:
+            Seconds to wait, or None if the request should not be retried
+        """
+        if attempt >= self.max_retries:
+            return None
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            if retry_after > self.backoff_max:
+                return None
+            delay = retry_after + random.uniform(0, self.backoff_base)
+        else:
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        remaining = remaining_seconds()
+        if remaining is not None and delay >= remaining:
+            return None
+        return delay
+
+class ProviderRateLimiter(BaseRateLimiter):
+    """
+    LangChain rate limiter drawing from a provider's token bucket.
+    
+    Used for chat models whose SDK manages its own HTTP client and retries.
+    A call that could not start before the request deadline raises
+    TimeoutError instead of waiting for its token.
+    """
+    
+    def __init__(self, provider: UpstreamProvider):
+        self.provider = provider
+        
+    def acquire(self, *, blocking: bool = True) -> bool:
+        if not blocking:
+            return self.provider.bucket.try_take()
+        wait = self.provider.reserve_within_deadline()
+        time.sleep(wait)
+        record_upstream_wait(self.provider.name, wait)
+        return True
+        
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        if not blocking:
+            return self.provider.bucket.try_take()
+        wait = self.provider.reserve_within_deadline()
+        await asyncio.sleep(wait)
+        record_upstream_wait(self.provider.name, wait)
+        return True
+
+class RateLimitedTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    HTTP transport sending requests to known upstream hosts through their provider.
+    
+    Requests to hosts without a provider pass straight through. Responses
+    with a retryable status are retried; the last one is returned if no
+    retry is left. Every attempt's timeouts are shortened to end by the
+    request deadline, if there is one, and a request that could not get its
+    quota or a slot before the deadline fails with httpx.TimeoutException.
+    """
+    
+    def __init__(self, transport: Any):
+        self.transport = transport
+        
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        provider = provider_for_host(request.url.host)
+        if provider is None:
+            return self.transport.handle_request(_within_deadline(request))
+            
+        def send() -> httpx.Response:
+            return _check_response(self.transport.handle_request(_within_deadline(request)))
+            
+        try:
+            return provider.call(send, transient=(httpx.TransportError,))
+        except UpstreamOverloaded as overloaded:
+            return overloaded.response
+        except TimeoutError as e:
+            raise httpx.TimeoutException(str(e), request=request) from e
+            
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        provider = provider_for_host(request.url.host)
+        if provider is None:
+            return await self.transport.handle_async_request(_within_deadline(request))
+            
+        async def send() -> httpx.Response:
+            response = await self.transport.handle_async_request(_within_deadline(request))
+            if response.status_code in RETRY_STATUSES:
+                await response.aread()
+            return _check_response(response)
+            
+        try:
+            return await provider.acall(send, transient=(httpx.TransportError,))
+        except UpstreamOverloaded as overloaded:
+            return overloaded.response
+        except TimeoutError as e:
+            raise httpx.TimeoutException(str(e), request=request) from e
+            
+    def close(self) -> None:
+        self.transport.close()
+        
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+def _within_deadline(request: httpx.Request) -> httpx.Request:
+    """
+    Shorten a request's timeouts so it gives up by the request deadline.
+    
+    Args:
+        request: Request about to be sent
+        
+    Returns:
+        The same request
+        
+    Raises:
+        httpx.TimeoutException: If the deadline has already passed
+    """
+    remaining = remaining_seconds()
+    if remaining is None:
+        return request
+    if remaining <= 0:
+        raise httpx.TimeoutException("Request deadline passed", request=request)
+    timeout = request.extensions.get("timeout") or {}
+    request.extensions["timeout"] = {phase: clamp_timeout(seconds) for phase, seconds in timeout.items()}
+    return request
+
+def _check_response(response: httpx.Response) -> httpx.Response:
+    """
+    Raise UpstreamOverloaded for a response that should be retried.
+    
+    Args:
+        response: Upstream response
+        
+    Returns:
+        The response, if it should not be retried
+    """
+    if response.status_code not in RETRY_STATUSES:
+        return response
+    if not response.is_stream_consumed:
+        response.read()
+    raise UpstreamOverloaded(response.status_code, parse_retry_after(response.headers.get("Retry-After")), response)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+    
+    Args:
+        value: Header value, in seconds or as an HTTP date
+        
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if re.fullmatch(r"\d+(?:\.\d+)?", value):
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+_providers: Dict[str, UpstreamProvider] = {}
+_providers_lock = threading.Lock()
+
+def get_provider(name: str) -> UpstreamProvider:
+    """
+    Get the process-wide limiter of an upstream provider.
+    
+    Args:
+        name: Provider name, a key of UPSTREAM_RATE_LIMITS
+        
+    Returns:
+        Shared provider
+    """
+    provider = _providers.get(name)
+    if provider is None:
+        with _providers_lock:
+            provider = _providers.get(name)
+            if provider is None:
+                provider = _providers[name] = UpstreamProvider(name, **UPSTREAM_RATE_LIMITS[name])
+    return provider
+
+def provider_for_host(host: str) -> Optional[UpstreamProvider]:
+    """
+    Find the provider of an upstream host.
+    
+    Args:
+        host: Request host name
+        
+    Returns:
+        Provider whose host (or parent domain) matches, or None
+    """
+    for suffix, name in UPSTREAM_HOSTS.items():
+        if host == suffix or host.endswith("." + suffix):
+            return get_provider(name)
+    return None
+
+def reset_providers() -> None:
+    """
+    Drop all provider state, so limits start fresh from the settings.
+    """
+    with _providers_lock:
+        _providers.clear()
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Single-flight call coalescing.
+Concurrent calls with the same key share one execution and its result.
+
+Named flights are registered with the caches, so coalesced calls show up in
+cache_stats() as hits and the calls that did the work as misses.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from .cache import register_cache
+
+class _Call:
+    """An in-flight call that followers wait on."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls across threads.
+    
+    While a call for a key is running, other callers with the same key block
+    until it finishes and receive the same result (or exception).
+    """
+    
+    def __init__(self, name: Optional[str] = None):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.leaders = 0
+        self.followers = 0
+        if name:
+            register_cache(name, self)
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once for all concurrent callers using the same key.
+        
+        Args:
+            key: Identifies equivalent calls
+            fn: Function to run if no call for the key is in flight
+            
+        Returns:
+            Result of the shared call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.followers += 1
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the coalescing counters.
+        
+        Returns:
+            Dictionary with hits (calls that joined one in flight) and misses
+        """
+        with self._lock:
+            return {"hits": self.followers, "misses": self.leaders}
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent calls across coroutines on the same event loop.
+    
+    The shared call runs as its own task, so cancelling one caller never
+    cancels the work other callers are waiting on.
+    """
+    
+    def __init__(self, name: Optional[str] = None):
+        self._calls: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+        self.leaders = 0
+        self.followers = 0
+        if name:
+            register_cache(name, self)
+    
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn once for all concurrent callers using the same key.
+        
+        Args:
+            key: Identifies equivalent calls
+            fn: Coroutine function to await if no call for the key is in flight
+            
+        Returns:
+            Result of the shared call
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        task = self._calls.get(flight_key)
+        if task is None:
+            task = loop.create_task(fn())
+            self._calls[flight_key] = task
+            task.add_done_callback(lambda _: self._calls.pop(flight_key, None))
+            self.leaders += 1
+        else:
+            self.followers += 1
+        return await asyncio.shield(task)
+        
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the coalescing counters.
+        
+        Returns:
+            Dictionary with hits (calls that joined one in flight) and misses
+        """
+        return {"hits": self.followers, "misses": self.leaders}
\ No newline at end of file
@@ -0,0 +1,186 @@
+"""
+Batch planning.
+Runs the workflow over many queries with bounded concurrency and reports latency statistics.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+from ..agents.invocation import shared_results_scope
+from ..utils.latency import record_node_timings, summarize_latencies
+from .runner import aplan_trip, get_travel_app
+
+@dataclass
+class BatchQuery:
+    """
+    One query of a batch.
+    
+    Attributes:
+        id: Identifier copied to the output record
+        query: Travel planning query
+    """
+    id: Any
+    query: str
+
+def read_batch_queries(lines: Iterable[str]) -> List[BatchQuery]:
+    """
+    Parse JSONL batch input.
+    
+    Each line is either a JSON string with the query, or an object with a
+    "query" field and an optional "id" (defaults to the line number).
+    
+    Args:
+        lines: Lines of the JSONL input
+        
+    Returns:
+        Parsed batch queries
+    """
+    queries = []
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if isinstance(record, str):
+            queries.append(BatchQuery(id=line_number, query=record))
+        else:
+            queries.append(BatchQuery(id=record.get("id", line_number), query=record["query"]))
+    return queries
+
+async def arun_batch(
+    queries: List[BatchQuery],
+    output: TextIO,
+    concurrency: int = 8,
+    travel_app: Optional[Any] = None,
+    deadline_seconds: Optional[float] = None,
+    batch_run_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Plan every query and write one JSON line per plan as soon as it completes.
+    
+    All plans of the batch share a results scope, so plans with the same
+    city or date reuse each other's agent and tool results. With a
+    checkpointed workflow, rerunning a batch under the same batch run ID
+    resumes its unfinished plans and returns the finished ones from their
+    checkpoints. The batch run ID defaults to the current date, so an
+    interrupted batch resumes the same day while the next day's batch plans
+    again with fresh dates and forecasts.
+    
+    Args:
+        queries: Queries to plan
+        output: Text stream receiving the JSONL results
+        concurrency: Maximum number of plans in flight
+        travel_app: Compiled workflow, defaults to the shared one
+        deadline_seconds: Time each plan may take from when it starts, defaults
+            to REQUEST_DEADLINE_SECONDS
+        batch_run_id: ID shared by the checkpointed runs of this batch,
+            defaults to the current date (YYYY-MM-DD)
+        
+    Returns:
+        Throughput and latency summary of the batch
+    """
+    travel_app = travel_app or get_travel_app()
+    batch_run_id = batch_run_id or date.today().isoformat()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    node_latencies: Dict[str, List[float]] = defaultdict(list)
+    failures = 0
+    
+    async def run_one(item: BatchQuery) -> None:
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            with record_node_timings() as timings:
+                try:
+                    result = await aplan_trip(
+                        item.query, travel_app, deadline_seconds, batch_thread_id(item, batch_run_id)
+                    )
+                    error = None
+                except Exception as e:
+                    result = {}
+                    error = str(e)
+            elapsed = time.perf_counter() - started
+        
+        latencies.append(elapsed)
+        for node, seconds in timings.items():
+            node_latencies[node].append(seconds)
+        if error:
+            failures += 1
+        
+        record = {
+            "id": item.id,
+            "query": item.query,
+            "city": result.get("city", ""),
+            "travel_date": result.get("travel_date", ""),
+            "end_date": result.get("end_date", ""),
+            "stops": [stop["city"] for stop in result.get("stops", [])],
+            "travel_plan": result.get("travel_plan", ""),
+            "plan_cache_hit": result.get("plan_cache_hit", False),
+            "degraded_sections": result.get("degraded_sections", []),
+            "prompt_tokens_saved": sum(
+                report.get("tokens_saved", 0) for report in result.get("context_budget", {}).values()
+            ),
+            "latency_seconds": round(elapsed, 3),
+            "node_latency_seconds": {node: round(seconds, 3) for node, seconds in timings.items()},
+            "error": error
+        }
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+    
+    started = time.perf_counter()
+    with shared_results_scope():
+        await asyncio.gather(*(run_one(item) for item in queries))
+    wall_seconds = time.perf_counter() - started
+    
+    return {
+        "plans": len(queries),
+        "failed": failures,
+        "wall_seconds": wall_seconds,
+        "plans_per_second": len(queries) / wall_seconds if wall_seconds else 0.0,
+        "latency": summarize_latencies(latencies),
+        "nodes": {node: summarize_latencies(samples) for node, samples in sorted(node_latencies.items())}
+    }
+
+def batch_thread_id(item: BatchQuery, batch_run_id: str) -> str:
+    """
+    Get the checkpoint run ID of a batch query.
+    
+    The ID includes the batch run ID and a digest of the query, so a rerun
+    of the same batch run resumes its runs while a later batch run, or a
+    different batch reusing line numbers as IDs, starts new ones.
+    
+    Args:
+        item: Batch query
+        batch_run_id: ID of the batch run (see arun_batch)
+        
+    Returns:
+        Run ID
+    """
+    digest = hashlib.sha256(item.query.encode("utf-8")).hexdigest()[:16]
+    return f"batch:{batch_run_id}:{item.id}:{digest}"
+
+def format_batch_summary(summary: Dict[str, Any]) -> str:
+    """
+    Format a batch summary as a human-readable table.
+    
+    Args:
+        summary: Summary returned by arun_batch
+        
+    Returns:
+        Multi-line summary text
+    """
+    lines = [
+        f"plans: {summary['plans']}  failed: {summary['failed']}  "
+        f"wall: {summary['wall_seconds']:.2f}s  throughput: {summary['plans_per_second']:.2f} plans/s",
+        f"{'stage':<22}{'count':>7}{'p50':>9}{'p95':>9}{'p99':>9}",
+    ]
+    rows = [("end_to_end", summary["latency"])] + list(summary["nodes"].items())
+    for name, stats in rows:
+        lines.append(
+            f"{name:<22}{stats['count']:>7}{stats['p50']:>8.2f}s{stats['p95']:>8.2f}s{stats['p99']:>8.2f}s"
+        )
+    return "\n".join(lines)
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+City cache warm-up.
+Pre-fills the persistent city cache so popular destinations skip the network and LLM.
+"""
+import asyncio
+from typing import Dict, Iterable, List
+
+from ..nodes.city_info_node import acity_info_node
+from ..tools.historical_places import afetch_historical_places
+
+def load_city_list(path: str) -> List[str]:
+    """
+    Read a city list file with one city per line.
+    
+    Blank lines and lines starting with "#" are ignored.
+    
+    Args:
+        path: Path to the city list file
+        
+    Returns:
+        City names in file order
+    """
+    with open(path, encoding="utf-8") as city_file:
+        return [
+            line.strip() for line in city_file
+            if line.strip() and not line.strip().startswith("#")
+        ]
+
+async def awarm_city_cache(cities: Iterable[str], concurrency: int = 4) -> Dict[str, str]:
+    """
+    Fetch and store historical places and attraction summaries for each city.
+    
+    Cities whose entries are still fresh are served from the cache and cost
+    nothing, so the warm-up can be re-run periodically.
+    
+    Args:
+        cities: City names to warm
+        concurrency: Maximum number of cities processed at once
+        
+    Returns:
+        "ok" or an error description keyed by city
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def warm(city: str) -> None:
+        async with semaphore:
+            await afetch_historical_places(city)
+            await acity_info_node({"city": city})
+    
+    cities = list(cities)
+    outcomes = await asyncio.gather(*(warm(city) for city in cities), return_exceptions=True)
+    return {
+        city: "ok" if outcome is None else f"error: {outcome}"
+        for city, outcome in zip(cities, outcomes)
+    }
+
+def warm_city_cache(cities: Iterable[str], concurrency: int = 4) -> Dict[str, str]:
+    """
+    Synchronous wrapper around awarm_city_cache.
+    
+    Args:
+        cities: City names to warm
+        concurrency: Maximum number of cities processed at once
+        
+    Returns:
+        "ok" or an error description keyed by city
+    """
+    return asyncio.run(awarm_city_cache(cities, concurrency))
\ No newline at end of file
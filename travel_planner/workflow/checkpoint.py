@@ -0,0 +1,426 @@
+"""
+Workflow checkpoints.
+Saves the workflow state after every step, so a run that failed or was
+interrupted resumes from its last completed node instead of starting over.
+"""
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.serde.types import TASKS
+
+from ..config.settings import (
+    CHECKPOINTER,
+    CHECKPOINTER_CHOICES,
+    CHECKPOINT_COMPRESS_MIN_BYTES,
+    CHECKPOINT_COMPRESSION_LEVEL,
+    CHECKPOINT_KEEP_PER_RUN,
+    CHECKPOINT_MAX_AGE_SECONDS,
+    CHECKPOINT_PATH
+)
+
+@lru_cache(maxsize=None)
+def _codecs() -> Dict[str, Tuple[Callable[[bytes, int], bytes], Callable[[bytes], bytes]]]:
+    """
+    Compression codecs available for checkpoint values, preferred one first.
+    
+    zstandard (installed with langsmith) compresses the repetitive agent
+    prose in the state better and faster than zlib, which is the fallback.
+    """
+    codecs = {}
+    try:
+        import zstandard
+        
+        codecs["zstd"] = (
+            lambda data, level: zstandard.ZstdCompressor(level=level).compress(data),
+            lambda data: zstandard.ZstdDecompressor().decompress(data)
+        )
+    except ImportError:
+        pass
+    codecs["zlib"] = (zlib.compress, zlib.decompress)
+    return codecs
+
+class CompressedSerializer(SerializerProtocol):
+    """
+    LangGraph serializer compressing large values.
+    
+    Values are serialized by JsonPlusSerializer (msgpack for the workflow
+    state); payloads of at least CHECKPOINT_COMPRESS_MIN_BYTES are then
+    compressed and their type is prefixed with the codec, as in "zstd+msgpack".
+    Uncompressed values written by other serializers still load.
+    """
+    
+    def __init__(self, serde: Optional[SerializerProtocol] = None,
+                 level: int = CHECKPOINT_COMPRESSION_LEVEL,
+                 min_bytes: int = CHECKPOINT_COMPRESS_MIN_BYTES):
+        self.serde = serde or JsonPlusSerializer()
+        self.level = level
+        self.min_bytes = min_bytes
+        
+    def dumps(self, obj: Any) -> bytes:
+        return self.serde.dumps(obj)
+        
+    def loads(self, data: bytes) -> Any:
+        return self.serde.loads(data)
+        
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        """
+        Serialize a value, compressing it if it is large.
+        
+        Args:
+            obj: Value to serialize
+            
+        Returns:
+            Type tag and serialized bytes
+        """
+        type_, data = self.serde.dumps_typed(obj)
+        if len(data) < self.min_bytes:
+            return type_, data
+        codec, (compress, _) = next(iter(_codecs().items()))
+        return f"{codec}+{type_}", compress(data, self.level)
+        
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        """
+        Deserialize a value written by dumps_typed.
+        
+        Args:
+            data: Type tag and serialized bytes
+            
+        Returns:
+            Deserialized value
+        """
+        type_, payload = data
+        codec, separator, inner_type = type_.partition("+")
+        if separator and codec in _codecs():
+            return self.serde.loads_typed((inner_type, _codecs()[codec][1](payload)))
+        return self.serde.loads_typed(data)
+
+class SqliteCheckpointSaver(BaseCheckpointSaver[int]):
+    """
+    Checkpoint saver backed by a local SQLite file.
+    
+    Only the latest CHECKPOINT_KEEP_PER_RUN checkpoints of a run are kept
+    (resuming needs the latest one and its parent), with their pending
+    writes, so storage grows with the number of runs rather than their
+    steps. Runs not updated for CHECKPOINT_MAX_AGE_SECONDS are deleted when
+    the database is opened. The async methods run the SQLite calls on a
+    worker thread.
+    """
+    
+    def __init__(self, path: str, serde: Optional[SerializerProtocol] = None,
+                 keep_per_run: int = CHECKPOINT_KEEP_PER_RUN,
+                 max_age_seconds: float = CHECKPOINT_MAX_AGE_SECONDS):
+        super().__init__(serde=serde or CompressedSerializer())
+        self.path = path
+        self.keep_per_run = max(2, keep_per_run)
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and delete expired runs on first use (caller holds the lock)."""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "thread_id TEXT NOT NULL, "
+                "checkpoint_ns TEXT NOT NULL, "
+                "checkpoint_id TEXT NOT NULL, "
+                "parent_checkpoint_id TEXT, "
+                "type TEXT NOT NULL, "
+                "checkpoint BLOB NOT NULL, "
+                "metadata_type TEXT NOT NULL, "
+                "metadata BLOB NOT NULL, "
+                "updated_at REAL NOT NULL, "
+                "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS writes ("
+                "thread_id TEXT NOT NULL, "
+                "checkpoint_ns TEXT NOT NULL, "
+                "checkpoint_id TEXT NOT NULL, "
+                "task_id TEXT NOT NULL, "
+                "idx INTEGER NOT NULL, "
+                "channel TEXT NOT NULL, "
+                "type TEXT NOT NULL, "
+                "value BLOB NOT NULL, "
+                "task_path TEXT NOT NULL, "
+                "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))"
+            )
+            connection.commit()
+            self._connection = connection
+            self._prune_expired(connection)
+        return self._connection
+        
+    def _prune_expired(self, connection: sqlite3.Connection) -> None:
+        """Delete the runs not updated within max_age_seconds (caller holds the lock)."""
+        cutoff = time.time() - self.max_age_seconds
+        expired = connection.execute(
+            "SELECT thread_id FROM checkpoints GROUP BY thread_id HAVING MAX(updated_at) < ?",
+            (cutoff,)
+        ).fetchall()
+        for (thread_id,) in expired:
+            connection.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            connection.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+        connection.commit()
+        
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """
+        Get the checkpoint named in the config, or the run's latest one.
+        
+        Args:
+            config: Config with the thread ID and optionally a checkpoint ID
+            
+        Returns:
+            Checkpoint tuple, or None if the run has no checkpoint
+        """
+        return next(self.list(config, limit=1), None)
+        
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        """
+        List the stored checkpoints, newest first.
+        
+        Args:
+            config: Config narrowing the thread, namespace and checkpoint ID
+            filter: Metadata values the checkpoints must have
+            before: Only list checkpoints older than this one
+            limit: Maximum number of checkpoints
+            
+        Yields:
+            Checkpoint tuples
+        """
+        configurable = (config or {}).get("configurable", {})
+        conditions, parameters = [], []
+        for column, value in (
+            ("thread_id", configurable.get("thread_id")),
+            ("checkpoint_ns", configurable.get("checkpoint_ns")),
+            ("checkpoint_id", get_checkpoint_id(config) if config else None),
+        ):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        if before is not None and get_checkpoint_id(before):
+            conditions.append("checkpoint_id < ?")
+            parameters.append(get_checkpoint_id(before))
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                f"metadata_type, metadata FROM checkpoints {where}ORDER BY checkpoint_id DESC",
+                parameters
+            ).fetchall()
+            
+        for thread_id, checkpoint_ns, checkpoint_id, parent_id, type_, checkpoint, metadata_type, metadata in rows:
+            if limit is not None and limit <= 0:
+                break
+            metadata = self.serde.loads_typed((metadata_type, metadata))
+            if filter and not all(metadata.get(key) == value for key, value in filter.items()):
+                continue
+            if limit is not None:
+                limit -= 1
+            yield self._checkpoint_tuple(thread_id, checkpoint_ns, checkpoint_id, parent_id,
+                                         self.serde.loads_typed((type_, checkpoint)), metadata)
+                                         
+    def _checkpoint_tuple(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str, parent_id: Optional[str],
+                          checkpoint: Checkpoint, metadata: CheckpointMetadata) -> CheckpointTuple:
+        """
+        Attach the pending writes and sends to a stored checkpoint.
+        
+        Args:
+            thread_id: Run ID
+            checkpoint_ns: Checkpoint namespace
+            checkpoint_id: Checkpoint ID
+            parent_id: Parent checkpoint ID, if any
+            checkpoint: Deserialized checkpoint
+            metadata: Deserialized metadata
+            
+        Returns:
+            Checkpoint tuple
+        """
+        with self._lock:
+            connection = self._connect()
+            writes = connection.execute(
+                "SELECT task_id, channel, type, value FROM writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+                (thread_id, checkpoint_ns, checkpoint_id)
+            ).fetchall()
+            sends = connection.execute(
+                "SELECT type, value FROM writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? AND channel = ? "
+                "ORDER BY task_path, task_id, idx",
+                (thread_id, checkpoint_ns, parent_id, TASKS)
+            ).fetchall() if parent_id else []
+            
+        def run_config(checkpoint_id: str) -> RunnableConfig:
+            return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}}
+            
+        return CheckpointTuple(
+            config=run_config(checkpoint_id),
+            checkpoint={**checkpoint, "pending_sends": [self.serde.loads_typed(send) for send in sends]},
+            metadata=metadata,
+            parent_config=run_config(parent_id) if parent_id else None,
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((type_, value)))
+                for task_id, channel, type_, value in writes
+            ]
+        )
+        
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+        """
+        Store a checkpoint and drop the run's checkpoints beyond keep_per_run.
+        
+        Args:
+            config: Config of the run the checkpoint belongs to
+            checkpoint: Checkpoint to store
+            metadata: Checkpoint metadata
+            new_versions: Channel versions written in this step (the whole
+                state is stored, so they are not needed)
+                
+        Returns:
+            Config pointing at the stored checkpoint
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        # Pending sends are rebuilt from the parent's writes when loading
+        stored = {key: value for key, value in checkpoint.items() if key != "pending_sends"}
+        type_, data = self.serde.dumps_typed(stored)
+        metadata_type, metadata_data = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+                "type, checkpoint, metadata_type, metadata, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (thread_id, checkpoint_ns, checkpoint["id"], config["configurable"].get("checkpoint_id"),
+                 type_, data, metadata_type, metadata_data, time.time())
+            )
+            kept = "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT ?"
+            keys = (thread_id, checkpoint_ns, thread_id, checkpoint_ns, self.keep_per_run)
+            connection.execute(
+                f"DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN ({kept})", keys
+            )
+            connection.execute(
+                f"DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN ({kept})", keys
+            )
+            connection.commit()
+            
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"]}}
+        
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                   task_path: str = "") -> None:
+        """
+        Store the writes of a task that finished while its step was still running.
+        
+        Args:
+            config: Config pointing at the checkpoint the step started from
+            writes: Channel writes of the task
+            task_id: Task ID
+            task_path: Task path, orders the sends of a step
+        """
+        configurable = config["configurable"]
+        # Special writes (errors, interrupts) replace earlier ones of the task
+        verb = "INSERT OR REPLACE" if all(channel in WRITES_IDX_MAP for channel, _ in writes) else "INSERT OR IGNORE"
+        rows = [
+            (configurable["thread_id"], configurable.get("checkpoint_ns", ""), configurable["checkpoint_id"],
+             task_id, WRITES_IDX_MAP.get(channel, index), channel, *self.serde.dumps_typed(value), task_path)
+            for index, (channel, value) in enumerate(writes)
+        ]
+        with self._lock:
+            connection = self._connect()
+            connection.executemany(
+                f"{verb} INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, "
+                "task_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            connection.commit()
+            
+    def delete_thread(self, thread_id: str) -> None:
+        """
+        Delete all checkpoints of a run.
+        
+        Args:
+            thread_id: Run ID
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            connection.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+            connection.commit()
+            
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+                
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+        
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        checkpoints: List[CheckpointTuple] = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint in checkpoints:
+            yield checkpoint
+            
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+        
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                          task_path: str = "") -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+def create_checkpointer(kind: str = CHECKPOINTER, path: str = CHECKPOINT_PATH) -> Optional[BaseCheckpointSaver]:
+    """
+    Create the checkpoint saver for the travel planning workflow.
+    
+    Args:
+        kind: "" for no checkpoints, "memory" to keep them in this process
+            (for development and tests) or "sqlite" to keep them in a file
+        path: SQLite file for the "sqlite" saver
+        
+    Returns:
+        Checkpoint saver, or None when checkpoints are disabled
+        
+    Raises:
+        ValueError: If the kind is not one of CHECKPOINTER_CHOICES
+    """
+    if kind not in CHECKPOINTER_CHOICES:
+        raise ValueError(f"Unknown checkpointer {kind!r}, expected one of {CHECKPOINTER_CHOICES}")
+    if kind == "memory":
+        from langgraph.checkpoint.memory import InMemorySaver
+        
+        return InMemorySaver(serde=CompressedSerializer())
+    if kind == "sqlite":
+        return SqliteCheckpointSaver(path)
+    return None
\ No newline at end of file
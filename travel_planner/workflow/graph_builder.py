@@ -2,21 +2,107 @@
 Workflow graph builder.
 Creates and configures the travel planning workflow.
 """
-from langgraph.graph import StateGraph, END
+import time
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Union
+
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
 
 from ..state.travel_state import TravelState
-from ..nodes.extract_city import extract_city_node
-from ..nodes.extract_date import extract_date_node
-from ..nodes.weather_node import weather_node
-from ..nodes.city_info_node import city_info_node
-from ..nodes.hotel_search_node import hotel_search_node
-from ..nodes.exchange_rate_node import exchange_rate_node
-from ..nodes.travel_plan_node import travel_plan_node
+from ..nodes.extract_trip_details import extract_trip_details_node, aextract_trip_details_node
+from ..nodes.weather_node import weather_node, aweather_node
+from ..nodes.city_info_node import city_info_node, acity_info_node
+from ..nodes.hotel_search_node import hotel_search_node, ahotel_search_node
+from ..nodes.exchange_rate_node import exchange_rate_node, aexchange_rate_node
+from ..nodes.multi_city import city_research_nodes, is_multi_city, stop_states
+from ..config.settings import PLAN_RESERVE_SECONDS, SECTION_TIMEOUT_SECONDS
+from ..nodes.travel_plan_node import travel_plan_node, atravel_plan_node, fallback_travel_plan_node
+from ..nodes.plan_cache_node import (
+    lookup_plan_cache_node,
+    alookup_plan_cache_node,
+    store_travel_plan_node,
+    astore_travel_plan_node,
+    is_plan_cache_hit
+)
+from ..utils.deadline import arun_within, clamp_timeout, deadline_scope, run_within
+from ..utils.latency import add_node_timing
+from ..utils.metrics import (
+    ainstrument_node,
+    instrument_node,
+    metrics_callback_handler,
+    metrics_enabled,
+    record_degraded_section
+)
+
+# Workflow nodes with their sync and async implementations
+WORKFLOW_NODES = {
+    "extract_trip_details": (extract_trip_details_node, aextract_trip_details_node),
+    "get_weather": (weather_node, aweather_node),
+    "get_city_info": (city_info_node, acity_info_node),
+    "search_hotels": (hotel_search_node, ahotel_search_node),
+    "get_budget_info": (exchange_rate_node, aexchange_rate_node),
+    "create_travel_plan": (travel_plan_node, atravel_plan_node),
+}
+
+# Nodes that answer repeated requests from the plan cache and fill it
+PLAN_CACHE_NODES = {
+    "lookup_plan_cache": (lookup_plan_cache_node, alookup_plan_cache_node),
+    "store_travel_plan": (store_travel_plan_node, astore_travel_plan_node),
+}
+
+# Nodes that only read the extracted city and date and can run concurrently
+RESEARCH_NODES = ["get_weather", "get_city_info", "search_hotels"]
+
+# Budget node of a multi-city trip, run once over the research of every stop
+TRIP_BUDGET_NODE = "get_trip_budget"
 
-def build_travel_planning_workflow():
+# Nodes whose section of the plan is left out when they run out of time or fail
+DEGRADABLE_SECTIONS = {
+    "get_weather": "weather_info",
+    "get_city_info": "city_info",
+    "search_hotels": "hotel_info",
+    "get_budget_info": "budget_info",
+    TRIP_BUDGET_NODE: "budget_info",
+}
+
+def build_travel_planning_workflow(parallel: bool = True, plan_cache: bool = True,
+                                   checkpointer: Optional[BaseCheckpointSaver] = None):
     """
     Build the travel planning workflow graph.
     
+    The weather, city information and hotel nodes only depend on the extracted
+    city and date, so by default they fan out after extraction and run in the
+    same step. The budget node waits for the hotel results it uses, and the
+    travel plan node joins all branches.
+    
+    Every node has a sync and an async implementation: ``invoke``/``stream``
+    run the sync ones and ``ainvoke``/``astream`` run the async ones, so the
+    async path never blocks the event loop.
+    
+    A trip visiting several cities runs the research sub-graph (see
+    build_city_research_graph) once per stop instead, all stops at the same
+    time, so its research takes as long as the slowest city. One budget
+    node and the travel plan node then cover the whole trip.
+    
+    With the plan cache, a request whose extracted trip details match a
+    cached plan ends right after extraction with that plan, and finished
+    plans are stored for later requests.
+    
+    With a checkpointer, the state is saved after every step under the run's
+    thread ID (``config={"configurable": {"thread_id": ...}}``), so a run
+    that failed or was interrupted can be resumed without repeating the
+    nodes that completed (see runner.plan_trip).
+    
+    Args:
+        parallel: Run the independent research nodes concurrently. Pass False
+            to get the original strictly sequential topology (useful for
+            debugging and benchmarking).
+        plan_cache: Reuse finished travel plans across requests
+        checkpointer: Checkpoint saver (see workflow.checkpoint.create_checkpointer),
+            None to run without checkpoints
+    
     Returns:
         Compiled workflow graph
     """
@@ -24,29 +110,226 @@ def build_travel_planning_workflow():
     workflow = StateGraph(TravelState)
     
     # Add nodes to the graph
-    workflow.add_node("extract_city", extract_city_node)
-    workflow.add_node("extract_date", extract_date_node)
-    workflow.add_node("get_weather", weather_node)
-    workflow.add_node("get_city_info", city_info_node)
-    workflow.add_node("search_hotels", hotel_search_node)
-    workflow.add_node("get_budget_info", exchange_rate_node)
-    workflow.add_node("create_travel_plan", travel_plan_node)
-    
-    # Define the sequential flow
-    workflow.set_entry_point("extract_city")
-    
-    # Configure the workflow edges
-    # City -> Date -> Weather -> City Info -> Hotel -> Budget -> Travel Plan -> END
-    workflow.add_edge("extract_city", "extract_date")
-    workflow.add_edge("extract_date", "get_weather")
-    workflow.add_edge("get_weather", "get_city_info")
-    workflow.add_edge("get_city_info", "search_hotels")
-    workflow.add_edge("search_hotels", "get_budget_info")
-    workflow.add_edge("get_budget_info", "create_travel_plan")
-    workflow.add_edge("create_travel_plan", END)
+    nodes = {**WORKFLOW_NODES, **PLAN_CACHE_NODES} if plan_cache else WORKFLOW_NODES
+    for name, (func, afunc) in nodes.items():
+        workflow.add_node(name, _node(name, func, afunc))
+    research_city, aresearch_city = city_research_nodes(build_city_research_graph(parallel))
+    workflow.add_node("research_city", _node("research_city", research_city, aresearch_city))
+    workflow.add_node(TRIP_BUDGET_NODE, _node(TRIP_BUDGET_NODE, exchange_rate_node, aexchange_rate_node))
+    
+    # Define the entry point
+    workflow.set_entry_point("extract_trip_details")
+    
+    # Nodes that start the research once the trip details are known
+    first_nodes = RESEARCH_NODES if parallel else ["get_weather"]
+    
+    def route_research(state: TravelState) -> Union[str, List[Union[str, Send]]]:
+        if is_plan_cache_hit(state):
+            return END
+        if is_multi_city(state):
+            return [Send("research_city", stop_state) for stop_state in stop_states(state)]
+        return first_nodes
+    
+    # Trip details (-> Plan cache) -> END on a hit, the research nodes on a miss
+    research_source = "extract_trip_details"
+    if plan_cache:
+        workflow.add_edge("extract_trip_details", "lookup_plan_cache")
+        research_source = "lookup_plan_cache"
+    workflow.add_conditional_edges(research_source, route_research, [END, *first_nodes, "research_city"])
+    
+    # Multi-city trip: Research of every city -> Trip budget -> Travel Plan
+    workflow.add_edge("research_city", TRIP_BUDGET_NODE)
+    workflow.add_edge(TRIP_BUDGET_NODE, "create_travel_plan")
+    
+    if parallel:
+        # Configure the workflow edges
+        #                 -> Weather ------------\
+        # Trip details ----> City Info -------------> Travel Plan -> END
+        #                 -> Hotel -> Budget ----/
+        workflow.add_edge("search_hotels", "get_budget_info")
+        workflow.add_edge(["get_weather", "get_city_info", "get_budget_info"], "create_travel_plan")
+    else:
+        # Trip details -> Weather -> City Info -> Hotel -> Budget -> Travel Plan -> END
+        workflow.add_edge("get_weather", "get_city_info")
+        workflow.add_edge("get_city_info", "search_hotels")
+        workflow.add_edge("search_hotels", "get_budget_info")
+        workflow.add_edge("get_budget_info", "create_travel_plan")
+    
+    if plan_cache:
+        workflow.add_edge("create_travel_plan", "store_travel_plan")
+        workflow.add_edge("store_travel_plan", END)
+    else:
+        workflow.add_edge("create_travel_plan", END)
     
     # Compile the graph
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
+
+def build_city_research_graph(parallel: bool = True):
+    """
+    Build the research sub-graph run for each stop of a multi-city trip.
+    
+    It runs the weather, city information and hotel nodes on one stop's
+    city and days, through the same tools and caches as a single-city trip,
+    with the same time budgets. The sub-graph keeps no checkpoints of its
+    own; a resumed run repeats the research of stops that had not finished.
+    
+    Args:
+        parallel: Run the research nodes concurrently
+        
+    Returns:
+        Compiled sub-graph taking a stop's state (see nodes.multi_city.stop_states)
+    """
+    research = StateGraph(TravelState)
+    for name in RESEARCH_NODES:
+        research.add_node(name, _node(name, *WORKFLOW_NODES[name]))
+    
+    if parallel:
+        for name in RESEARCH_NODES:
+            research.add_edge(START, name)
+            research.add_edge(name, END)
+    else:
+        for previous, name in zip([START, *RESEARCH_NODES], [*RESEARCH_NODES, END]):
+            research.add_edge(previous, name)
+    return research.compile(checkpointer=False)
+
+def _node(name: str,
+          func: Callable[[TravelState], Dict[str, Any]],
+          afunc: Callable[[TravelState], Coroutine[Any, Any, Dict[str, Any]]]) -> Runnable:
+    """
+    Wrap a node's sync and async implementations into one runnable.
+    
+    The wrapper also reports the node's wall time to the active latency
+    recorder, if any. When instrumentation is enabled the node is also
+    recorded in the workflow metrics, and its LLM and tool calls are observed
+    through the metrics callback handler; otherwise nothing extra is wired in.
+    
+    The node runs under the request deadline stored in the state, or the one
+    in the run config when a resumed run was given a new deadline, which its
+    tools and HTTP calls pick up (see utils.deadline). Research nodes and the
+    travel plan node are also given a time budget (see _bounded_node).
+    
+    Args:
+        name: Workflow node name
+        func: Sync node function
+        afunc: Async node function
+        
+    Returns:
+        Runnable dispatching to the implementation matching the call style
+    """
+    run_name = func.__name__
+    if metrics_enabled():
+        func, afunc = instrument_node(name, func), ainstrument_node(name, afunc)
+    func, afunc = _bounded_node(name, func, afunc)
+    
+    def timed(state: TravelState, config: RunnableConfig) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            with deadline_scope(_run_deadline(state, config)):
+                return func(state)
+        finally:
+            add_node_timing(name, time.perf_counter() - started)
+    
+    async def atimed(state: TravelState, config: RunnableConfig) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            with deadline_scope(_run_deadline(state, config)):
+                return await afunc(state)
+        finally:
+            add_node_timing(name, time.perf_counter() - started)
+    
+    runnable = RunnableLambda(timed, afunc=atimed, name=run_name)
+    if metrics_enabled():
+        return runnable.with_config(callbacks=[metrics_callback_handler])
+    return runnable
+
+def _run_deadline(state: TravelState, config: RunnableConfig) -> Optional[float]:
+    """
+    Get the deadline a node runs under.
+    
+    A resumed run passes a fresh deadline in its config, because the one
+    stored in the checkpointed state belongs to the attempt that failed.
+    
+    Args:
+        state: Current workflow state
+        config: Run config
+        
+    Returns:
+        Wall-clock deadline, or None/0.0 for no deadline
+    """
+    configurable = (config or {}).get("configurable", {})
+    if "deadline" in configurable:
+        return configurable["deadline"]
+    return state.get("deadline")
+
+def _bounded_node(name: str,
+                  func: Callable[[TravelState], Dict[str, Any]],
+                  afunc: Callable[[TravelState], Coroutine[Any, Any, Dict[str, Any]]]):
+    """
+    Give a node a time budget and a fallback for when it is exceeded.
+    
+    A research node may take its SECTION_TIMEOUT_SECONDS, but must leave
+    PLAN_RESERVE_SECONDS of the request deadline for the travel plan. When it
+    runs out of time or fails, its section is marked degraded and the
+    workflow goes on without it. The travel plan node may use whatever is
+    left of the deadline; if that is not enough, the plan is assembled from
+    the research sections without the planner agent. Other nodes are
+    returned unchanged.
+    
+    Args:
+        name: Workflow node name
+        func: Sync node function
+        afunc: Async node function
+        
+    Returns:
+        Sync and async node functions
+    """
+    if name in DEGRADABLE_SECTIONS:
+        timeout, reserve = SECTION_TIMEOUT_SECONDS.get(name), PLAN_RESERVE_SECONDS
+        
+        def fallback(state: TravelState, reason: str) -> Dict[str, Any]:
+            return {DEGRADABLE_SECTIONS[name]: {"degraded": reason}, "degraded_sections": [name]}
+    elif name == "create_travel_plan":
+        timeout, reserve = None, 0.0
+        fallback = fallback_travel_plan_node
+    else:
+        return func, afunc
+    
+    def bounded(state: TravelState) -> Dict[str, Any]:
+        budget = clamp_timeout(timeout, reserve)
+        try:
+            # The budget is counted from when a worker thread starts the node
+            return run_within(func, state, timeout, reserve)
+        except Exception as error:
+            return fallback(state, _degraded_reason(name, error, budget))
+    
+    async def abounded(state: TravelState) -> Dict[str, Any]:
+        budget = clamp_timeout(timeout, reserve)
+        try:
+            return await arun_within(afunc, state, budget)
+        except Exception as error:
+            return fallback(state, _degraded_reason(name, error, budget))
+    
+    return bounded, abounded
+
+def _degraded_reason(name: str, error: Exception, budget: Optional[float]) -> str:
+    """
+    Describe why a node was cut off, and count it in the metrics.
+    
+    Args:
+        name: Workflow node name
+        error: Timeout or failure of the node
+        budget: Time budget the node had, if any
+        
+    Returns:
+        Reason shown in the travel plan
+    """
+    if isinstance(error, TimeoutError):
+        record_degraded_section(name, "timeout")
+        if not budget:
+            return "no time was left before the request deadline"
+        return f"it did not finish within {budget:.1f} seconds"
+    record_degraded_section(name, "error")
+    return f"it failed ({type(error).__name__})"
 
 def visualize_workflow(workflow):
     """
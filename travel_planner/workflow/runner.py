@@ -0,0 +1,348 @@
+"""
+Workflow runner.
+Entry points for executing the travel planning workflow synchronously or on an event loop.
+"""
+import time
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.messages import AIMessageChunk
+from langchain_core.runnables import RunnableConfig
+
+from ..state.travel_state import TravelState, create_initial_state
+from ..utils.deadline import request_deadline
+from .graph_builder import DEGRADABLE_SECTIONS, build_travel_planning_workflow
+
+# Node whose LLM tokens are streamed to the user
+PLAN_NODE = "create_travel_plan"
+
+# Node that looks up the plan cache before the research starts
+PLAN_CACHE_LOOKUP_NODE = "lookup_plan_cache"
+
+# Nodes whose update carries the final travel plan
+_PLAN_UPDATE_NODES = (PLAN_NODE, PLAN_CACHE_LOOKUP_NODE)
+
+# LangGraph stream modes needed to build plan events
+_EVENT_STREAM_MODES = ["updates", "messages"]
+
+@dataclass
+class PlanEvent:
+    """
+    Progress event emitted while a travel plan is being generated.
+    
+    Attributes:
+        type: "node" when a node finishes, "token" for each travel plan token,
+            "plan" once with the final travel plan
+        node: Name of the node the event belongs to
+        data: Node state update, token text or final travel plan
+        elapsed: Seconds since the run started
+    """
+    type: str
+    node: Optional[str]
+    data: Any
+    elapsed: float
+
+@lru_cache(maxsize=None)
+def get_travel_app():
+    """
+    Get the process-wide compiled travel planning workflow.
+    
+    The compiled graph holds no per-request state, so one instance can serve
+    any number of concurrent plans. Runs are checkpointed when the
+    CHECKPOINTER setting enables it.
+    
+    Returns:
+        Compiled workflow graph
+    """
+    # Imported on first use so importing the runner does not load the checkpoint savers
+    from .checkpoint import create_checkpointer
+    
+    return build_travel_planning_workflow(checkpointer=create_checkpointer())
+
+async def aplan_trip(user_query: str, travel_app: Optional[Any] = None,
+                     deadline_seconds: Optional[float] = None, thread_id: Optional[str] = None) -> TravelState:
+    """
+    Run the travel planning workflow on the current event loop.
+    
+    Args:
+        user_query: Travel planning query
+        travel_app: Compiled workflow, defaults to the shared one
+        deadline_seconds: Time the request may take, defaults to REQUEST_DEADLINE_SECONDS
+        thread_id: Run ID of a checkpointed workflow; a run with the ID of an
+            earlier one resumes it (see _run_input)
+        
+    Returns:
+        Final workflow state
+    """
+    travel_app = travel_app or get_travel_app()
+    run_input, config, _ = await _arun_input(travel_app, user_query, deadline_seconds, thread_id)
+    return await travel_app.ainvoke(run_input, config)
+
+async def astream_trip(
+    user_query: str,
+    travel_app: Optional[Any] = None,
+    stream_mode: str = "updates",
+    deadline_seconds: Optional[float] = None,
+    thread_id: Optional[str] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run the travel planning workflow and yield its output as nodes finish.
+    
+    Args:
+        user_query: Travel planning query
+        travel_app: Compiled workflow, defaults to the shared one
+        stream_mode: LangGraph stream mode ("updates" yields one chunk per node)
+        deadline_seconds: Time the request may take, defaults to REQUEST_DEADLINE_SECONDS
+        thread_id: Run ID of a checkpointed workflow; a run with the ID of an
+            earlier one resumes it (see _run_input)
+        
+    Yields:
+        Workflow stream chunks
+    """
+    travel_app = travel_app or get_travel_app()
+    run_input, config, _ = await _arun_input(travel_app, user_query, deadline_seconds, thread_id)
+    async for chunk in travel_app.astream(run_input, config, stream_mode=stream_mode):
+        yield chunk
+
+def plan_trip(user_query: str, travel_app: Optional[Any] = None,
+              deadline_seconds: Optional[float] = None, thread_id: Optional[str] = None) -> TravelState:
+    """
+    Run the travel planning workflow synchronously.
+    
+    Args:
+        user_query: Travel planning query
+        travel_app: Compiled workflow, defaults to the shared one
+        deadline_seconds: Time the request may take, defaults to REQUEST_DEADLINE_SECONDS
+        thread_id: Run ID of a checkpointed workflow; a run with the ID of an
+            earlier one resumes it (see _run_input)
+        
+    Returns:
+        Final workflow state
+    """
+    travel_app = travel_app or get_travel_app()
+    run_input, config, _ = _run_input(travel_app, user_query, deadline_seconds, thread_id)
+    return travel_app.invoke(run_input, config)
+
+async def astream_plan_events(user_query: str, travel_app: Optional[Any] = None,
+                              deadline_seconds: Optional[float] = None,
+                              thread_id: Optional[str] = None) -> AsyncIterator[PlanEvent]:
+    """
+    Run the workflow and yield progress events as they happen.
+    
+    A "node" event is emitted as soon as each node finishes and the travel
+    plan is streamed token by token while the final LLM generates it, so
+    callers can show output long before the whole pipeline completes.
+    
+    Args:
+        user_query: Travel planning query
+        travel_app: Compiled workflow, defaults to the shared one
+        deadline_seconds: Time the request may take, defaults to REQUEST_DEADLINE_SECONDS
+        thread_id: Run ID of a checkpointed workflow; a run with the ID of an
+            earlier one resumes it (see _run_input)
+        
+    Yields:
+        Plan events in the order they occur
+    """
+    travel_app = travel_app or get_travel_app()
+    started = time.perf_counter()
+    run_input, config, travel_plan = await _arun_input(travel_app, user_query, deadline_seconds, thread_id)
+    async for mode, chunk in travel_app.astream(run_input, config, stream_mode=_EVENT_STREAM_MODES):
+        for event in _to_plan_events(mode, chunk, started):
+            if event.type == "node" and event.node in _PLAN_UPDATE_NODES and (event.data or {}).get("travel_plan"):
+                travel_plan = event.data["travel_plan"]
+            yield event
+    yield PlanEvent("plan", PLAN_NODE, travel_plan, time.perf_counter() - started)
+
+def stream_plan_events(user_query: str, travel_app: Optional[Any] = None,
+                       deadline_seconds: Optional[float] = None,
+                       thread_id: Optional[str] = None) -> Iterator[PlanEvent]:
+    """
+    Run the workflow synchronously and yield progress events as they happen.
+    
+    Args:
+        user_query: Travel planning query
+        travel_app: Compiled workflow, defaults to the shared one
+        deadline_seconds: Time the request may take, defaults to REQUEST_DEADLINE_SECONDS
+        thread_id: Run ID of a checkpointed workflow; a run with the ID of an
+            earlier one resumes it (see _run_input)
+        
+    Yields:
+        Plan events in the order they occur
+    """
+    travel_app = travel_app or get_travel_app()
+    started = time.perf_counter()
+    run_input, config, travel_plan = _run_input(travel_app, user_query, deadline_seconds, thread_id)
+    for mode, chunk in travel_app.stream(run_input, config, stream_mode=_EVENT_STREAM_MODES):
+        for event in _to_plan_events(mode, chunk, started):
+            if event.type == "node" and event.node in _PLAN_UPDATE_NODES and (event.data or {}).get("travel_plan"):
+                travel_plan = event.data["travel_plan"]
+            yield event
+    yield PlanEvent("plan", PLAN_NODE, travel_plan, time.perf_counter() - started)
+
+def _run_input(travel_app: Any, user_query: str, deadline_seconds: Optional[float],
+               thread_id: Optional[str]) -> Tuple[Optional[TravelState], Optional[RunnableConfig], Optional[str]]:
+    """
+    Get the input and config that start or resume a run.
+    
+    With a checkpointed workflow, a run given the ID of an earlier run
+    continues it: an unfinished run resumes after its last completed node
+    with a fresh deadline, and a finished run returns its stored result
+    without running any node. A run with degraded sections is instead sent
+    back to its research step with those sections cleared, so they are
+    retried. Without a thread ID a new run gets a random one.
+    
+    Args:
+        travel_app: Compiled workflow
+        user_query: Travel planning query
+        deadline_seconds: Time the request may take
+        thread_id: Run ID, only used by checkpointed workflows
+        
+    Returns:
+        Workflow input (None to resume), run config, and the travel plan
+        already stored for the run, if any
+        
+    Raises:
+        ValueError: If the run ID belongs to a run for a different query
+    """
+    if travel_app.checkpointer is None:
+        return create_initial_state(user_query, deadline_seconds), None, None
+    if thread_id is None:
+        return create_initial_state(user_query, deadline_seconds), _thread_config(uuid.uuid4().hex), None
+    
+    config = _thread_config(thread_id)
+    stored = travel_app.get_state(config).values
+    resumed = _resume_input(stored, config, user_query, deadline_seconds)
+    if stored.get("degraded_sections"):
+        travel_app.update_state(config, *_retry_degraded_update(travel_app, stored))
+    return resumed
+
+async def _arun_input(travel_app: Any, user_query: str, deadline_seconds: Optional[float],
+                      thread_id: Optional[str]) -> Tuple[Optional[TravelState], Optional[RunnableConfig], Optional[str]]:
+    """
+    Get the input and config that start or resume a run, reading checkpoints asynchronously.
+    
+    Args:
+        travel_app: Compiled workflow
+        user_query: Travel planning query
+        deadline_seconds: Time the request may take
+        thread_id: Run ID, only used by checkpointed workflows
+        
+    Returns:
+        Workflow input (None to resume), run config, and the travel plan
+        already stored for the run, if any
+    """
+    if travel_app.checkpointer is None or thread_id is None:
+        return _run_input(travel_app, user_query, deadline_seconds, thread_id)
+    
+    config = _thread_config(thread_id)
+    stored = (await travel_app.aget_state(config)).values
+    resumed = _resume_input(stored, config, user_query, deadline_seconds)
+    if stored.get("degraded_sections"):
+        await travel_app.aupdate_state(config, *_retry_degraded_update(travel_app, stored))
+    return resumed
+
+def _thread_config(thread_id: str) -> RunnableConfig:
+    """
+    Build the run config of a checkpointed run.
+    
+    Args:
+        thread_id: Run ID
+        
+    Returns:
+        Run config
+    """
+    return {"configurable": {"thread_id": thread_id}}
+
+def _resume_input(stored: Dict[str, Any], config: RunnableConfig, user_query: str,
+                  deadline_seconds: Optional[float]) -> Tuple[Optional[TravelState], RunnableConfig, Optional[str]]:
+    """
+    Decide whether a checkpointed run starts or resumes.
+    
+    Args:
+        stored: Latest checkpointed state of the run, empty if there is none
+        config: Run config
+        user_query: Travel planning query
+        deadline_seconds: Time the request may take
+        
+    Returns:
+        Workflow input (None to resume), run config, and the stored travel
+        plan if the run finished without degraded sections
+        
+    Raises:
+        ValueError: If the run was started for a different query
+    """
+    if not stored:
+        return create_initial_state(user_query, deadline_seconds), config, None
+    if str(stored["messages"][0].content) != user_query:
+        raise ValueError(f"Run {config['configurable']['thread_id']!r} was started for a different query")
+    
+    # The stored deadline belongs to the earlier attempt
+    config["configurable"]["deadline"] = request_deadline(deadline_seconds)
+    if stored.get("degraded_sections"):
+        return None, config, None
+    return None, config, stored.get("travel_plan") or None
+
+def _retry_degraded_update(travel_app: Any, stored: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+    """
+    Get the state update that sends a degraded run back to its research step.
+    
+    The update clears the degraded sections and is applied as the node the
+    research starts from, so resuming reruns the research and the plan.
+    
+    Args:
+        travel_app: Compiled workflow
+        stored: Latest checkpointed state of the run
+        
+    Returns:
+        State update and the node it is applied as
+    """
+    update = {"degraded_sections": None}
+    for entry in stored["degraded_sections"]:
+        # Multi-city entries name their stop, e.g. "get_weather (Florence)"
+        section = DEGRADABLE_SECTIONS.get(entry.split(" (")[0])
+        if section:
+            update[section] = None
+    research_source = PLAN_CACHE_LOOKUP_NODE if PLAN_CACHE_LOOKUP_NODE in travel_app.nodes else "extract_trip_details"
+    return update, research_source
+
+def _to_plan_events(mode: str, chunk: Any, started: float) -> List[PlanEvent]:
+    """
+    Convert one LangGraph stream chunk into plan events.
+    
+    Args:
+        mode: Stream mode the chunk belongs to
+        chunk: Stream chunk
+        started: perf_counter value when the run started
+        
+    Returns:
+        Plan events for the chunk (possibly none)
+    """
+    elapsed = time.perf_counter() - started
+    
+    if mode == "updates":
+        return [PlanEvent("node", node, update, elapsed) for node, update in chunk.items()]
+    
+    # Only stream generated tokens from inside the travel plan node
+    message, metadata = chunk
+    if (
+        isinstance(message, AIMessageChunk)
+        and message.content
+        and _top_level_node(metadata) == PLAN_NODE
+    ):
+        return [PlanEvent("token", PLAN_NODE, message.content, elapsed)]
+    return []
+
+def _top_level_node(metadata: Dict[str, Any]) -> str:
+    """
+    Get the workflow node an LLM call ran under, even inside an agent sub-graph.
+    
+    Args:
+        metadata: LangGraph message metadata
+        
+    Returns:
+        Name of the top-level workflow node
+    """
+    namespace = metadata.get("langgraph_checkpoint_ns", "")
+    return namespace.split("|")[0].split(":")[0] or metadata.get("langgraph_node", "")
\ No newline at end of file
@@ -0,0 +1,581 @@
+"""
+HTTP server.
+Serves the travel planning workflow as an ASGI application with synchronous
+plans, streamed progress, background jobs and a bounded work queue.
+"""
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..config.settings import (
+    SERVER_DRAIN_TIMEOUT_SECONDS,
+    SERVER_JOB_RETENTION_SECONDS,
+    SERVER_MAX_BODY_BYTES,
+    SERVER_QUEUE_SIZE,
+    SERVER_RETRY_AFTER_SECONDS,
+    SERVER_WORKERS
+)
+from ..utils.http import aclose_http_clients
+from ..utils.metrics import metrics_enabled, record_server_queue_wait, record_server_request, render_prometheus
+from .runner import PlanEvent, astream_plan_events, get_travel_app
+
+# ASGI callables
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+class RequestError(Exception):
+    """
+    Request the server answers with an error status.
+    
+    Attributes:
+        status: HTTP status code
+        headers: Extra response headers
+    """
+    
+    def __init__(self, status: int, message: str, headers: Optional[List[Tuple[str, str]]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or []
+
+@dataclass
+class PlanJob:
+    """
+    One travel plan submitted to the server.
+    
+    Progress events are kept for the lifetime of the job, so a client that
+    follows the job late still receives all of them.
+    
+    Attributes:
+        id: Job ID
+        query: Travel planning query
+        deadline_seconds: Time the plan may take once a worker starts it
+        run_id: Checkpoint run ID, if any
+        status: "queued", "running", "done" or "failed"
+        events: Progress events emitted so far
+        result: Plan summary once done (see _plan_summary)
+        error: Failure description once failed
+        error_status: HTTP status describing the failure
+        submitted: Wall-clock submission time
+        finished: Wall-clock completion time, None while unfinished
+    """
+    id: str
+    query: str
+    deadline_seconds: Optional[float] = None
+    run_id: Optional[str] = None
+    status: str = "queued"
+    events: List[PlanEvent] = field(default_factory=list)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    error_status: int = 500
+    submitted: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+    _updated: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    
+    def add_event(self, event: PlanEvent) -> None:
+        """
+        Record a progress event and wake up the followers.
+        
+        Args:
+            event: Plan event
+        """
+        self.events.append(event)
+        self._notify()
+        
+    def finish(self, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None, error_status: int = 500) -> None:
+        """
+        Mark the job done (with a result) or failed (with an error).
+        
+        Args:
+            result: Plan summary
+            error: Failure description
+            error_status: HTTP status describing the failure
+        """
+        self.status = "failed" if error else "done"
+        self.result, self.error, self.error_status = result, error, error_status
+        self.finished = time.time()
+        self._notify()
+        
+    async def follow(self) -> AsyncIterator[PlanEvent]:
+        """
+        Yield every progress event of the job, waiting for new ones until it finishes.
+        
+        Yields:
+            Plan events in the order they occurred
+        """
+        index = 0
+        while True:
+            updated = self._updated
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.finished is not None:
+                return
+            await updated.wait()
+            
+    async def wait(self) -> None:
+        """
+        Wait until the job finishes.
+        """
+        async for _ in self.follow():
+            pass
+            
+    def describe(self) -> Dict[str, Any]:
+        """
+        Describe the job for GET /jobs/<id>.
+        
+        Returns:
+            Job ID and status, with the result or error once finished
+        """
+        description = {"job_id": self.id, "status": self.status}
+        if self.result is not None:
+            description["result"] = self.result
+        if self.error is not None:
+            description["error"] = self.error
+        return description
+        
+    def _notify(self) -> None:
+        """Wake up the current followers; later ones wait on a fresh event."""
+        updated, self._updated = self._updated, asyncio.Event()
+        updated.set()
+
+class PlannerServer:
+    """
+    ASGI application serving the travel planning workflow.
+    
+    Every plan goes through one bounded queue served by a fixed number of
+    workers, so the number of plans running at once never exceeds the
+    worker count. When the queue is full, new plans are rejected with
+    429 Too Many Requests and a Retry-After header instead of piling up.
+    
+    Routes:
+        POST /plan: plan a trip and answer with the result
+        POST /plan/stream: plan a trip and stream its progress as server-sent events
+        POST /jobs: submit a plan and answer 202 with its job ID
+        GET /jobs/<id>: status of a job, with its result once done
+        GET /jobs/<id>/events: progress of a job as server-sent events
+        GET /healthz: liveness and queue state; 503 while draining
+        GET /metrics: workflow and server metrics in the Prometheus text format
+        
+    Plan requests take a JSON body with a "query" and optionally
+    "deadline_seconds" and "run_id" (see runner.aplan_trip).
+    
+    On shutdown the server stops accepting plans (503) and gives the queued
+    and running ones up to the drain timeout to finish.
+    """
+    
+    def __init__(
+        self,
+        travel_app: Optional[Any] = None,
+        workers: int = SERVER_WORKERS,
+        queue_size: int = SERVER_QUEUE_SIZE,
+        deadline_seconds: Optional[float] = None,
+        drain_timeout: float = SERVER_DRAIN_TIMEOUT_SECONDS,
+        job_retention: float = SERVER_JOB_RETENTION_SECONDS
+    ):
+        """
+        Configure the server; workers start with the first request or at ASGI startup.
+        
+        Args:
+            travel_app: Compiled workflow, defaults to the shared one
+            workers: Plans run at once
+            queue_size: Plans waiting for a worker before new ones are rejected
+            deadline_seconds: Default time a plan may take, defaults to REQUEST_DEADLINE_SECONDS
+            drain_timeout: Time given to unfinished plans at shutdown (seconds)
+            job_retention: Time finished jobs stay available (seconds)
+        """
+        if workers < 1 or queue_size < 0:
+            raise ValueError("The server needs at least one worker and a non-negative queue size")
+        self.travel_app = travel_app
+        self.workers = workers
+        self.queue_size = queue_size
+        self.deadline_seconds = deadline_seconds
+        self.drain_timeout = drain_timeout
+        self.job_retention = job_retention
+        self.draining = False
+        self.running = 0
+        self._jobs: Dict[str, PlanJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        
+    async def start(self) -> None:
+        """
+        Start the workers on the running event loop (does nothing if started).
+        """
+        if self._queue is not None:
+            return
+        # The queue is bounded by submit, which also counts idle workers
+        self._queue = asyncio.Queue()
+        self.travel_app = self.travel_app or get_travel_app()
+        self._worker_tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        
+    async def shutdown(self) -> None:
+        """
+        Stop accepting plans and drain the queue.
+        
+        Plans still unfinished after the drain timeout are cancelled and
+        their jobs fail. The loop's shared HTTP client is closed once the
+        workers have stopped.
+        """
+        self.draining = True
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            pass
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        for job in self._jobs.values():
+            if job.finished is None:
+                job.finish(error="The server shut down before the plan finished", error_status=503)
+        await aclose_http_clients()
+                
+    @property
+    def queued(self) -> int:
+        """Plans waiting for a worker."""
+        return self._queue.qsize() if self._queue is not None else 0
+        
+    async def submit(self, query: str, deadline_seconds: Optional[float] = None,
+                     run_id: Optional[str] = None) -> PlanJob:
+        """
+        Queue a travel plan.
+        
+        Args:
+            query: Travel planning query
+            deadline_seconds: Time the plan may take, defaults to the server's
+            run_id: Checkpoint run ID, if any
+            
+        Returns:
+            Queued job
+            
+        Raises:
+            RequestError: 503 while draining, 429 when the queue is full
+        """
+        await self.start()
+        if self.draining:
+            raise RequestError(503, "The server is shutting down")
+        # Jobs taken by an idle worker on the next loop iteration do not wait
+        if self.queued >= self.queue_size + self.workers - self.running:
+            raise RequestError(429, "Too many plans in progress, retry later",
+                               [("retry-after", str(SERVER_RETRY_AFTER_SECONDS))])
+                               
+        self._forget_finished_jobs()
+        job = PlanJob(
+            uuid.uuid4().hex,
+            query,
+            self.deadline_seconds if deadline_seconds is None else deadline_seconds,
+            run_id
+        )
+        self._jobs[job.id] = job
+        self._queue.put_nowait(job)
+        return job
+        
+    async def __call__(self, scope: Dict[str, Any], receive: Receive, send: Send) -> None:
+        """
+        ASGI entry point.
+        """
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+            
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        """Start the workers at startup and drain them at shutdown."""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+                
+    async def _http(self, scope: Dict[str, Any], receive: Receive, send: Send) -> None:
+        """Route an HTTP request and answer errors as JSON."""
+        method, path = scope["method"], scope["path"].rstrip("/") or "/"
+        route = path
+        try:
+            if path == "/healthz" and method == "GET":
+                status = await self._health(send)
+            elif path == "/metrics" and method == "GET":
+                status = await self._metrics(send)
+            elif path == "/plan" and method == "POST":
+                status = await self._plan(receive, send)
+            elif path == "/plan/stream" and method == "POST":
+                job = await self.submit(**await _plan_request(receive))
+                status = await _stream_job(job, receive, send)
+            elif path == "/jobs" and method == "POST":
+                status = await self._submit_job(receive, send)
+            elif path.startswith("/jobs/") and method == "GET":
+                job_id, _, tail = path[len("/jobs/"):].partition("/")
+                route = "/jobs/{id}" + (f"/{tail}" if tail else "")
+                job = self._jobs.get(job_id)
+                if job is None or tail not in ("", "events"):
+                    raise RequestError(404, "Unknown job")
+                if tail == "events":
+                    status = await _stream_job(job, receive, send)
+                else:
+                    status = await _send_json(send, 200, job.describe())
+            else:
+                route = "other"
+                raise RequestError(404, "Not found")
+        except RequestError as error:
+            status = await _send_json(send, error.status, {"error": str(error)}, error.headers)
+        record_server_request(route, status)
+        
+    async def _health(self, send: Send) -> int:
+        """Answer GET /healthz."""
+        health = {
+            "status": "draining" if self.draining else "ok",
+            "running": self.running,
+            "queued": self.queued,
+            "workers": self.workers,
+            "queue_size": self.queue_size
+        }
+        return await _send_json(send, 503 if self.draining else 200, health)
+        
+    async def _metrics(self, send: Send) -> int:
+        """Answer GET /metrics with the workflow metrics and the server's queue gauges."""
+        gauges = {
+            "travel_planner_server_running_plans": self.running,
+            "travel_planner_server_queued_plans": self.queued,
+            "travel_planner_server_draining": int(self.draining),
+        }
+        lines = [line for name, value in gauges.items() for line in (f"# TYPE {name} gauge", f"{name} {value}")]
+        body = (render_prometheus() if metrics_enabled() else "") + "\n".join(lines) + "\n"
+        return await _send_body(send, 200, body.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8")
+        
+    async def _plan(self, receive: Receive, send: Send) -> int:
+        """Answer POST /plan once the plan is finished."""
+        job = await self.submit(**await _plan_request(receive))
+        await job.wait()
+        headers = [("x-job-id", job.id)]
+        if job.error is not None:
+            return await _send_json(send, job.error_status, {"error": job.error}, headers)
+        return await _send_json(send, 200, job.result, headers)
+        
+    async def _submit_job(self, receive: Receive, send: Send) -> int:
+        """Answer POST /jobs with the ID of the queued job."""
+        job = await self.submit(**await _plan_request(receive))
+        accepted = {
+            **job.describe(),
+            "status_url": f"/jobs/{job.id}",
+            "events_url": f"/jobs/{job.id}/events"
+        }
+        return await _send_json(send, 202, accepted, [("location", f"/jobs/{job.id}")])
+        
+    async def _work(self) -> None:
+        """Run queued plans one at a time until cancelled."""
+        while True:
+            job = await self._queue.get()
+            self.running += 1
+            try:
+                await self._run(job)
+            finally:
+                self.running -= 1
+                self._queue.task_done()
+                
+    async def _run(self, job: PlanJob) -> None:
+        """
+        Run a job's plan, recording its events and its result or failure.
+        
+        The job's deadline starts when a worker picks it up.
+        """
+        job.status = "running"
+        record_server_queue_wait(time.time() - job.submitted)
+        try:
+            async for event in astream_plan_events(job.query, self.travel_app, job.deadline_seconds, job.run_id):
+                job.add_event(event)
+        except asyncio.CancelledError:
+            job.finish(error="The server shut down before the plan finished", error_status=503)
+            raise
+        except ValueError as error:
+            # A run ID reused for a different query
+            job.finish(error=str(error), error_status=409)
+        except Exception as error:
+            job.finish(error=f"The plan failed ({type(error).__name__})")
+        else:
+            job.finish(_plan_summary(job))
+            
+    def _forget_finished_jobs(self) -> None:
+        """Drop jobs that finished longer than the retention time ago."""
+        expired = time.time() - self.job_retention
+        for job_id in [job.id for job in self._jobs.values() if job.finished is not None and job.finished < expired]:
+            del self._jobs[job_id]
+
+def serve(server: PlannerServer, host: str, port: int) -> None:
+    """
+    Run the server with uvicorn until it is interrupted.
+    
+    Uvicorn stops accepting connections on SIGINT/SIGTERM, waits for open
+    requests up to the drain timeout, and then the server drains its queue.
+    
+    Args:
+        server: Planner server
+        host: Interface to listen on
+        port: Port to listen on
+        
+    Raises:
+        SystemExit: If uvicorn is not installed
+    """
+    # Uvicorn is only needed in server mode
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("Server mode needs uvicorn: pip install uvicorn "
+                         "(or pip install -r requirements.txt)") from None
+    
+    uvicorn.run(server, host=host, port=port, lifespan="on", timeout_graceful_shutdown=int(server.drain_timeout))
+
+def _plan_summary(job: PlanJob) -> Dict[str, Any]:
+    """
+    Summarize a finished plan from its events.
+    
+    Args:
+        job: Finished job
+        
+    Returns:
+        Travel plan with the trip details, plan cache hit, degraded sections
+        and latency
+    """
+    summary: Dict[str, Any] = {
+        "job_id": job.id,
+        "query": job.query,
+        "travel_plan": "",
+        "city": "",
+        "travel_date": "",
+        "end_date": "",
+        "stops": [],
+        "plan_cache_hit": False,
+        "degraded_sections": [],
+        "latency_seconds": 0.0
+    }
+    for event in job.events:
+        if event.type == "plan":
+            summary["travel_plan"] = event.data or ""
+            summary["latency_seconds"] = round(event.elapsed, 3)
+        elif event.type == "node" and isinstance(event.data, dict):
+            for key in ("city", "travel_date", "end_date", "plan_cache_hit"):
+                if key in event.data:
+                    summary[key] = event.data[key]
+            summary["stops"] += [stop["city"] for stop in event.data.get("stops") or []]
+            summary["degraded_sections"] += event.data.get("degraded_sections") or []
+    return summary
+
+async def _plan_request(receive: Receive) -> Dict[str, Any]:
+    """
+    Read and validate the JSON body of a plan request.
+    
+    Args:
+        receive: ASGI receive callable
+        
+    Returns:
+        PlannerServer.submit arguments
+        
+    Raises:
+        RequestError: 413 for a body over SERVER_MAX_BODY_BYTES, 400 for an invalid one
+    """
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if len(body) > SERVER_MAX_BODY_BYTES:
+            raise RequestError(413, f"Request body over {SERVER_MAX_BODY_BYTES} bytes")
+        if not message.get("more_body"):
+            break
+            
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        raise RequestError(400, "Request body must be JSON") from None
+    if not isinstance(payload, dict) or not isinstance(payload.get("query"), str) or not payload["query"].strip():
+        raise RequestError(400, 'Request body must be a JSON object with a non-empty "query"')
+    deadline_seconds = payload.get("deadline_seconds")
+    if deadline_seconds is not None and (isinstance(deadline_seconds, bool)
+                                         or not isinstance(deadline_seconds, (int, float)) or deadline_seconds < 0):
+        raise RequestError(400, '"deadline_seconds" must be a non-negative number')
+    run_id = payload.get("run_id")
+    if run_id is not None and not isinstance(run_id, str):
+        raise RequestError(400, '"run_id" must be a string')
+    return {"query": payload["query"].strip(), "deadline_seconds": deadline_seconds, "run_id": run_id}
+
+async def _stream_job(job: PlanJob, receive: Receive, send: Send) -> int:
+    """
+    Stream a job's progress as server-sent events.
+    
+    Sends a "node" event as each workflow node finishes, a "token" event per
+    travel plan token, and ends with a "result" event (the plan summary) or
+    an "error" event. The job keeps running if the client disconnects.
+    
+    Args:
+        job: Job to follow
+        receive: ASGI receive callable, watched for the client disconnecting
+        send: ASGI send callable
+        
+    Returns:
+        HTTP status code
+    """
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"text/event-stream"),
+            (b"cache-control", b"no-cache"),
+            (b"x-job-id", job.id.encode("ascii"))
+        ]
+    })
+    events = job.follow()
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+    try:
+        while True:
+            # Wait for the next event or the client leaving, whichever comes first
+            next_event = asyncio.ensure_future(events.__anext__())
+            await asyncio.wait((next_event, disconnected), return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                next_event.cancel()
+                return 200
+            try:
+                event = next_event.result()
+            except StopAsyncIteration:
+                break
+            if event.type == "node":
+                await _send_event(send, "node", {"node": event.node, "elapsed": round(event.elapsed, 3)})
+            elif event.type == "token":
+                await _send_event(send, "token", {"text": event.data})
+        if job.error is not None:
+            await _send_event(send, "error", {"error": job.error, "status": job.error_status})
+        else:
+            await _send_event(send, "result", job.result)
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        disconnected.cancel()
+    return 200
+
+async def _wait_for_disconnect(receive: Receive) -> None:
+    """Return once the client has disconnected."""
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+async def _send_event(send: Send, name: str, data: Any) -> None:
+    """Send one server-sent event with a JSON payload."""
+    payload = f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    await send({"type": "http.response.body", "body": payload.encode("utf-8"), "more_body": True})
+
+async def _send_json(send: Send, status: int, payload: Any, headers: Optional[List[Tuple[str, str]]] = None) -> int:
+    """Send a complete JSON response and return its status."""
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return await _send_body(send, status, body, "application/json", headers)
+
+async def _send_body(send: Send, status: int, body: bytes, content_type: str,
+                     headers: Optional[List[Tuple[str, str]]] = None) -> int:
+    """Send a complete response and return its status."""
+    raw_headers = [(b"content-type", content_type.encode("ascii")), (b"content-length", str(len(body)).encode("ascii"))]
+    raw_headers += [(name.encode("ascii"), value.encode("ascii")) for name, value in headers or []]
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
+    return status
\ No newline at end of file